@@ -0,0 +1,63 @@
+import assets
+import masks
+
+# Frames already loaded this session, keyed by their image paths
+_animations = {}
+
+
+def load_frames(paths):
+    # Return an (image, mask) pair for each image, loading each image
+    # and building its mask only the first time the animation is asked for
+    # Returns None if any frame cannot be loaded
+    paths = tuple(paths)
+    if paths in _animations:
+        return _animations[paths]
+
+    frames = []
+    for path in paths:
+        try:
+            image = assets.load_image(path)
+            frames.append((image, masks.load_mask(image, path)))
+        except Exception as e:
+            print(f"Error loading animation frame: {path} - {e}")
+            return None
+    _animations[paths] = tuple(frames)
+    return _animations[paths]
+
+
+class Animation:
+    def __init__(self, frames, ticks_per_frame):
+        # (image, mask) pairs, shown in order and then from the start
+        self.frames = frames
+        # Simulation ticks each frame is shown for
+        self.ticks_per_frame = ticks_per_frame
+        self.index = 0
+        self.ticks = 0
+
+    @property
+    def image(self):
+        return self.frames[self.index][0]
+
+    @property
+    def mask(self):
+        return self.frames[self.index][1]
+
+    def tick(self):
+        # Advance one simulation tick, returning True if the frame changed
+        if len(self.frames) < 2:
+            return False
+        self.ticks += 1
+        if self.ticks < self.ticks_per_frame:
+            return False
+        self.ticks = 0
+        self.index = (self.index + 1) % len(self.frames)
+        return True
+
+    def rewind(self):
+        self.index = 0
+        self.ticks = 0
+
+
+def clear():
+    # Forget every animation loaded this session
+    _animations.clear()
@@ -0,0 +1,344 @@
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+import constants
+
+# Bundle file layout:
+#   magic (8 bytes) | version, metadata length (2 x uint32) | metadata JSON |
+#   padding to BUNDLE_ALIGNMENT | raw RGBA pixel buffers
+BUNDLE_MAGIC = b"LLAMAAST"
+BUNDLE_VERSION = 2
+BUNDLE_HEADER = struct.Struct("<II")
+BUNDLE_ALIGNMENT = 16
+# Pixel format of the stored buffers
+BUNDLE_PIXEL_FORMAT = "RGBA"
+
+# Images stored in the bundle at their native size
+BUNDLED_IMAGES = tuple(
+    dict.fromkeys(
+        (
+            constants.PLAYER_IMAGE,
+            *constants.PLAYER_RUN_IMAGES,
+            constants.OBSTACLE_IMAGE,
+            constants.FLYING_OBSTACLE_IMAGE,
+        )
+    )
+)
+# Images stored in the bundle already scaled to the window height
+BUNDLED_SCALED_IMAGES = (constants.GROUND_IMAGE,)
+
+# Surfaces loaded from the bundle, keyed by image path
+# (None until load_bundle has found a usable bundle)
+bundle = None
+
+
+def scale_to_height(surface, target_height):
+    # Scale a surface to the target height, keeping its aspect ratio
+    original_width = surface.get_width()
+    original_height = surface.get_height()
+
+    # Check if original dimensions and target height are valid
+    if original_width <= 0 or original_height <= 0 or target_height <= 0:
+        return None
+
+    # Calculate the aspect ratio
+    aspect_ratio = float(original_width) / float(original_height)
+
+    # Calculate the target width
+    target_width = int(aspect_ratio * target_height)
+
+    # Ensure target_width is at least 1 pixel
+    if target_width < 1:
+        target_width = 1
+
+    # Scale the image using transform.scale
+    return pygame.transform.scale(surface, (target_width, target_height))
+
+
+def tile_to_width(surface, min_width):
+    # Repeat a surface side by side until it is at least min_width wide,
+    # so a scrolling layer always covers the window with two blits
+    width, height = surface.get_size()
+    if width <= 0 or width >= min_width:
+        return surface
+    tiles = -(-min_width // width)
+    # Same pixel format as the surface, starting fully transparent
+    strip = pygame.Surface(
+        (width * tiles, height), surface.get_flags() & pygame.SRCALPHA, surface
+    )
+    colorkey = surface.get_colorkey()
+    if colorkey is None:
+        # BLEND_RGBA_MAX onto transparent pixels copies them exactly, where
+        # a normal blit would blend partly transparent pixels
+        special_flags = pygame.BLEND_RGBA_MAX
+    else:
+        # Keyed pixels are skipped, leaving the colorkey showing through
+        strip.fill(colorkey)
+        special_flags = 0
+    strip.blits(
+        [
+            (surface, (width * tile, 0), None, special_flags)
+            for tile in range(tiles)
+        ],
+        False,
+    )
+    if colorkey is not None:
+        strip.set_colorkey(colorkey, pygame.RLEACCEL)
+    return strip
+
+
+def alpha_kind(surface):
+    # How an image uses transparency: "opaque" if it has none, "binary" if
+    # every pixel is fully opaque or fully transparent, else "translucent"
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return "opaque" if surface.get_colorkey() is None else "binary"
+    try:
+        alpha = pygame.image.tobytes(surface, "RGBA")[3::4]
+    except (TypeError, pygame.error):
+        # Pixels that cannot be read keep per-pixel alpha, which suits any
+        # image
+        return "translucent"
+    opaque = alpha.count(255)
+    if opaque == len(alpha):
+        return "opaque"
+    if opaque + alpha.count(0) == len(alpha):
+        return "binary"
+    return "translucent"
+
+
+def shows_colorkey(surface, colorkey=constants.COLORKEY):
+    # Whether a visible pixel of an image with per-pixel alpha is already
+    # the colorkey colour, so keying it would hide that pixel
+    keyed = pygame.mask.from_threshold(surface, colorkey, (1, 1, 1, 255))
+    visible = pygame.mask.from_surface(surface, 254)
+    return keyed.overlap_area(visible, (0, 0)) > 0
+
+
+def format_kind(surface):
+    # The alpha_kind prepare_image will treat an image as: binary images
+    # that already show the colorkey keep per-pixel alpha instead
+    kind = alpha_kind(surface)
+    if (
+        kind == "binary"
+        and surface.get_flags() & pygame.SRCALPHA
+        and shows_colorkey(surface)
+    ):
+        return "translucent"
+    return kind
+
+
+def colorkey_image(surface, colorkey=constants.COLORKEY, checked=False):
+    # Copy an image with binary alpha to the display's format, marking its
+    # transparent pixels with a colorkey that RLEACCEL skips in runs
+    # Returns None if a visible pixel is already the colorkey colour, unless
+    # checked says the image is known not to show it
+    if not surface.get_flags() & pygame.SRCALPHA:
+        keyed = surface.convert()
+        keyed.set_colorkey(surface.get_colorkey(), pygame.RLEACCEL)
+        return keyed
+    if not checked and shows_colorkey(surface, colorkey):
+        return None
+    keyed = pygame.Surface(surface.get_size()).convert()
+    keyed.fill(colorkey)
+    # Opaque pixels are copied exactly; transparent ones leave the key
+    keyed.blit(surface, (0, 0))
+    keyed.set_colorkey(colorkey, pygame.RLEACCEL)
+    return keyed
+
+
+def prepare_image(surface, alpha=True, kind=None):
+    # Convert to the display's pixel format so blits are fast, choosing the
+    # cheapest format for the image's transparency: opaque images need no
+    # alpha at all, binary alpha becomes an RLE colorkey, and only
+    # translucent images keep per-pixel alpha (the slowest to blit)
+    # alpha=False drops any transparency the image has
+    # kind is the image's format_kind if it is already known, as it is for
+    # bundled images, which saves scanning every pixel again
+    # The texture and null renderers have no display surface to convert
+    # to; textures are uploaded from any format
+    if constants.RENDER_BACKEND != "surface":
+        return surface
+    if not alpha:
+        return surface.convert()
+    if kind is None:
+        kind = format_kind(surface)
+    if kind == "opaque":
+        return surface.convert()
+    if kind == "binary":
+        return colorkey_image(surface, checked=True)
+    return surface.convert_alpha()
+
+
+def _source_stamp(path):
+    # Size and modification time identify the version of a source image
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def build_bundle(bundle_path=None):
+    # Decode and scale every image once, then store the raw pixels
+    if bundle_path is None:
+        bundle_path = constants.ASSET_BUNDLE
+    images = {}
+    pixel_data = bytearray()
+    sources = {}
+
+    for path in BUNDLED_IMAGES + BUNDLED_SCALED_IMAGES:
+        surface = pygame.image.load(path)
+        if path in BUNDLED_SCALED_IMAGES:
+            surface = scale_to_height(surface, constants.WINDOW_HEIGHT)
+            if surface is None:
+                continue
+
+        pixels = pygame.image.tobytes(surface, BUNDLE_PIXEL_FORMAT)
+        images[path] = {
+            "offset": len(pixel_data),
+            "length": len(pixels),
+            "width": surface.get_width(),
+            "height": surface.get_height(),
+            # Worked out once here, so loading never scans the pixels
+            "alpha": format_kind(surface),
+        }
+        pixel_data += pixels
+        sources[path] = _source_stamp(path)
+
+    metadata = json.dumps(
+        {
+            "window_size": [constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT],
+            "format": BUNDLE_PIXEL_FORMAT,
+            "sources": sources,
+            "images": images,
+        }
+    ).encode("utf-8")
+
+    # Pad the header so the pixel buffers start on an aligned offset
+    header_length = len(BUNDLE_MAGIC) + BUNDLE_HEADER.size + len(metadata)
+    padding = -header_length % BUNDLE_ALIGNMENT
+
+    # Write to a temporary file first so a half-written bundle is never used
+    temp_path = bundle_path + ".tmp"
+    with open(temp_path, "wb") as bundle_file:
+        bundle_file.write(BUNDLE_MAGIC)
+        bundle_file.write(BUNDLE_HEADER.pack(BUNDLE_VERSION, len(metadata)))
+        bundle_file.write(metadata)
+        bundle_file.write(b"\0" * padding)
+        bundle_file.write(pixel_data)
+    os.replace(temp_path, bundle_path)
+
+    return images
+
+
+def _read_metadata(bundle_map):
+    # Return the metadata and the offset of the pixel data, or None
+    if bundle_map[: len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+        return None
+    start = len(BUNDLE_MAGIC)
+    version, metadata_length = BUNDLE_HEADER.unpack_from(bundle_map, start)
+    if version != BUNDLE_VERSION:
+        return None
+    start += BUNDLE_HEADER.size
+    metadata = json.loads(bundle_map[start : start + metadata_length])
+    start += metadata_length
+    data_offset = start + (-start % BUNDLE_ALIGNMENT)
+    return metadata, data_offset
+
+
+def _is_stale(metadata):
+    # The bundle is stale if the window size or any source image changed
+    window_size = [constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT]
+    if metadata["window_size"] != window_size:
+        return True
+    for path in BUNDLED_IMAGES + BUNDLED_SCALED_IMAGES:
+        if path not in metadata["sources"]:
+            return True
+        try:
+            if metadata["sources"][path] != _source_stamp(path):
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def load_bundle(bundle_path=None):
+    # Load every image from the bundle, or leave bundle as None so that
+    # callers fall back to decoding the PNG files
+    global bundle
+    bundle = None
+    if bundle_path is None:
+        bundle_path = constants.ASSET_BUNDLE
+
+    if not os.path.isfile(bundle_path):
+        return None
+
+    surfaces = {}
+    try:
+        with open(bundle_path, "rb") as bundle_file:
+            with mmap.mmap(
+                bundle_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as bundle_map:
+                header = _read_metadata(bundle_map)
+                if header is None:
+                    print(f"Ignoring unrecognised asset bundle: {bundle_path}")
+                    return None
+                metadata, data_offset = header
+                if _is_stale(metadata):
+                    print("Asset bundle is stale, loading images instead")
+                    return None
+
+                with memoryview(bundle_map) as view:
+                    for path, image in metadata["images"].items():
+                        start = data_offset + image["offset"]
+                        with view[start : start + image["length"]] as pixels:
+                            # Wrap the mapped pixels without copying them,
+                            # then copy once into the display's format
+                            raw_surface = pygame.image.frombuffer(
+                                pixels,
+                                (image["width"], image["height"]),
+                                metadata["format"],
+                            )
+                            surface = prepare_image(
+                                raw_surface, kind=image["alpha"]
+                            )
+                            if surface is raw_surface:
+                                # Still backed by the mapping, so copy it
+                                surface = raw_surface.copy()
+                            surfaces[path] = surface
+                            # Release the mapped memory before closing it
+                            del raw_surface
+    except (OSError, ValueError, KeyError, struct.error, pygame.error) as e:
+        print(f"Error loading asset bundle: {bundle_path} - {e}")
+        return None
+
+    bundle = surfaces
+    return bundle
+
+
+def bundled_image(path):
+    # Return the pre-converted surface for an image, or None if the image
+    # has to be loaded from its own file
+    if bundle is None:
+        return None
+    return bundle.get(path)
+
+
+def load_image(path):
+    # Use the bundled surface if there is one, otherwise decode the file
+    surface = bundled_image(path)
+    if surface is None:
+        surface = prepare_image(pygame.image.load(path))
+    return surface
+
+
+if __name__ == "__main__":
+    # Build the asset bundle offline
+    built_images = build_bundle()
+    for image_path, image_info in built_images.items():
+        print(
+            f"Bundled {image_path}"
+            f" ({image_info['width']}x{image_info['height']})"
+        )
+    print(f"Wrote {constants.ASSET_BUNDLE}")
@@ -0,0 +1,356 @@
+import os
+import sys
+import time
+
+# Run without opening a window or sound device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import constants
+from profiling import DurationStats
+
+
+def _make_game():
+    # Imported here so the SDL drivers above are set first
+    import main
+
+    return main.Game()
+
+
+def benchmark_events(frames=300, motions_per_frame=200, keys_per_frame=20):
+    # Time Game._handle_events under heavy input (a mouse being waved
+    # around and keys being mashed), with and without event filtering
+    game = _make_game()
+    results = []
+    for filtered in (False, True):
+        if filtered:
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(constants.ALLOWED_EVENTS)
+        else:
+            pygame.event.set_allowed(None)
+        pygame.event.clear()
+
+        stats = DurationStats(
+            "Event handling (filtered)"
+            if filtered
+            else "Event handling (unfiltered)"
+        )
+        queued = 0
+        for frame in range(frames):
+            for motion in range(motions_per_frame):
+                # post returns False for blocked events, which SDL drops
+                queued += pygame.event.post(
+                    pygame.event.Event(
+                        pygame.MOUSEMOTION,
+                        pos=(motion % constants.WINDOW_WIDTH, frame % 100),
+                        rel=(1, 0),
+                        buttons=(0, 0, 0),
+                    )
+                )
+            for press in range(keys_per_frame):
+                key = pygame.K_SPACE if press % 2 else pygame.K_a
+                queued += pygame.event.post(
+                    pygame.event.Event(
+                        pygame.KEYDOWN, key=key, unicode="", mod=0
+                    )
+                )
+            start_time = time.perf_counter()
+            game._handle_events()
+            stats.add(time.perf_counter() - start_time)
+        results.append(stats)
+        print(f"{stats.report()} ({queued} events queued)")
+    return results
+
+
+def benchmark_present(frames=200):
+    # Time presenting one frame with each way of scaling the canvas
+    from canvas import Canvas
+
+    pygame.display.init()
+    configurations = [
+        ("none", {"scaling": "none"}),
+        ("scaled", {"scaling": "scaled"}),
+        ("software x2 nearest", {"scaling": "software", "window_scale": 2}),
+        (
+            "software x2 smooth",
+            {"scaling": "software", "window_scale": 2, "smooth": True},
+        ),
+        ("software x4 nearest", {"scaling": "software", "window_scale": 4}),
+    ]
+    results = []
+    for name, options in configurations:
+        canvas = Canvas(**options)
+        stats = DurationStats(f"Present ({name})")
+        for frame in range(frames):
+            canvas.surface.fill((frame % 256, 0, 0))
+            start_time = time.perf_counter()
+            canvas.present()
+            stats.add(time.perf_counter() - start_time)
+        results.append(stats)
+        print(stats.report())
+    return results
+
+
+def benchmark_render(frames=300, obstacles=6):
+    # Time drawing and presenting a busy gameplay frame with the software
+    # surface renderer and the texture renderer
+    results = []
+    for backend in ("surface", "texture"):
+        constants.RENDER_BACKEND = backend
+        game = _make_game()
+        for index in range(obstacles):
+            game._spawn_obstacle()
+            game.obstacles.sprites()[-1].rect.x = 150 * index
+        stats = DurationStats(f"Draw ({backend})")
+        for _ in range(frames):
+            start_time = time.perf_counter()
+            game._draw()
+            stats.add(time.perf_counter() - start_time)
+        game.renderer.close()
+        results.append(stats)
+        print(stats.report())
+    # Below 1 the texture backend is the faster one on this machine
+    surface, texture = (stats.mean() for stats in results)
+    print(f"Texture / surface draw time: {texture / surface:.2f}")
+    return results
+
+
+def benchmark_text(frames=300):
+    # Time drawing the game over screen, whose text all comes from the
+    # shared text cache, and report how often the cache was hit
+    import text_cache
+
+    constants.RENDER_BACKEND = "surface"
+    game = _make_game()
+    game._change_state(constants.STATE_GAME_OVER)
+    text_cache.clear()
+    stats = DurationStats("Draw (game over)")
+    for _ in range(frames):
+        start_time = time.perf_counter()
+        game._draw()
+        stats.add(time.perf_counter() - start_time)
+    game.renderer.close()
+    print(stats.report())
+    print(text_cache.cache.report())
+    return stats, text_cache.cache.stats()
+
+
+def benchmark_ground(frames=600):
+    # Time drawing the scrolling ground at every offset, for strips of
+    # several widths; each frame copies one window of pixels in at most
+    # two blits, so the cost should not depend on the offset
+    import assets
+    import rendering
+    import scrolling
+    from canvas import Canvas
+
+    pygame.display.init()
+    renderer = rendering.PygameBackend(Canvas(scaling="none"))
+    ground = assets.scale_to_height(
+        assets.prepare_image(pygame.image.load(constants.GROUND_IMAGE)),
+        constants.WINDOW_HEIGHT,
+    )
+    blit = renderer.blit
+    blits = []
+
+    def counted_blit(*args):
+        blits[-1] += 1
+        return blit(*args)
+
+    renderer.blit = counted_blit
+    results = []
+    for times in (1, 2, 4):
+        strip = assets.tile_to_width(ground, constants.WINDOW_WIDTH * times)
+        stats = DurationStats(f"Ground ({strip.get_width()} px strip)")
+        blits.clear()
+        for frame in range(frames):
+            # Step through every offset in the strip over the run
+            offset = frame * strip.get_width() // frames
+            blits.append(0)
+            start_time = time.perf_counter()
+            scrolling.draw_wrapped(renderer, strip, offset)
+            stats.add(time.perf_counter() - start_time)
+        results.append(stats)
+        print(f"{stats.report()}, at most {max(blits)} blits a frame")
+    renderer.close()
+    return results
+
+
+def benchmark_collisions(frames=200, counts=(100, 1000, 5000), lanes=20):
+    # Time finding the obstacles touching the llama by testing every
+    # obstacle, against testing only the candidates from an
+    # obstacles.LaneIndex, with obstacles spread over many lanes
+    import obstacles
+
+    pygame.display.init()
+    image = pygame.Surface((20, 20))
+    mask = pygame.mask.Mask((20, 20), fill=True)
+    llama = pygame.sprite.Sprite()
+    llama.rect = pygame.Rect(
+        constants.PLAYER_HORIZONTAL_POSITION, constants.GROUND_Y - 32, 32, 32
+    )
+    llama.mask = pygame.mask.Mask(llama.rect.size, fill=True)
+
+    results = []
+    for count in counts:
+        group = pygame.sprite.Group()
+        index = obstacles.LaneIndex()
+        for number in range(count):
+            obstacle = pygame.sprite.Sprite()
+            obstacle.image = image
+            obstacle.mask = mask
+            obstacle.lane = number % lanes * 10
+            # Clear of the llama, so every test is a miss
+            obstacle.rect = image.get_rect(
+                bottomleft=(
+                    llama.rect.right + number * 3,
+                    constants.GROUND_Y - obstacle.lane,
+                )
+            )
+            group.add(obstacle)
+            index.add(obstacle)
+        group_stats = DurationStats(f"Every obstacle ({count})")
+        index_stats = DurationStats(f"Lane candidates ({count})")
+        for _ in range(frames):
+            start_time = time.perf_counter()
+            pygame.sprite.spritecollide(
+                llama, group, False, pygame.sprite.collide_mask
+            )
+            group_stats.add(time.perf_counter() - start_time)
+            start_time = time.perf_counter()
+            pygame.sprite.spritecollide(
+                llama,
+                index.candidates(llama.rect),
+                False,
+                pygame.sprite.collide_mask,
+            )
+            index_stats.add(time.perf_counter() - start_time)
+        results += [group_stats, index_stats]
+        print(group_stats.report())
+        print(index_stats.report())
+    return results
+
+
+def benchmark_jump(batches=50, jumps_per_batch=1000):
+    # Time working out where the llama is on every frame of many jumps, by
+    # integrating each one as Llama.update does and by looking each frame
+    # up in the precomputed physics.jump_arc
+    import physics
+
+    arc = physics.jump_arc()
+    bottoms = arc.bottoms
+    frames = range(1, arc.landing_frame + 1)
+    integrate_stats = DurationStats(f"Integrating ({jumps_per_batch} jumps)")
+    table_stats = DurationStats(f"Jump table ({jumps_per_batch} jumps)")
+    for _ in range(batches):
+        start_time = time.perf_counter()
+        for _ in range(jumps_per_batch):
+            bottom = constants.GROUND_Y
+            velocity = constants.JUMP_SPEED
+            for _ in frames:
+                velocity += constants.GRAVITY
+                bottom += int(velocity)
+                if bottom >= constants.GROUND_Y:
+                    bottom = constants.GROUND_Y
+                    velocity = 0
+        integrate_stats.add(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        for _ in range(jumps_per_batch):
+            for frame in frames:
+                bottom = bottoms[frame]
+        table_stats.add(time.perf_counter() - start_time)
+    print(integrate_stats.report())
+    print(table_stats.report())
+    return integrate_stats, table_stats
+
+
+def benchmark_background(frames=600):
+    # Time drawing the background layers behind the ground as the game
+    # scrolls; the tiles are converted once, so each frame is only blits
+    import parallax
+    import rendering
+    from canvas import Canvas
+
+    pygame.display.init()
+    renderer = rendering.PygameBackend(Canvas(scaling="none"))
+    layers = parallax.load_layers()
+    blit = renderer.blit
+    blits = []
+
+    def counted_blit(*args):
+        blits[-1] += 1
+        return blit(*args)
+
+    renderer.blit = counted_blit
+    stats = DurationStats(f"Background ({len(layers)} layers)")
+    for frame in range(frames):
+        distance = frame * constants.OBSTACLE_INITIAL_SPEED
+        blits.append(0)
+        start_time = time.perf_counter()
+        for layer in layers:
+            layer.draw(renderer, distance)
+        stats.add(time.perf_counter() - start_time)
+    print(f"{stats.report()}, at most {max(blits)} blits a frame")
+    renderer.close()
+    return stats
+
+
+def benchmark_formats(blits=2000):
+    # For each image, time blitting it with per-pixel alpha (how every
+    # image used to be loaded) against the format assets.prepare_image
+    # picks for it, and report the time saved
+    import assets
+
+    pygame.display.init()
+    screen = pygame.display.set_mode(
+        (constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT)
+    )
+    sources = {
+        path: pygame.image.load(path) for path in assets.BUNDLED_IMAGES
+    }
+    sources[constants.GROUND_IMAGE] = assets.scale_to_height(
+        pygame.image.load(constants.GROUND_IMAGE), constants.WINDOW_HEIGHT
+    )
+    results = {}
+    for path, source in sources.items():
+        timings = []
+        for image in (source.convert_alpha(), assets.prepare_image(source)):
+            stats = DurationStats(path)
+            for blit in range(blits):
+                start_time = time.perf_counter()
+                screen.blit(image, (blit % 100, 0))
+                stats.add(time.perf_counter() - start_time)
+            timings.append(stats.mean())
+        results[path] = timings
+        saved = 1 - timings[1] / timings[0] if timings[0] else 0.0
+        print(
+            f"{path} ({assets.alpha_kind(source)}):"
+            f" per-pixel alpha {timings[0] * 1e6:.1f} us,"
+            f" chosen format {timings[1] * 1e6:.1f} us,"
+            f" {saved:.0%} saved per blit"
+        )
+    return results
+
+
+BENCHMARKS = {
+    "events": benchmark_events,
+    "present": benchmark_present,
+    "render": benchmark_render,
+    "text": benchmark_text,
+    "ground": benchmark_ground,
+    "background": benchmark_background,
+    "collisions": benchmark_collisions,
+    "jump": benchmark_jump,
+    "formats": benchmark_formats,
+}
+
+
+if __name__ == "__main__":
+    # python benchmark.py [name ...] runs the named benchmarks, or all
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+    pygame.quit()
@@ -0,0 +1,128 @@
+import os
+
+import pygame
+
+import constants
+
+# Ways of getting the logical canvas onto the window
+SCALING_NONE = "none"  # The window is the canvas
+SCALING_SDL = "scaled"  # SDL scales the canvas when it is presented
+SCALING_SOFTWARE = "software"  # The canvas is scaled once per frame
+
+
+def fit_rect(logical_size, output_size, integer_scale):
+    # The largest rect with the canvas's aspect ratio that fits the
+    # output, centred, optionally limited to whole-number scale factors
+    logical_width, logical_height = logical_size
+    output_width, output_height = output_size
+    scale = min(output_width / logical_width, output_height / logical_height)
+    # A window smaller than the canvas can only be shrunk to fit
+    if integer_scale and scale >= 1:
+        scale = int(scale)
+    width = int(logical_width * scale)
+    height = int(logical_height * scale)
+    rect = pygame.Rect(0, 0, width, height)
+    rect.center = (output_width // 2, output_height // 2)
+    return rect
+
+
+class Canvas:
+    def __init__(
+        self,
+        scaling=None,
+        smooth=None,
+        integer_scale=None,
+        fullscreen=None,
+        window_scale=None,
+    ):
+        if scaling is None:
+            scaling = constants.DISPLAY_SCALING
+        if smooth is None:
+            smooth = constants.DISPLAY_SMOOTH_SCALE
+        if integer_scale is None:
+            integer_scale = constants.DISPLAY_INTEGER_SCALE
+        if fullscreen is None:
+            fullscreen = constants.DISPLAY_FULLSCREEN
+        if window_scale is None:
+            window_scale = constants.DISPLAY_WINDOW_SCALE
+        self.smooth = smooth
+        # Everything is drawn at this size, whatever the window size
+        self.logical_size = (constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT)
+        # Part of the window the canvas is scaled into (software scaling)
+        self.output_rect = None
+        self._output = None
+
+        if scaling == SCALING_SDL:
+            # SDL picks the window size and scales on the GPU if there is
+            # one; windowed mode always uses whole-number scale factors
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = "1" if smooth else "0"
+            flags = pygame.SCALED
+            if fullscreen:
+                flags |= pygame.FULLSCREEN
+            try:
+                self.window = pygame.display.set_mode(
+                    self.logical_size, flags
+                )
+                self.surface = self.window
+            except pygame.error as e:
+                print(f"SDL scaling is not available ({e}), using software")
+                scaling = SCALING_SOFTWARE
+        self.scaling = scaling
+
+        if scaling == SCALING_SOFTWARE:
+            if fullscreen:
+                self.window = pygame.display.set_mode(
+                    (0, 0), pygame.FULLSCREEN
+                )
+            else:
+                self.window = pygame.display.set_mode(
+                    (
+                        self.logical_size[0] * window_scale,
+                        self.logical_size[1] * window_scale,
+                    )
+                )
+            self.output_rect = fit_rect(
+                self.logical_size, self.window.get_size(), integer_scale
+            )
+            if self.output_rect.size == self.logical_size:
+                # Nothing to scale, so draw straight into the window
+                self.surface = self.window.subsurface(self.output_rect)
+                self.output_rect = None
+            else:
+                # Borders are drawn once; only the canvas area changes
+                self.window.fill(constants.BLACK)
+                self.surface = pygame.Surface(self.logical_size).convert()
+                # Scale straight into the window, with no new surface per
+                # frame
+                self._output = self.window.subsurface(self.output_rect)
+        elif scaling != SCALING_SDL:
+            self.window = pygame.display.set_mode(self.logical_size)
+            self.surface = self.window
+
+    def present(self):
+        # Scale the canvas onto the window if needed, then show it
+        if self._output is not None:
+            if self.smooth:
+                pygame.transform.smoothscale(
+                    self.surface, self._output.get_size(), self._output
+                )
+            else:
+                pygame.transform.scale(
+                    self.surface, self._output.get_size(), self._output
+                )
+        pygame.display.flip()
+
+    def refresh(self, surface):
+        # Surfaces are blitted as they are, so there is nothing to update
+        pass
+
+    def close(self):
+        pass
+
+    def to_logical(self, position):
+        # Convert a window position (such as the mouse) to canvas pixels
+        if self.output_rect is None:
+            return position
+        x = (position[0] - self.output_rect.x) * self.logical_size[0]
+        y = (position[1] - self.output_rect.y) * self.logical_size[1]
+        return (x // self.output_rect.width, y // self.output_rect.height)
@@ -3,22 +3,79 @@ import pygame
 WINDOW_WIDTH = 900  # Width of the game window
 WINDOW_HEIGHT = 400  # Height of the game window
 WINDOW_TITLE = "Llama Game - Joseph Surrey"  # Title of game window
+# The game is always drawn at WINDOW_WIDTH x WINDOW_HEIGHT and then shown:
+#   "none"     in a window of exactly that size
+#   "scaled"   scaled by SDL (on the GPU if there is one) to fit the screen
+#   "software" scaled once per frame into a larger window or full screen
+DISPLAY_SCALING = "none"
+DISPLAY_SMOOTH_SCALE = False  # Smooth (linear) rather than nearest scaling
+DISPLAY_INTEGER_SCALE = True  # Only scale by whole numbers ("software")
+DISPLAY_FULLSCREEN = False  # Fill the screen ("scaled" and "software")
+DISPLAY_WINDOW_SCALE = 2  # Window size multiplier ("software", windowed)
+
+# How frames are drawn: "surface" blits in software onto the display
+# surface, "texture" uploads each image once and draws textures with an
+# SDL renderer (see texture_canvas.py), "null" draws nothing and opens no
+# window, for headless runs (see rendering.py)
+# "surface" stays the default: with SDL's software renderer the texture
+# backend drew a busy frame in about 1 ms against 0.5 ms for "surface", so
+# only switch where "python benchmark.py render" shows it to be faster
+RENDER_BACKEND = "surface"
+# Texture renderer to use: -1 any, 0 SDL's software renderer, 1 GPU only
+TEXTURE_ACCELERATED = -1
+TEXTURE_VSYNC = False  # Wait for the display's refresh when presenting
 FPS = 30  # Frames per second
 
 # Custom pygame event
 OBSTACLE_SPAWN_EVENT = pygame.USEREVENT + 1
 
+# The only events SDL queues; everything else (mouse motion, window
+# events, joystick events, ...) is dropped before it reaches the queue
+ALLOWED_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEWHEEL,
+    pygame.WINDOWEXPOSED,
+    OBSTACLE_SPAWN_EVENT,
+)
+# Typed text is only queued while a name is being entered, where it fills
+# in the unicode attribute of key presses
+TEXT_INPUT_EVENTS = (pygame.TEXTINPUT, pygame.TEXTEDITING)
+
+# Game states
+STATE_PLAYING = "playing"
+STATE_GAME_OVER = "game over"
+STATE_SAVE_PROMPT = "save prompt"
+STATE_ENTERING_NAME = "entering name"
+STATE_DISPLAYING_SCORES = "displaying scores"
+
 GROUND_Y = 235  # Y position of the ground
 
 GRAVITY = 1.5  # Acceleration due to gravity
 JUMP_SPEED = -20  # Speed at which the player jumps
+# Run the llama and obstacle physics in whole sub-pixel units rather than
+# floats, so replays give bit-identical results on any machine
+FIXED_POINT_PHYSICS = False
+PHYSICS_SUBPIXELS = 256  # Sub-pixel units in a pixel
 
 PLAYER_HORIZONTAL_POSITION = 100  # Starting horizontal position of the player
+PLAYER_RUN_FRAME_TICKS = 4  # Frames of the game each run frame is shown for
 
 OBSTACLE_INITIAL_SPEED = 8  # Initial speed of obstacles
 OBSTACLE_CREATION_INTERVAL = 2000  # Time interval between obstacle creations
 # (in milliseconds)
 
+# Background layers drawn behind the ground, back to front, each as
+# (kind, share of obstacle speed it scrolls at, top y, height, tile width)
+# Kinds are the tiles drawn in parallax.py; each layer costs at most two
+# blits a frame
+PARALLAX_LAYERS = (
+    ("sky", 0.0, 0, 400, 900),
+    ("clouds", 0.1, 20, 80, 300),
+    ("hills", 0.3, 135, 100, 450),
+)
+
 # Standard colour values
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -27,8 +84,95 @@ RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 
+# Font sizes
+SCORE_FONT_SIZE = 36  # Scoreboard text
+GAME_OVER_FONT_SIZE = 74  # "GAME OVER" heading
+INSTRUCTION_FONT_SIZE = 36  # Final score and restart instructions
+BUTTON_FONT_SIZE = 24  # Button labels
+INPUT_FONT_SIZE = 36  # Name being typed
+HIGHSCORE_TITLE_FONT_SIZE = 60  # "High Scores" heading
+HIGHSCORE_ENTRY_FONT_SIZE = 30  # High score table rows
+# Every font size loaded at startup
+FONT_SIZES = (
+    SCORE_FONT_SIZE,
+    GAME_OVER_FONT_SIZE,
+    INSTRUCTION_FONT_SIZE,
+    BUTTON_FONT_SIZE,
+    INPUT_FONT_SIZE,
+    HIGHSCORE_TITLE_FONT_SIZE,
+    HIGHSCORE_ENTRY_FONT_SIZE,
+)
+
+# High scores
+HIGH_SCORE_FILE = "high_scores.json"  # Where high scores are saved
+# Where high scores are stored: "json" keeps the board in HIGH_SCORE_FILE,
+# "sqlite" keeps every score ever posted in HIGH_SCORE_DATABASE and
+# "journal" appends each score to HIGH_SCORE_JOURNAL
+HIGH_SCORE_BACKEND = "json"
+HIGH_SCORE_DATABASE = "high_scores.db"
+HIGH_SCORE_JOURNAL = "high_scores.journal"
+# The board the journal is folded into on compaction
+HIGH_SCORE_SNAPSHOT = "high_scores.snapshot.json"
+# Journal records written before it is compacted into the snapshot
+JOURNAL_COMPACT_RECORDS = 100
+MAX_HIGH_SCORES = 10  # Number of scores kept
+HIGH_SCORES_SHOWN = 7  # Rows visible at once on the high score screen
+HIGH_SCORES_START_Y = 120  # Y position of the first high score row
+HIGH_SCORES_LINE_HEIGHT = 35  # Distance between high score rows
+# Fraction of the remaining distance the high score list scrolls per frame
+HIGH_SCORES_SCROLL_EASING = 0.25
+MAX_NAME_LENGTH = 6  # Longest name that can be entered
+
+# Maximum memory (in bytes) used by cached rendered text
+TEXT_CACHE_BUDGET = 4 * 1024 * 1024
+
 # Image file locations
 PLAYER_IMAGE = "images/Llama.png"
+# Frames of the llama's run, starting with the standing image
+PLAYER_RUN_IMAGES = (
+    "images/Llama.png",
+    "images/Llama2.png",
+    "images/Llama3.png",
+)
 OBSTACLE_IMAGE = "images/cactus.png"
+FLYING_OBSTACLE_IMAGE = "images/bird.png"
 GROUND_IMAGE = "images/ground.png"
 GAME_ICON = "images/llama_icon.png"
+
+# Kinds of obstacle, by id: (image, (width, height) scale, copies side by
+# side, spawn weight, lanes); built once at startup by
+# obstacles.load_variants
+# A lane is a height above the ground an obstacle can be placed at; flying
+# obstacles pick one of several
+OBSTACLE_VARIANTS = {
+    "small": (OBSTACLE_IMAGE, (1, 1), 1, 4, (0,)),
+    "tall": (OBSTACLE_IMAGE, (1, 1.6), 1, 2, (0,)),
+    "double": (OBSTACLE_IMAGE, (1, 1), 2, 2, (0,)),
+    "wide": (OBSTACLE_IMAGE, (0.75, 0.75), 3, 1, (0,)),
+    "bird": (FLYING_OBSTACLE_IMAGE, (1, 1), 1, 2, (12, 45, 90)),
+}
+OBSTACLE_DEFAULT_VARIANT = "small"
+
+# Collision masks
+MASK_ALPHA_THRESHOLD = 127  # Pixels with alpha above this are solid
+MASK_CACHE_ENABLED = True  # Store masks on disk next to their images
+
+# Pre-baked images (built with "python assets.py")
+ASSET_BUNDLE = "images/assets.bundle"
+# Colour that marks see-through pixels in images drawn without per-pixel
+# alpha; must not be used by any of their visible pixels
+COLORKEY = (255, 0, 255)
+
+# Print a breakdown of time to first frame when the game starts
+SHOW_STARTUP_REPORT = False
+
+# Print the text cache's hit rate and memory use on exit
+SHOW_TEXT_CACHE_REPORT = False
+
+# Time every call to Game._handle_events and print a summary on exit
+PROFILE_EVENTS = False
+
+# Time each jump from its key press to the first frame showing it, then
+# print a summary and write every sample to INPUT_LATENCY_FILE on exit
+MEASURE_INPUT_LATENCY = False
+INPUT_LATENCY_FILE = "input_latency.csv"
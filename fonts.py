@@ -0,0 +1,43 @@
+import pygame
+
+
+class FontRegistry:
+    def __init__(self):
+        # Fonts already created, keyed by (name, size, bold, italic)
+        self.fonts = {}
+
+    def get(self, size, name=None, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        # Create each font once and share it between every caller
+        if key not in self.fonts:
+            # Initialise the font module the first time a font is needed
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if bold or italic:
+                self.fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+            else:
+                self.fonts[key] = pygame.font.SysFont(name, size)
+        return self.fonts[key]
+
+    def preload(self, sizes, name=None, bold=False, italic=False):
+        # Create fonts for every known size ahead of the first frame
+        for size in sizes:
+            self.get(size, name, bold, italic)
+
+    def clear(self):
+        # Forget every created font (used when pygame is shut down)
+        self.fonts.clear()
+
+
+# Registry shared by the whole game
+registry = FontRegistry()
+
+
+def get_font(size, name=None, bold=False, italic=False):
+    # Shortcut for looking up a font in the shared registry
+    return registry.get(size, name, bold, italic)
+
+
+def clear():
+    # Shortcut for clearing the shared registry
+    registry.clear()
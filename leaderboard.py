@@ -0,0 +1,123 @@
+from array import array
+from bisect import bisect_right
+
+import constants
+
+
+def _valid_entries(scores):
+    # (name, score) pairs from the JSON form, skipping any entry that is
+    # not a dict or whose score is not a number, so one bad entry never
+    # costs the rest of the table
+    for entry in scores:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            score = int(entry.get("score", 0))
+        except (TypeError, ValueError, OverflowError):
+            continue
+        yield str(entry.get("name", "N/A")), score
+
+
+class Leaderboard:
+    def __init__(self, capacity=constants.MAX_HIGH_SCORES):
+        # Maximum number of entries kept
+        self.capacity = capacity
+        # Scores are stored negated so that the array is in ascending order
+        # (which bisect needs) while the leaderboard reads highest first
+        self._keys = array("q")
+        # Player names, in the same order as _keys
+        self._names = []
+        # Lowest score still on a full leaderboard (None while not full)
+        self.threshold = None
+        # Increased on every change, so views of the board can tell when
+        # they are out of date
+        self.version = 0
+
+    @classmethod
+    def from_entries(cls, entries, capacity=constants.MAX_HIGH_SCORES):
+        # Build from (name, score) pairs with a single sort, which is much
+        # faster than inserting a long history one entry at a time
+        leaderboard = cls(capacity)
+        # sorted() is stable, so equal scores keep their original order
+        ranked = sorted(entries, key=lambda entry: -entry[1])[:capacity]
+        leaderboard._keys = array("q", (-score for _, score in ranked))
+        leaderboard._names = [name for name, _ in ranked]
+        leaderboard._update_threshold()
+        return leaderboard
+
+    @classmethod
+    def from_list(cls, scores, capacity=constants.MAX_HIGH_SCORES):
+        # Build from the JSON form: a list of {"name", "score"} dicts
+        # Entries without a score count as zero
+        return cls.from_entries(_valid_entries(scores), capacity)
+
+    def to_list(self):
+        # Convert to the JSON form, highest score first
+        return [{"name": name, "score": score} for name, score in self]
+
+    def add(self, name, score):
+        # Insert a score after any equal scores, returning its rank
+        # (0 is the top) or None if it did not make the leaderboard
+        key = -score
+        index = bisect_right(self._keys, key)
+        if index >= self.capacity:
+            return None
+
+        self._keys.insert(index, key)
+        self._names.insert(index, name)
+        # Drop the lowest entry once over capacity
+        if len(self._keys) > self.capacity:
+            self._keys.pop()
+            self._names.pop()
+        self._update_threshold()
+        self.version += 1
+        return index
+
+    def _update_threshold(self):
+        # Cache the score that must be beaten to get onto a full leaderboard
+        if len(self._keys) >= self.capacity and self._keys:
+            self.threshold = -self._keys[-1]
+        else:
+            self.threshold = None
+
+    def is_eligible(self, score):
+        # A score qualifies if there is space or it beats the lowest score
+        return self.threshold is None or score > self.threshold
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, index):
+        # Entries are (name, score) pairs
+        return self._names[index], -self._keys[index]
+
+    def __iter__(self):
+        for name, key in zip(self._names, self._keys):
+            yield name, -key
+
+    def top(self, count, offset=0):
+        # The highest scores, as (name, score) pairs, starting at offset
+        end = min(offset + count, len(self))
+        return [self[index] for index in range(offset, end)]
+
+    def total(self):
+        # Number of rows that can be shown: a board on its own keeps
+        # nothing beyond its entries
+        return len(self)
+
+    def save(self):
+        # Nothing to write: a board on its own lives only in memory
+        pass
+
+    def save_error(self):
+        # Nothing is written, so nothing can fail
+        return None
+
+    def close(self):
+        pass
+
+    def clear(self):
+        del self._keys[:]
+        self._names.clear()
+        self._update_threshold()
+        self.version += 1
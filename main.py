@@ -1,42 +1,154 @@
+import os
 import sys
+import json
 import random
+import sqlite3
+import time
+from pathlib import Path
+
 import pygame
 
+import animation
+import assets
 import constants
+import fonts
+from leaderboard import Leaderboard
+import masks
+import obstacles
+import parallax
+import physics
+import rendering
+import scrolling
+from score_db import SQLiteLeaderboard
+from score_file import ScoreFile
+from score_journal import ScoreJournal
+from score_writer import ScoreWriter
+import states
+import text_cache
+from profiling import DurationStats, LatencyTracker, StartupTimer
 
 
 class Game:
     def __init__(self):
-        # Initialise pygame
-        pygame.init()
-        # Initialise pygame sound
-        pygame.mixer.init()
-        # Initialise pygame font
-        pygame.font.init()
-
-        # Set the display mode with defined constants for width and height
-        self.screen = pygame.display.set_mode(
-            (constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT)
-        )
+        # Start timing the startup phases
+        self.startup_timer = StartupTimer()
+
+        # The null backend opens no window, so SDL needs no display
+        if constants.RENDER_BACKEND == "null":
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+        # Initialise only the display subsystem; fonts are initialised on
+        # first use and sound is never initialised as no audio is played
+        pygame.display.init()
+        self.startup_timer.mark("pygame init")
+
+        # Everything is drawn through a render backend, onto a canvas of
+        # the window size set in constants that is scaled to the real
+        # window when presented
+        self.renderer = rendering.create_backend()
+        self.screen = self.renderer.screen
         # Set the window caption
         pygame.display.set_caption(constants.WINDOW_TITLE)
 
+        # Set timer for obstacle spawning
+        # This also starts SDL's timer subsystem, which get_ticks relies on
+        # now that pygame.init() is no longer called
+        pygame.time.set_timer(
+            constants.OBSTACLE_SPAWN_EVENT,
+            constants.OBSTACLE_CREATION_INTERVAL,
+        )
+        # Only queue the events the game handles
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(constants.ALLOWED_EVENTS)
+        self.startup_timer.mark("display")
+
+        # Load pre-converted images from the asset bundle if it is up to date
+        assets.load_bundle()
+        self.startup_timer.mark("asset bundle")
+
         # Start game clock
         self.clock = pygame.time.Clock()
 
         # Set initial game states
         self.running = True
-        self.game_over = False
+        # Speed obstacles move at, and the distance the world has scrolled
+        # by it, in pixels
+        self.scroll_speed = constants.OBSTACLE_INITIAL_SPEED
+        self.scroll_distance = 0
+        self._score_eligible_for_save = False
+        self.player_name = ""
+        # Set when an idle state needs drawing again
+        self.needs_redraw = True
+
+        # Scroll position of the high score list, in pixels, and the
+        # position it is easing towards
+        self.high_scores_scroll = 0.0
+        self.high_scores_scroll_target = 0
+        # The high score screen is drawn once into this surface and only
+        # redrawn when the scores or scroll position change
+        self.high_scores_surface = None
+        self.high_scores_surface_key = None
+        # Why the high scores on that screen could not be saved, if they
+        # could not
+        self.save_error_shown = None
+
+        # Each state handles its own events, updates and drawing
+        self.states = {}
+        for state_class in states.STATES:
+            self.states[state_class.name] = state_class(self)
+        self.state = self.states[constants.STATE_PLAYING]
+        # Events handled the same way in every state
+        self.event_handlers = self._build_event_handlers()
+        # Time spent handling events each frame, if it is being measured
+        self.event_stats = None
+        if constants.PROFILE_EVENTS:
+            self.event_stats = DurationStats("Event handling")
+        # Time from jump key press to the jump being on screen, if it is
+        # being measured
+        self.input_latency = None
+        if constants.MEASURE_INPUT_LATENCY:
+            self.input_latency = LatencyTracker("Input to photon")
+        # When the event queue was last read, and the time before that
+        self.event_poll_time = time.perf_counter()
+        self.previous_event_poll_time = self.event_poll_time
+
+        # Load saved high scores
+        self.high_score_file = constants.HIGH_SCORE_FILE
+        # Writes high scores on a background thread so saving never
+        # stalls a frame
+        self.score_writer = ScoreWriter()
+        self.high_scores = self._load_high_scores()
 
         # Get start time
         self.start_time = pygame.time.get_ticks()
 
+        # Load every font size the game uses before anything renders text
+        fonts.registry.preload(constants.FONT_SIZES)
+        # Define fonts (fonts of the same size share one font object)
+        self.score_font = fonts.get_font(constants.SCORE_FONT_SIZE)
+        self.game_over_font = fonts.get_font(constants.GAME_OVER_FONT_SIZE)
+        self.instruction_font = fonts.get_font(
+            constants.INSTRUCTION_FONT_SIZE
+        )
+        self.button_font = fonts.get_font(constants.BUTTON_FONT_SIZE)
+        self.input_font = fonts.get_font(constants.INPUT_FONT_SIZE)
+        self.highscore_title_font = fonts.get_font(
+            constants.HIGHSCORE_TITLE_FONT_SIZE
+        )
+        self.highscore_entry_font = fonts.get_font(
+            constants.HIGHSCORE_ENTRY_FONT_SIZE
+        )
+        self.startup_timer.mark("fonts")
+
         # Create groups to hold game sprites
         self.all_sprites = pygame.sprite.Group()
         self.obstacles = pygame.sprite.Group()
+        # The same obstacles, indexed by lane for collision checks
+        self.obstacle_lanes = obstacles.LaneIndex()
 
-        # Create player sprite (Llama)
-        self.llama = Llama()
+        # Create player sprite (Llama), running through its animation
+        # frames, which are loaded once and shared
+        self.llama = Llama(animation.load_frames(constants.PLAYER_RUN_IMAGES))
         self.llama.reset()
 
         # Add player sprite to all_sprites group
@@ -44,71 +156,62 @@ class Game:
 
         # Create scoreboard
         self.scoreboard = Scoreboard()
+        self.startup_timer.mark("sprites")
 
-        # Load ground image
-        self.scaled_ground_image = None
-        try:
-            # Load the original image
-            original_ground_surf = pygame.image.load(
-                constants.GROUND_IMAGE
-            ).convert_alpha()
-
-            # Get original dimensions
-            original_width = original_ground_surf.get_width()
-            original_height = original_ground_surf.get_height()
-
-            # Calculate the desired height based on GROUND_Y and window height
-            target_height = constants.WINDOW_HEIGHT
-
-            # Check if original dimensions and target height are valid
-            if (
-                original_width > 0
-                and original_height > 0
-                and target_height > 0
-            ):
-                # Calculate the aspect ratio
-                aspect_ratio = float(original_width) / float(original_height)
-
-                # Calculate the target width
-                target_width = int(aspect_ratio * target_height)
-
-                # Ensure target_width is at least 1 pixel
-                if target_width < 1:
-                    target_width = 1
-
-                # Scale the image using transform.scale
-                self.scaled_ground_image = pygame.transform.scale(
-                    original_ground_surf,
-                    (
-                        target_width,
-                        target_height,
-                    ),  # Scale to calculated width, target height
+        # Load ground image, already scaled if it came from the bundle
+        self.scaled_ground_image = assets.bundled_image(
+            constants.GROUND_IMAGE
+        )
+        if self.scaled_ground_image is None:
+            try:
+                # Load the original image
+                original_ground_surf = assets.prepare_image(
+                    pygame.image.load(constants.GROUND_IMAGE)
                 )
 
-            else:
+                # Scale to the window height, keeping the aspect ratio
+                self.scaled_ground_image = assets.scale_to_height(
+                    original_ground_surf, constants.WINDOW_HEIGHT
+                )
+
+            except pygame.error as e:
+                print(
+                    f"Error loading or scaling ground image:"
+                    f" {constants.GROUND_IMAGE} - {e}"
+                )
+                self.scaled_ground_image = None
+            except FileNotFoundError:
+                print(
+                    f"Ground image file not found: {constants.GROUND_IMAGE}"
+                )
                 self.scaled_ground_image = None
+        # Repeat the ground into a strip at least as wide as the window, so
+        # it can scroll with at most two blits
+        if self.scaled_ground_image is not None:
+            self.scaled_ground_image = assets.tile_to_width(
+                self.scaled_ground_image, constants.WINDOW_WIDTH
+            )
+        self.startup_timer.mark("ground image")
 
+        # Background layers behind the ground, each drawn once into a tile
+        try:
+            self.background_layers = parallax.load_layers()
         except pygame.error as e:
-            print(
-                f"Error loading or scaling ground image:"
-                f" {constants.GROUND_IMAGE} - {e}"
+            print(f"Error building background layers: {e}")
+            self.background_layers = []
+        # An opaque first layer over the whole window hides the clear, so
+        # the clear is skipped rather than filling the screen for nothing
+        self.clear_playfield = not (
+            self.background_layers
+            and self.background_layers[0].covers(
+                constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT
             )
-            self.scaled_ground_image = None
-        except FileNotFoundError:
-            print(f"Ground image file not found: {constants.GROUND_IMAGE}")
-            self.scaled_ground_image = None
-
-        # Set timer for obstacle spawning
-        pygame.time.set_timer(
-            constants.OBSTACLE_SPAWN_EVENT,
-            constants.OBSTACLE_CREATION_INTERVAL,
         )
+        self.startup_timer.mark("background")
 
-        # Define fonts
-        self.score_font = pygame.font.SysFont(None, 36)
-        self.game_over_font = pygame.font.SysFont(None, 74)
-        self.instruction_font = pygame.font.SysFont(None, 36)
-        self.button_font = pygame.font.SysFont(None, 24)
+        # Scale and compose every obstacle variant now, not mid-game
+        obstacles.load_variants()
+        self.startup_timer.mark("obstacles")
 
     def run(self):
         # Begin main loop
@@ -117,70 +220,275 @@ class Game:
             self._handle_events()
             # Update the state and position of game objects
             self._update()
-            # Draw everything onto the screen
-            self._draw()
+            # Draw everything onto the screen, unless the state is idle
+            # and nothing has changed since the last frame
+            idle = self.state.idle and not self.needs_redraw
+            if not idle:
+                self.needs_redraw = False
+                self._draw()
+            # Report how long it took to show the first frame
+            if not self.startup_timer.finished:
+                self.startup_timer.finish()
+                if constants.SHOW_STARTUP_REPORT:
+                    print(self.startup_timer.report())
             # Control the game's FPS
             # Used clock.tick_busy_loop which uses more CPU than clock.tick to
             # ensure that the FPS timing is more accurate
-            self.clock.tick_busy_loop(constants.FPS)
+            # Idle frames have nothing to time, so they sleep instead
+            if idle:
+                self.clock.tick(constants.FPS)
+            else:
+                self.clock.tick_busy_loop(constants.FPS)
 
         # Exit after main loop finishes
+        if self.event_stats is not None:
+            print(self.event_stats.report())
+        if self.input_latency is not None:
+            print(self.input_latency.report())
+            try:
+                self.input_latency.export(constants.INPUT_LATENCY_FILE)
+            except OSError as e:
+                print(
+                    f"Error writing {constants.INPUT_LATENCY_FILE}: {e}"
+                )
+        if constants.SHOW_TEXT_CACHE_REPORT:
+            print(text_cache.cache.report())
+        # Wait for any queued high scores to reach the disk
+        self.high_scores.close()
+        self.score_writer.close()
+        text_cache.clear()
+        fonts.clear()
+        self.renderer.close()
         pygame.quit()
         sys.exit()
 
+    def _build_event_handlers(self):
+        # Handlers for events every state handles the same way, keyed by
+        # (event type, key); used when the current state has no handler
+        return {
+            # Closing the window
+            (pygame.QUIT, None): self._on_quit,
+            # The window was uncovered, so draw it again
+            (pygame.WINDOWEXPOSED, None): self._on_window_exposed,
+        }
+
+    def _current_state(self):
+        return self.state.name
+
+    def _change_state(self, name):
+        # Leave the current state and enter the new one
+        self.state.exit()
+        self.state = self.states[name]
+        self.state.enter()
+        self.needs_redraw = True
+
+    def _game_over_state(self):
+        # Game over offers to save the score if it made the table
+        if self._score_eligible_for_save:
+            return constants.STATE_SAVE_PROMPT
+        return constants.STATE_GAME_OVER
+
+    # The old state flags, now read from and set through the state
+    @property
+    def game_over(self):
+        return self.state.name != constants.STATE_PLAYING
+
+    @game_over.setter
+    def game_over(self, value):
+        if value and not self.game_over:
+            self._change_state(self._game_over_state())
+        elif not value and self.game_over:
+            self._change_state(constants.STATE_PLAYING)
+
+    @property
+    def entering_name(self):
+        return self.state.name == constants.STATE_ENTERING_NAME
+
+    @entering_name.setter
+    def entering_name(self, value):
+        if value and not self.entering_name:
+            self._change_state(constants.STATE_ENTERING_NAME)
+        elif not value and self.entering_name:
+            self._change_state(self._game_over_state())
+
+    @property
+    def displaying_scores(self):
+        return self.state.name == constants.STATE_DISPLAYING_SCORES
+
+    @displaying_scores.setter
+    def displaying_scores(self, value):
+        if value and not self.displaying_scores:
+            self._change_state(constants.STATE_DISPLAYING_SCORES)
+        elif not value and self.displaying_scores:
+            self._change_state(self._game_over_state())
+
+    @property
+    def score_eligible_for_save(self):
+        return self._score_eligible_for_save
+
+    @score_eligible_for_save.setter
+    def score_eligible_for_save(self, value):
+        self._score_eligible_for_save = value
+        # Switch between the game over screens with and without the prompt
+        if self.state.name in (
+            constants.STATE_GAME_OVER,
+            constants.STATE_SAVE_PROMPT,
+        ):
+            new_state = self._game_over_state()
+            if new_state != self.state.name:
+                self._change_state(new_state)
+
     def _handle_events(self):
+        if self.event_stats is not None:
+            start_time = time.perf_counter()
+        if self.input_latency is not None:
+            self.previous_event_poll_time = self.event_poll_time
+            self.event_poll_time = time.perf_counter()
+
         # Check for any user actions or game events
         for event in pygame.event.get():
-            # Check if the user tried to close the game window
-            if event.type == pygame.QUIT:
-                self.running = False
-
-            # Events during gameplay
-            if not self.game_over:
-                # Check if it's time to create new obstacle
-                if event.type == constants.OBSTACLE_SPAWN_EVENT:
-                    self._spawn_obstacle()
-                # Check if the user pressed the jump key
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE or event.key == pygame.K_UP:
-                        self.llama.jump()
-
-            # Events during game over
-            elif self.game_over:
-                if event.type == pygame.KEYDOWN:
-                    # Check if the user pressed the restart key
-                    if event.key == pygame.K_r:
-                        self._reset_game()
-                    # Check if the user pressed the quit key
-                    elif event.key == pygame.K_q:
-                        self.running = False
+            self._dispatch_event(event)
+
+        if self.event_stats is not None:
+            self.event_stats.add(time.perf_counter() - start_time)
+
+    def _dispatch_event(self, event):
+        # The current state handles the event if it can
+        if self.state.handle_event(event):
+            # Whatever the event changed needs drawing
+            self.needs_redraw = True
+            return
+        handler = self.event_handlers.get((event.type, None))
+        if handler is not None:
+            handler(event)
+
+    def _on_quit(self, event):
+        self.running = False
+
+    def _on_window_exposed(self, event):
+        self.needs_redraw = True
+
+    def _on_spawn_timer(self, event):
+        # Time to create a new obstacle
+        self._spawn_obstacle()
+
+    def _on_jump_key(self, event):
+        if self.input_latency is None:
+            self.llama.jump()
+            return
+
+        # Time the key press if it started a jump
+        was_jumping = self.llama.is_jumping
+        self.llama.jump()
+        if not was_jumping and self.llama.is_jumping:
+            self.input_latency.input(
+                self._event_time(event), self.previous_event_poll_time
+            )
+
+    def _event_time(self, event):
+        # pygame does not pass on SDL's event timestamp, so an input is
+        # timed from when the queue was read unless the event has one
+        # (in milliseconds of SDL ticks)
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is None:
+            return self.event_poll_time
+        age = (pygame.time.get_ticks() - timestamp) / 1000
+        return self.event_poll_time - age
+
+    def _on_save_key(self, event):
+        # Save the high score, if it made the table
+        if self.score_eligible_for_save:
+            self._change_state(constants.STATE_ENTERING_NAME)
+
+    def _on_decline_save_key(self, event):
+        if self.score_eligible_for_save:
+            self.score_eligible_for_save = False
+
+    def _on_high_scores_key(self, event):
+        self._show_high_scores()
+
+    def _on_restart_key(self, event):
+        self._reset_game()
+
+    def _on_close_high_scores(self, event):
+        self._change_state(self._game_over_state())
+
+    def _on_high_scores_click(self, event):
+        # Mouse wheel movement also arrives as buttons 4 and 5
+        if event.button not in (4, 5):
+            self._change_state(self._game_over_state())
+
+    def _on_scroll_key(self, event):
+        # Scroll the list one row at a time
+        direction = 1 if event.key == pygame.K_DOWN else -1
+        self._scroll_high_scores(direction * constants.HIGH_SCORES_LINE_HEIGHT)
+
+    def _on_scroll_wheel(self, event):
+        self._scroll_high_scores(-event.y * constants.HIGH_SCORES_LINE_HEIGHT)
+
+    def _set_text_input(self, enabled):
+        # Typed text fills in the unicode attribute of key presses, so it
+        # is only queued while a name is being entered
+        if enabled:
+            pygame.event.set_allowed(constants.TEXT_INPUT_EVENTS)
+        else:
+            pygame.event.set_blocked(constants.TEXT_INPUT_EVENTS)
+
+    def _handle_name_entry_key(self, event):
+        # Submit the name
+        if event.key == pygame.K_RETURN:
+            # The score can only be saved once
+            self._score_eligible_for_save = False
+            if self.player_name.strip():
+                self._add_high_score(self.player_name, self.scoreboard.score)
+                # Show where the new score placed
+                self._show_high_scores()
+            else:
+                self._change_state(constants.STATE_GAME_OVER)
+        # Delete the last character
+        elif event.key == pygame.K_BACKSPACE:
+            self.player_name = self.player_name[:-1]
+        # Add letters, numbers and spaces up to the length limit
+        elif len(self.player_name) < constants.MAX_NAME_LENGTH and (
+            event.unicode.isalnum() or event.unicode == " "
+        ):
+            self.player_name += event.unicode
 
     def _update(self):
-        # Check if the game is playing
-        if not self.game_over:
-            # Updates all game objects
-            self.all_sprites.update()
-            # Update the score based on  time
-            self.scoreboard.update(pygame.time.get_ticks(), self.start_time)
-            # Check for collisions
-            self._check_collisions()
+        # Only the current state moves
+        self.state.update()
 
     def _draw(self):
+        # A headless backend shows nothing, so there is nothing to draw
+        if self.renderer.headless:
+            return
+
+        # Each state draws its own screen
+        self.state.draw()
+
+        # Show final image
+        self.renderer.present()
+        # The frame has been presented, so any jump is now on screen
+        if self.input_latency is not None:
+            self.input_latency.presented(time.perf_counter())
+
+    def _draw_playfield(self):
         # Draw background
-        self.screen.fill(constants.WHITE)
+        if self.clear_playfield:
+            self.renderer.clear(constants.WHITE)
+        # Each layer scrolls at its own share of the obstacle speed
+        for layer in self.background_layers:
+            layer.draw(self.renderer, self.scroll_distance)
 
         # Draw gameplay elements
         if self.scaled_ground_image:
-            scaled_width = self.scaled_ground_image.get_width()
-            draw_y = 0
-
-            if scaled_width > 0:
-                draw_x = 0
-                while draw_x < constants.WINDOW_WIDTH:
-                    self.screen.blit(
-                        self.scaled_ground_image, (draw_x, draw_y)
-                    )
-                    draw_x += scaled_width
+            if self.scaled_ground_image.get_width() > 0:
+                # The ground moves with the obstacles
+                scrolling.draw_wrapped(
+                    self.renderer,
+                    self.scaled_ground_image,
+                    self.scroll_distance,
+                )
             else:
                 # Fallback if scaled_width is 0
                 print(
@@ -193,7 +501,7 @@ class Game:
                     constants.WINDOW_WIDTH,
                     constants.WINDOW_HEIGHT - constants.GROUND_Y,
                 )
-                pygame.draw.rect(self.screen, constants.GREY, ground_rect)
+                self.renderer.fill_rect(constants.GREY, ground_rect)
 
         else:
             # Fallback: Draw solid ground rectangle if image failed to load
@@ -203,89 +511,240 @@ class Game:
                 constants.WINDOW_WIDTH,
                 constants.WINDOW_HEIGHT - constants.GROUND_Y,
             )
-            pygame.draw.rect(self.screen, constants.GREY, ground_rect)
+            self.renderer.fill_rect(constants.GREY, ground_rect)
 
         # Draw all active game objects
-        self.all_sprites.draw(self.screen)
+        self.renderer.draw_sprites(self.all_sprites)
         # Draw score
-        self.scoreboard.draw(self.screen)
+        self.scoreboard.draw(self.renderer)
+
+    def _draw_game_over_text(self):
+        # Draw "Game Over" text
+        self._draw_text(
+            self.game_over_font,
+            "GAME OVER",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 - 50),
+        )
+
+        # Draw the final score text (using instruction font size)
+        self._draw_text(
+            self.instruction_font,
+            f"Final Score: {self.scoreboard.score}",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2),
+        )
+
+        # Draw the "Restart/Quit" instructions
+        self._draw_text(
+            self.instruction_font,
+            "Press 'R' to Restart or 'Q' to Quit",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 + 80),
+        )
+
+        # Draw the high scores instruction
+        self._draw_text(
+            self.button_font,
+            "Press 'H' for High Scores",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 + 120),
+        )
+
+    def _draw_save_prompt(self):
+        # Offer to save the score, as it made the high score table
+        self._draw_text(
+            self.instruction_font,
+            "High Score! Save? (Y/N)",
+            constants.RED,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 + 40),
+        )
+
+    def _draw_text(self, font, text, color, center, surface=None):
+        # Render text (through the text cache) centred on a point
+        if surface is None:
+            self.renderer.draw_text(font, text, color, center)
+            return
+        text_surf = text_cache.render(font, text, True, color)
+        text_rect = text_surf.get_rect(center=center)
+        surface.blit(text_surf, text_rect)
+
+    def _draw_name_entry_screen(self):
+        # Draw background
+        self.renderer.clear(constants.WHITE)
+
+        # Draw the prompt
+        self._draw_text(
+            self.instruction_font,
+            "Enter Your Name:",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 - 50),
+        )
+        # Draw the name typed so far with a cursor
+        self._draw_text(
+            self.input_font,
+            f"{self.player_name}_",
+            constants.BLUE,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2),
+        )
+        # Draw the instructions
+        self._draw_text(
+            self.button_font,
+            "Press ENTER to Save",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT // 2 + 60),
+        )
+
+    def _show_high_scores(self):
+        # Open the high score screen (at the top of the list)
+        self._change_state(constants.STATE_DISPLAYING_SCORES)
+
+    def _scroll_high_scores(self, amount):
+        # Move the scroll target, keeping the last row on screen
+        # Clamped to every row the backend can page through, which for the
+        # database is more than the board it keeps in memory
+        hidden_rows = max(
+            0, self.high_scores.total() - constants.HIGH_SCORES_SHOWN
+        )
+        max_scroll = hidden_rows * constants.HIGH_SCORES_LINE_HEIGHT
+        self.high_scores_scroll_target = min(
+            max(self.high_scores_scroll_target + amount, 0), max_scroll
+        )
 
-        # Draw game over elements
-        if self.game_over:
-            # Draw "Game Over" text
-            go_text_surf = self.game_over_font.render(
-                "GAME OVER", True, constants.BLACK
+    def _draw_high_scores_screen(self):
+        # Redraw the cached screen only if the scores or scroll changed
+        scroll = int(self.high_scores_scroll)
+        save_error = self.high_scores.save_error()
+        key = (self.high_scores.version, scroll, save_error)
+        if self.high_scores_surface is None:
+            self.high_scores_surface = assets.prepare_image(
+                pygame.Surface(self.screen.get_size()), alpha=False
             )
-            go_text_rect = go_text_surf.get_rect(
-                center=(
+            self.high_scores_surface_key = None
+        if self.high_scores_surface_key != key:
+            self._render_high_scores_screen(self.high_scores_surface, scroll)
+            self.renderer.refresh(self.high_scores_surface)
+            self.high_scores_surface_key = key
+            self.save_error_shown = save_error
+        self.renderer.blit(self.high_scores_surface, (0, 0))
+
+    def _render_high_scores_screen(self, surface, scroll):
+        # Draw background
+        surface.fill(constants.GREY)
+
+        # Draw the title
+        self._draw_text(
+            self.highscore_title_font,
+            "High Scores",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, 50),
+            surface,
+        )
+
+        if len(self.high_scores) == 0:
+            self._draw_text(
+                self.instruction_font,
+                "No high scores yet!",
+                constants.BLACK,
+                (
                     constants.WINDOW_WIDTH // 2,
-                    constants.WINDOW_HEIGHT // 2 - 50,
-                )
+                    constants.WINDOW_HEIGHT // 2 - 20,
+                ),
+                surface,
             )
-            self.screen.blit(go_text_surf, go_text_rect)
-
-            # Draw the final score text
-            final_score_surf = (
-                self.instruction_font.render(  # Using instruction font size
-                    f"Final Score: {self.scoreboard.score}",
-                    True,
-                    constants.BLACK,
-                )
+        else:
+            # Only draw the rows that can be seen, plus one more that is
+            # partly scrolled into view
+            line_height = constants.HIGH_SCORES_LINE_HEIGHT
+            first_row = scroll // line_height
+            row_offset = scroll % line_height
+            shown_scores = self.high_scores.top(
+                constants.HIGH_SCORES_SHOWN + 1, first_row
             )
-            final_score_rect = final_score_surf.get_rect(
-                center=(
-                    constants.WINDOW_WIDTH // 2,
-                    constants.WINDOW_HEIGHT // 2,
+            # Clip rows to the list area so they slide in and out smoothly
+            surface.set_clip(
+                pygame.Rect(
+                    0,
+                    constants.HIGH_SCORES_START_Y - line_height // 2,
+                    constants.WINDOW_WIDTH,
+                    constants.HIGH_SCORES_SHOWN * line_height,
                 )
             )
-            self.screen.blit(final_score_surf, final_score_rect)
-
-            # Draw the "Restart/Quit" instructions
-            instr_surf = self.instruction_font.render(
-                "Press 'R' to Restart or 'Q' to Quit", True, constants.BLACK
-            )
-            instr_rect = instr_surf.get_rect(
-                center=(
-                    constants.WINDOW_WIDTH // 2,
-                    constants.WINDOW_HEIGHT // 2 + 80,  # Adjusted position
+            for row, (name, score) in enumerate(shown_scores):
+                self._draw_text(
+                    self.highscore_entry_font,
+                    f"{first_row + row + 1}. {name} - {score}",
+                    constants.BLACK,
+                    (
+                        constants.WINDOW_WIDTH // 2,
+                        constants.HIGH_SCORES_START_Y
+                        + row * line_height
+                        - row_offset,
+                    ),
+                    surface,
                 )
+            surface.set_clip(None)
+
+        # Warn that the scores shown are not all on disk
+        if self.high_scores.save_error() is not None:
+            self._draw_text(
+                self.button_font,
+                "High scores could not be saved",
+                constants.RED,
+                (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT - 60),
+                surface,
             )
-            self.screen.blit(instr_surf, instr_rect)
 
-        # Show final image
-        pygame.display.flip()
+        # Draw the return instructions
+        self._draw_text(
+            self.button_font,
+            "Press ESC or Click to Return",
+            constants.BLACK,
+            (constants.WINDOW_WIDTH // 2, constants.WINDOW_HEIGHT - 30),
+            surface,
+        )
 
     def _spawn_obstacle(self):
-        # Create a new obstacle object.
-        obstacle = Obstacle(constants.OBSTACLE_INITIAL_SPEED)
+        # Create a new obstacle object, of a randomly chosen variant.
+        obstacle = Obstacle(self.scroll_speed, obstacles.pick_variant())
         # Add the new obstacle to the group of all active game objects.
         self.all_sprites.add(obstacle)
         # Add the new obstacle specifically to the group of obstacles.
         self.obstacles.add(obstacle)
+        # And to the index of obstacles by lane, for collision checks
+        self.obstacle_lanes.add(obstacle)
 
     def _check_collisions(self):
-        # Check if the player object is touching an obstacle
+        # Check if the player object is touching an obstacle, looking only
+        # at obstacles in lanes the llama overlaps and near it
+        candidates = self.obstacle_lanes.candidates(self.llama.rect)
         collisions = pygame.sprite.spritecollide(
-            self.llama, self.obstacles, False, pygame.sprite.collide_mask
+            self.llama, candidates, False, pygame.sprite.collide_mask
         )
         # If a collision happened, set game state to 'game over'
         if collisions:
-            self.game_over = True
+            # Check if the score made the high score table
+            self._score_eligible_for_save = self._check_score_eligible()
+            self._change_state(self._game_over_state())
             # Stop obstacle timer
             pygame.time.set_timer(constants.OBSTACLE_SPAWN_EVENT, 0)
 
     def _reset_game(self):
         # Set the game state back to playing
-        self.game_over = False
+        self._score_eligible_for_save = False
+        self.player_name = ""
+        self._change_state(constants.STATE_PLAYING)
 
         # Reset the start time for the new game
         self.start_time = pygame.time.get_ticks()
+        self.scroll_distance = 0
 
         # Reset the scoreboard
         self.scoreboard.reset()
 
         # Remove all obstacles
         self.obstacles.empty()
+        self.obstacle_lanes.clear()
 
         self.all_sprites.empty()
         self.all_sprites.add(self.llama)
@@ -299,30 +758,111 @@ class Game:
             constants.OBSTACLE_CREATION_INTERVAL,
         )
 
+    def _load_high_scores(self):
+        if constants.HIGH_SCORE_BACKEND == "sqlite":
+            try:
+                return SQLiteLeaderboard(constants.HIGH_SCORE_DATABASE)
+            except sqlite3.Error as e:
+                print(
+                    f"Error opening high score database "
+                    f"{constants.HIGH_SCORE_DATABASE}: {e}"
+                )
+                return self._load_score_file()
+        if constants.HIGH_SCORE_BACKEND == "journal":
+            try:
+                return ScoreJournal()
+            except OSError as e:
+                print(f"Error opening high score journal: {e}")
+                return self._load_score_file()
+        return self._load_score_file()
+
+    def _load_score_file(self):
+        # Return an empty leaderboard if there are no saved scores yet
+        path = Path(self.high_score_file)
+        if not path.is_file():
+            return ScoreFile(self.high_score_file, self.score_writer)
+
+        try:
+            with open(path, "r") as score_file:
+                scores = json.load(score_file)
+            if isinstance(scores, list):
+                return ScoreFile(
+                    self.high_score_file,
+                    self.score_writer,
+                    Leaderboard.from_list(scores),
+                )
+            print(f"High score file {self.high_score_file} is not a list")
+        except json.JSONDecodeError as e:
+            print(f"Error decoding JSON from {self.high_score_file}: {e}")
+        except Exception as e:
+            print(f"An unexpected error occurred loading high scores: {e}")
+        # Keep the unreadable file as it is rather than saving over it
+        print(f"High scores will not be saved to {self.high_score_file}")
+        return ScoreFile(
+            self.high_score_file, self.score_writer, writable=False
+        )
+
+    def _save_high_scores(self):
+        # Every backend hands its writes to a background thread
+        self.high_scores.save()
+
+    def _add_high_score(self, name, score):
+        # Insert the score in order and save the table
+        self.high_scores.add(name.strip(), score)
+        self._save_high_scores()
+
+    def _check_score_eligible(self):
+        # Check the score against the leaderboard's cached lowest score
+        return self.high_scores.is_eligible(self.scoreboard.score)
+
 
 class Llama(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, frames=None):
         # Initialize base Sprite class
         super().__init__()
-        # Load the player image, convert for performance
-        try:
-            self.image = pygame.image.load(
-                constants.PLAYER_IMAGE
-            ).convert_alpha()
-        except Exception as e:
-            # Fallback to shape if image load fails
-            print(f"Error loading player image: {e}. Creating fallback shape.")
-            self.image = pygame.Surface([40, 60])
-            self.image.fill(constants.RED)
+        # Without animation frames, the llama stands still in one image
+        if frames is None:
+            # Load the player image, convert for performance
+            try:
+                image = assets.load_image(constants.PLAYER_IMAGE)
+                mask_source = constants.PLAYER_IMAGE
+            except Exception as e:
+                # Fallback to shape if image load fails
+                print(
+                    f"Error loading player image: {e}."
+                    f" Creating fallback shape."
+                )
+                image = pygame.Surface([40, 60])
+                image.fill(constants.RED)
+                mask_source = None
 
+            # Create collision mask from image alpha
+            if mask_source is None:
+                mask = pygame.mask.from_surface(image)
+            else:
+                # Stored on disk next to the image, so it is only rebuilt
+                # when the image changes
+                mask = masks.load_mask(image, mask_source)
+            frames = ((image, mask),)
+
+        # Each frame has its own mask, so collisions always use the frame
+        # being shown
+        self.animation = animation.Animation(
+            frames, constants.PLAYER_RUN_FRAME_TICKS
+        )
+        self.image = self.animation.image
+        self.mask = self.animation.mask
         # Get rectangle from image dimensions
         self.rect = self.image.get_rect()
-        # Create collision mask from image alpha
-        self.mask = pygame.mask.from_surface(self.image)
 
         # Physics variables
         self.velocity_y = 0
         self.is_jumping = False
+        # The same velocity in sub-pixels, for fixed point physics
+        self.velocity_fixed = 0
+        # Precomputed arc of the jump under way, and frames since it began
+        self.jump_arc = None
+        self.jump_frame = 0
 
         self.initial_pos = (
             constants.PLAYER_HORIZONTAL_POSITION,
@@ -330,111 +870,168 @@ class Llama(pygame.sprite.Sprite):
         )
 
     def update(self):
-        # Apply gravity to vertical velocity
-        self.velocity_y += constants.GRAVITY
-        # Update vertical position based on velocity
-        self.rect.y += int(self.velocity_y)
-
-        # Check for ground collision
-        if self.rect.bottom >= constants.GROUND_Y:
-            # Snap to ground level
-            self.rect.bottom = constants.GROUND_Y
-            # Stop vertical movement
-            self.velocity_y = 0
-            # Update jumping state
-            self.is_jumping = False
+        if self.jump_arc is not None:
+            # Look up where the jump has got to rather than integrating
+            self.jump_frame += 1
+            self.rect.bottom = self.jump_arc.bottoms[self.jump_frame]
+            self.velocity_y = self.jump_arc.velocities[self.jump_frame]
+            self.velocity_fixed = physics.to_fixed(self.velocity_y)
+            if self.jump_frame == self.jump_arc.landing_frame:
+                self.is_jumping = False
+                self.jump_arc = None
+        elif constants.FIXED_POINT_PHYSICS:
+            # The same step in whole sub-pixels, identical on any machine
+            self.rect.bottom, self.velocity_fixed, landed = (
+                physics.fixed_fall(
+                    self.rect.bottom,
+                    self.velocity_fixed,
+                    physics.to_fixed(constants.GRAVITY),
+                    constants.GROUND_Y,
+                )
+            )
+            self.velocity_y = self.velocity_fixed / constants.PHYSICS_SUBPIXELS
+            if landed:
+                self.is_jumping = False
+        else:
+            # Apply gravity to vertical velocity
+            self.velocity_y += constants.GRAVITY
+            # Update vertical position based on velocity
+            self.rect.y += int(self.velocity_y)
+
+            # Check for ground collision
+            if self.rect.bottom >= constants.GROUND_Y:
+                # Snap to ground level
+                self.rect.bottom = constants.GROUND_Y
+                # Stop vertical movement
+                self.velocity_y = 0
+                # Update jumping state
+                self.is_jumping = False
+
+        # Only run while on the ground
+        if not self.is_jumping and self.animation.tick():
+            # Swap in the next frame's image and mask together
+            self.image = self.animation.image
+            self.mask = self.animation.mask
 
     def jump(self):
         if not self.is_jumping:
             # Apply upward velocity
             self.velocity_y = constants.JUMP_SPEED
+            self.velocity_fixed = physics.to_fixed(constants.JUMP_SPEED)
             # Set jumping state
             self.is_jumping = True
+            # Every jump from the ground follows the same arc, worked out
+            # once by physics.jump_arc
+            if self.rect.bottom == constants.GROUND_Y:
+                self.jump_arc = physics.jump_arc()
+                self.jump_frame = 0
 
     def reset(self):
         # Reset position using the stored initial position
         self.rect.topleft = self.initial_pos
         # Reset physics variables
         self.velocity_y = 0
+        self.velocity_fixed = 0
         self.is_jumping = False
+        self.jump_arc = None
+        # Start the run from its first frame
+        self.animation.rewind()
+        self.image = self.animation.image
+        self.mask = self.animation.mask
 
 
 class Obstacle(pygame.sprite.Sprite):
-    def __init__(self, speed):
+    # Height above the ground the obstacle's bottom is at
+    lane = 0
+
+    def __init__(self, speed, variant=constants.OBSTACLE_DEFAULT_VARIANT):
         super().__init__()
-        # Load the obstacle image, convert for performance
-        try:
-            self.image = pygame.image.load(
-                constants.OBSTACLE_IMAGE
-            ).convert_alpha()
-        except Exception as e:
-            # Fallback to shape if image load fails
-            print(
-                f"Error loading obstacle image: {e}. Creating fallback shape."
-            )
-            self.image = pygame.Surface([25, 50])  # Example fallback size
-            self.image.fill(constants.GREEN)  # Example fallback color
+        # The variant's image and collision mask, built once and shared by
+        # every obstacle of that variant (a plain shape if its image could
+        # not be loaded)
+        self.image, self.mask = obstacles.load_variant(variant)
 
-            # Get rectangle from image dimensions
+        # Get rectangle from image dimensions
         self.rect = self.image.get_rect()
-        # Create collision mask from image alpha
-        self.mask = pygame.mask.from_surface(self.image)
+
+        # Pick one of the variant's lanes; flying variants have several
+        self.lane = random.choice(constants.OBSTACLE_VARIANTS[variant][4])
 
         # Set initial position off-screen right
         self.rect.bottomleft = (
             constants.WINDOW_WIDTH + random.randint(50, 200),
-            constants.GROUND_Y,
+            constants.GROUND_Y - self.lane,
         )
 
         # Store movement speed
         self.speed = speed
+        # Sub-pixels moved past rect.x, for fixed point physics
+        self.x_remainder = 0
 
     def update(self):
-        # Move obstacle left based on speed
-        self.rect.x -= self.speed
+        # Move obstacle left based on speed; it never moves up or down, as
+        # the lane index files it by where it was spawned
+        if constants.FIXED_POINT_PHYSICS:
+            self.rect.x, self.x_remainder = physics.fixed_move(
+                self.rect.x, self.x_remainder, physics.to_fixed(self.speed)
+            )
+        else:
+            self.rect.x -= self.speed
         # Remove sprite if it goes completely off-screen left
         if self.rect.right < 0:
             self.kill()  # Removes sprite from all groups
 
 
 class Scoreboard:
-    def __init__(self, x=10, y=10, font_size=36, color=constants.BLACK):
+    def __init__(
+        self,
+        x=10,
+        y=10,
+        font_size=constants.SCORE_FONT_SIZE,
+        color=constants.BLACK,
+    ):
         # Store display properties
         self.x = x
         self.y = y
         self.color = color
 
-        # Initialize font
-        self.font = pygame.font.SysFont(None, font_size)
+        # Get font from the shared registry
+        self.font = fonts.get_font(font_size)
 
         # Initialize score
         self.score = 0
         # Initial render of score text
+        self._render_text()
+
+    def _render_text(self):
+        # Render the score text and place it
+        # Not through the text cache: every new score is a new string that
+        # would never be drawn again, and would push out text that will be
+        # drawn again
         self.image = self.font.render(f"Score: {self.score}", True, self.color)
+        # Update rect position in case text size  (unlikely here)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        # Score the image shows
+        self.rendered_score = self.score
 
     def update(self, current_time_ticks, game_start_time_ticks):
         # Calculate score based on elapsed whole seconds
-        new_score = (current_time_ticks - game_start_time_ticks) // 10
-        # Only re-render if score has actually changed
-        if new_score != self.score:
-            self.score = new_score
-            self.image = self.font.render(
-                f"Score: {self.score}", True, self.color
-            )
-            # Update rect position in case text size  (unlikely here)
-            self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        # The text is re-rendered when it is next drawn, so a renderer that
+        # draws nothing never rasterizes it
+        self.score = (current_time_ticks - game_start_time_ticks) // 10
 
-    def draw(self, screen):
-        # Draw the pre-rendered score surface onto the main screen
-        screen.blit(self.image, self.rect)
+    def draw(self, renderer):
+        # Only re-render if score has actually changed since the last draw
+        if self.rendered_score != self.score:
+            self._render_text()
+        # Draw the score surface through the renderer (or onto a screen)
+        renderer.blit(self.image, self.rect)
 
     def reset(self):
         # Reset score value to zero
         self.score = 0
         # Re-render the score text for "Score: 0"
-        self.image = self.font.render(f"Score: {self.score}", True, self.color)
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self._render_text()
 
 
 if __name__ == "__main__":
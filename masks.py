@@ -0,0 +1,126 @@
+import hashlib
+import os
+import struct
+import sys
+
+import pygame
+
+import constants
+
+# Mask file layout:
+#   magic (8 bytes) | header | SHA-256 of the source image (32 bytes) |
+#   the mask's raw bit buffer
+MASK_MAGIC = b"LLAMAMSK"
+MASK_VERSION = 1
+# version, alpha threshold, width, height, word size, big endian flag
+MASK_HEADER = struct.Struct("<IIIIB?")
+
+# Masks already built this session, keyed by (image path, threshold)
+_masks = {}
+
+
+def mask_path(source_path, threshold):
+    # Masks are stored next to the image they were built from
+    return f"{source_path}.{threshold}.mask"
+
+
+def _source_hash(source_path):
+    with open(source_path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).digest()
+
+
+def _mask_buffer(mask):
+    # View the mask's bits as raw bytes
+    return memoryview(mask).cast("B")
+
+
+def _read_mask(path, threshold, digest):
+    # Return the stored mask, or None if it is missing or out of date
+    try:
+        with open(path, "rb") as mask_file:
+            data = mask_file.read()
+    except OSError:
+        return None
+
+    header_end = len(MASK_MAGIC) + MASK_HEADER.size
+    if data[: len(MASK_MAGIC)] != MASK_MAGIC or len(data) < header_end + 32:
+        return None
+    version, stored_threshold, width, height, word_size, big_endian = (
+        MASK_HEADER.unpack_from(data, len(MASK_MAGIC))
+    )
+    # The bit buffer layout depends on the machine's word size and byte order
+    if (
+        version != MASK_VERSION
+        or stored_threshold != threshold
+        or data[header_end : header_end + 32] != digest
+        or big_endian != (sys.byteorder == "big")
+    ):
+        return None
+
+    mask = pygame.mask.Mask((width, height))
+    buffer = _mask_buffer(mask)
+    bits = data[header_end + 32 :]
+    if word_size != memoryview(mask).itemsize or len(bits) != len(buffer):
+        return None
+    # Copy the stored bits straight into the new mask
+    buffer[:] = bits
+    return mask
+
+
+def _write_mask(path, mask, threshold, digest):
+    # Write to a temporary file first so a half-written mask is never used
+    temp_path = path + ".tmp"
+    width, height = mask.get_size()
+    try:
+        with open(temp_path, "wb") as mask_file:
+            mask_file.write(MASK_MAGIC)
+            mask_file.write(
+                MASK_HEADER.pack(
+                    MASK_VERSION,
+                    threshold,
+                    width,
+                    height,
+                    memoryview(mask).itemsize,
+                    sys.byteorder == "big",
+                )
+            )
+            mask_file.write(digest)
+            mask_file.write(_mask_buffer(mask))
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not save collision mask: {path} - {e}")
+
+
+def load_mask(surface, source_path, threshold=None):
+    # Return the collision mask for a surface loaded from source_path,
+    # reusing a stored mask when the image has not changed
+    if threshold is None:
+        threshold = constants.MASK_ALPHA_THRESHOLD
+
+    key = (source_path, threshold)
+    if key in _masks:
+        return _masks[key]
+
+    mask = None
+    if constants.MASK_CACHE_ENABLED:
+        try:
+            digest = _source_hash(source_path)
+        except OSError:
+            digest = None
+        if digest is not None:
+            path = mask_path(source_path, threshold)
+            mask = _read_mask(path, threshold, digest)
+            if mask is None:
+                # Missing or stale, so rebuild it and store it for next time
+                mask = pygame.mask.from_surface(surface, threshold)
+                _write_mask(path, mask, threshold, digest)
+
+    if mask is None:
+        mask = pygame.mask.from_surface(surface, threshold)
+    _masks[key] = mask
+    return mask
+
+
+def clear():
+    # Forget every mask built this session
+    _masks.clear()
@@ -0,0 +1,156 @@
+import bisect
+import random
+
+import pygame
+
+import assets
+import constants
+import masks
+
+# Images and masks of the variants built this session, keyed by variant id
+_variants = {}
+# Variants whose image could not be built, drawn as a plain shape instead
+_failed = set()
+
+
+def _build_variant(variant_id):
+    path, scale, copies, weight, lanes = constants.OBSTACLE_VARIANTS[
+        variant_id
+    ]
+    image = assets.load_image(path)
+    if scale == (1, 1) and copies == 1:
+        # The image as it is, so its mask can come from the mask files
+        mask = masks.load_mask(image, path)
+    else:
+        if scale != (1, 1):
+            image = pygame.transform.scale_by(image, scale)
+        if copies > 1:
+            # Side by side in one image, so a group is one sprite to move
+            # and one mask to test
+            image = assets.tile_to_width(image, image.get_width() * copies)
+        mask = pygame.mask.from_surface(
+            image, constants.MASK_ALPHA_THRESHOLD
+        )
+    _variants[variant_id] = (image, mask)
+    return _variants[variant_id]
+
+
+def _fallback_variant():
+    # A plain shape standing in for an image that could not be loaded
+    image = pygame.Surface([25, 50])
+    image.fill(constants.GREEN)
+    # Create collision mask from image alpha
+    mask = pygame.mask.from_surface(image)
+    return image, mask
+
+
+def load_variant(variant_id):
+    # Return the (image, mask) pair for an obstacle variant, scaling or
+    # composing its image and building its mask only the first time
+    # A variant that cannot be built is reported once and shares one
+    # fallback shape from then on, so a failure costs nothing per spawn
+    if variant_id in _variants:
+        return _variants[variant_id]
+    try:
+        return _build_variant(variant_id)
+    except Exception as e:
+        print(f"Error loading obstacle image: {e}. Creating fallback shape.")
+        _failed.add(variant_id)
+        _variants[variant_id] = _fallback_variant()
+        return _variants[variant_id]
+
+
+def load_variants():
+    # Build every variant up front, each on its own, so spawning never
+    # scales an image or builds a mask; returns False if any variant fell
+    # back to a plain shape
+    for variant_id in constants.OBSTACLE_VARIANTS:
+        load_variant(variant_id)
+    return not _failed
+
+
+def pick_variant():
+    # Choose a variant id, weighted by how often each should appear
+    variants = constants.OBSTACLE_VARIANTS
+    weights = [variant[3] for variant in variants.values()]
+    return random.choices(list(variants), weights)[0]
+
+
+def _left(obstacle):
+    return obstacle.rect.left
+
+
+class LaneIndex:
+    # Obstacles filed by lane and kept in x order, so a collision check only
+    # looks at the few obstacles that could touch a rect, however many
+    # lanes and obstacles there are
+    # An obstacle is filed by its lane and its top when it is added, so once
+    # indexed it may move left but never up or down
+
+    def __init__(self):
+        # Heights of the lanes in use, lowest first
+        self.heights = []
+        # Obstacles in each lane, keyed by height, leftmost first
+        self.lanes = {}
+        # Top of the tallest obstacle filed in each lane
+        self.tops = {}
+        # Height of the tallest obstacle filed in any lane
+        self.tallest = 0
+        # Obstacles added since the last check, filed when next needed
+        self.added = []
+
+    def add(self, obstacle):
+        # The obstacle is filed under obstacle.lane with the top its rect has
+        # now; moving it up or down afterwards would hide it from candidates
+        self.added.append(obstacle)
+
+    def _file_added(self):
+        for obstacle in self.added:
+            height = obstacle.lane
+            rect = obstacle.rect
+            if height not in self.lanes:
+                bisect.insort(self.heights, height)
+                self.lanes[height] = []
+                self.tops[height] = rect.top
+            bisect.insort(self.lanes[height], obstacle, key=_left)
+            self.tops[height] = min(self.tops[height], rect.top)
+            self.tallest = max(self.tallest, rect.height)
+        self.added.clear()
+
+    def candidates(self, rect):
+        # Obstacles in lanes the rect overlaps whose x range overlaps it
+        # Obstacles only move left, so any wholly left of the rect have
+        # passed it for good and are dropped
+        self._file_added()
+        found = []
+        # Lanes whose bottom is below the rect's top, highest first
+        index = bisect.bisect_left(self.heights, constants.GROUND_Y - rect.top)
+        for height in reversed(self.heights[:index]):
+            if constants.GROUND_Y - height - self.tallest >= rect.bottom:
+                # This lane, and every lower one, is below the rect
+                break
+            if self.tops[height] >= rect.bottom:
+                continue
+            lane = self.lanes[height]
+            passed = 0
+            while passed < len(lane) and lane[passed].rect.right <= rect.left:
+                passed += 1
+            del lane[:passed]
+            for obstacle in lane:
+                if obstacle.rect.left >= rect.right:
+                    break
+                found.append(obstacle)
+        return found
+
+    def clear(self):
+        self.heights.clear()
+        self.lanes.clear()
+        self.tops.clear()
+        self.tallest = 0
+        self.added.clear()
+
+
+def clear():
+    # Forget every variant built this session
+    _variants.clear()
+    _failed.clear()
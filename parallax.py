@@ -0,0 +1,120 @@
+import math
+
+import pygame
+
+import assets
+import constants
+import scrolling
+
+# Layers already built this session, keyed by their settings
+_layers = {}
+
+
+class ParallaxLayer:
+    def __init__(self, image, fraction, y, opaque):
+        # Strip at least as wide as the window, ready to blit
+        self.image = image
+        # Share of the obstacle speed the layer scrolls at
+        self.fraction = fraction
+        self.y = y
+        # Opaque layers hide everything drawn before them
+        self.opaque = opaque
+
+    def covers(self, width, height):
+        # Whether the layer alone hides a window of this size
+        return (
+            self.opaque
+            and self.y <= 0
+            and self.y + self.image.get_height() >= height
+            and self.image.get_width() >= width
+        )
+
+    def draw(self, renderer, distance):
+        # At most two blits, or one for a layer that does not move
+        scrolling.draw_wrapped(
+            renderer, self.image, distance * self.fraction, self.y
+        )
+
+
+def _sky_tile(width, height):
+    # Fades from a deep blue at the top to a pale blue at the horizon
+    tile = pygame.Surface((width, height))
+    top = pygame.Color(110, 170, 230)
+    bottom = pygame.Color(225, 240, 250)
+    for y in range(height):
+        tile.fill(top.lerp(bottom, y / max(height - 1, 1)), (0, y, width, 1))
+    return tile
+
+
+def _cloud_tile(width, height):
+    # A few flat clouds, kept clear of the edges so the tile repeats
+    tile = pygame.Surface((width, height))
+    tile.fill(constants.COLORKEY)
+    for left, top, size in ((20, 30, 90), (width // 2, 10, 120)):
+        for part in range(3):
+            pygame.draw.ellipse(
+                tile,
+                constants.WHITE,
+                (left + part * size // 4, top + (part % 2) * 8, size // 2, 30),
+            )
+    return tile
+
+
+def _hill_tile(width, height):
+    # Rolling hills whose outline is periodic across the tile
+    tile = pygame.Surface((width, height))
+    tile.fill(constants.COLORKEY)
+    outline = [
+        (
+            x,
+            height
+            * (
+                0.45
+                + 0.25 * math.sin(2 * math.pi * x / width)
+                + 0.1 * math.sin(6 * math.pi * x / width)
+            ),
+        )
+        for x in range(0, width + 1, 5)
+    ]
+    pygame.draw.polygon(
+        tile, (120, 170, 110), outline + [(width, height), (0, height)]
+    )
+    return tile
+
+
+# How to draw each kind of layer, and whether it is opaque (has no
+# see-through parts)
+TILE_BUILDERS = {
+    "sky": (_sky_tile, True),
+    "clouds": (_cloud_tile, False),
+    "hills": (_hill_tile, False),
+}
+
+
+def _build_layer(name, fraction, y, height, tile_width):
+    builder, opaque = TILE_BUILDERS[name]
+    tile = builder(tile_width, height)
+    # Converted once to the display's format, with no per-pixel alpha:
+    # see-through parts use a colorkey, which RLEACCEL skips quickly
+    strip = assets.prepare_image(
+        assets.tile_to_width(tile, constants.WINDOW_WIDTH), alpha=False
+    )
+    if not opaque:
+        strip.set_colorkey(constants.COLORKEY, pygame.RLEACCEL)
+    return ParallaxLayer(strip, fraction, y, opaque)
+
+
+def load_layers(specs=None):
+    # Build the layers set in constants.PARALLAX_LAYERS (back to front),
+    # only the first time they are asked for
+    if specs is None:
+        specs = constants.PARALLAX_LAYERS
+    specs = tuple(specs)
+    if specs not in _layers:
+        _layers[specs] = [_build_layer(*spec) for spec in specs]
+    return _layers[specs]
+
+
+def clear():
+    # Forget every layer built this session
+    _layers.clear()
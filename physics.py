@@ -0,0 +1,122 @@
+import constants
+
+# Jump arcs already worked out this session, keyed by the constants they
+# were worked out from
+_arcs = {}
+
+# The fixed point steps below use only integer arithmetic and comparisons
+# with no branching, so they work the same on plain ints and, element by
+# element, on NumPy integer arrays of many llamas or obstacles at once
+
+
+def to_fixed(value):
+    # A speed or distance in whole sub-pixel units
+    return round(value * constants.PHYSICS_SUBPIXELS)
+
+
+def whole_pixels(value):
+    # The whole pixels in a sub-pixel value, rounded towards zero like
+    # int() of a float
+    subpixels = constants.PHYSICS_SUBPIXELS
+    return (value + (value < 0) * (subpixels - 1)) // subpixels
+
+
+def fixed_fall(bottom, velocity, gravity, ground_y):
+    # One step of Llama.update in fixed point: gravity and velocity are in
+    # sub-pixels, and the llama moves by the whole pixels of its velocity
+    # Returns the new bottom and velocity, and whether it is on the ground
+    velocity = velocity + gravity
+    bottom = bottom + whole_pixels(velocity)
+    landed = bottom >= ground_y
+    bottom = bottom - (bottom - ground_y) * landed
+    velocity = velocity * (1 - landed)
+    return bottom, velocity, landed
+
+
+def fixed_move(x, remainder, speed):
+    # One step of an obstacle moving left by speed sub-pixels, from x
+    # whole pixels plus remainder sub-pixels
+    subpixels = constants.PHYSICS_SUBPIXELS
+    position = x * subpixels + remainder - speed
+    return position // subpixels, position % subpixels
+
+
+class JumpArc:
+    def __init__(self, bottoms, velocities):
+        # Where the llama's bottom is, and its vertical velocity, after each
+        # update since the jump started; frame 0 is the moment of the jump
+        self.bottoms = bottoms
+        self.velocities = velocities
+        # Frame the llama is back on the ground
+        self.landing_frame = len(bottoms) - 1
+
+    def bottom_at(self, frame):
+        # The llama's bottom any number of frames after the jump
+        if frame >= self.landing_frame:
+            return self.bottoms[-1]
+        return self.bottoms[frame]
+
+    def height_at(self, frame):
+        # How far above the ground the llama is, frames after the jump
+        return self.bottoms[-1] - self.bottom_at(frame)
+
+
+def _work_out_arc(gravity, jump_speed, ground_y, fixed_point):
+    # Step through the jump exactly as Llama.update does: add gravity to
+    # the velocity, move by its whole part, and stop on reaching the ground
+    if fixed_point:
+        return _work_out_fixed_arc(gravity, jump_speed, ground_y)
+    bottoms = [ground_y]
+    velocities = [jump_speed]
+    bottom = ground_y
+    velocity = jump_speed
+    while True:
+        velocity += gravity
+        bottom += int(velocity)
+        if bottom >= ground_y:
+            bottoms.append(ground_y)
+            velocities.append(0)
+            return JumpArc(bottoms, velocities)
+        bottoms.append(bottom)
+        velocities.append(velocity)
+
+
+def _work_out_fixed_arc(gravity, jump_speed, ground_y):
+    gravity = to_fixed(gravity)
+    velocity = to_fixed(jump_speed)
+    bottoms = [ground_y]
+    velocities = [velocity / constants.PHYSICS_SUBPIXELS]
+    bottom = ground_y
+    landed = False
+    while not landed:
+        bottom, velocity, landed = fixed_fall(
+            bottom, velocity, gravity, ground_y
+        )
+        bottoms.append(bottom)
+        velocities.append(velocity / constants.PHYSICS_SUBPIXELS)
+    return JumpArc(bottoms, velocities)
+
+
+def jump_arc():
+    # The arc of a jump from the ground with the current constants,
+    # worked out the first time it is asked for
+    # Returns None if gravity would never bring the llama back down
+    key = (
+        constants.GRAVITY,
+        constants.JUMP_SPEED,
+        constants.GROUND_Y,
+        constants.FIXED_POINT_PHYSICS,
+    )
+    if key not in _arcs:
+        gravity = constants.GRAVITY
+        if constants.FIXED_POINT_PHYSICS:
+            gravity = to_fixed(gravity)
+        if gravity <= 0:
+            return None
+        _arcs[key] = _work_out_arc(*key)
+    return _arcs[key]
+
+
+def clear():
+    # Forget every arc worked out this session
+    _arcs.clear()
@@ -0,0 +1,118 @@
+import csv
+import math
+import time
+
+
+class StartupTimer:
+    def __init__(self):
+        # Record the moment startup began
+        self.start_time = time.perf_counter()
+        # Time the current phase began
+        self.phase_start_time = self.start_time
+        # Ordered list of (phase name, duration in seconds)
+        self.phases = []
+        # Set once the first frame has been shown
+        self.finished = False
+
+    def mark(self, phase_name):
+        # Record the time spent since the previous mark as one phase
+        now = time.perf_counter()
+        self.phases.append((phase_name, now - self.phase_start_time))
+        self.phase_start_time = now
+
+    def finish(self):
+        # Close the final phase once the first frame has been presented
+        if not self.finished:
+            self.mark("first frame")
+            self.finished = True
+
+    def total(self):
+        # Sum of all recorded phases
+        return sum(duration for _, duration in self.phases)
+
+    def report(self):
+        # Build a readable breakdown of time to first frame
+        lines = ["Startup timing (time to first frame):"]
+        for phase_name, duration in self.phases:
+            lines.append(f"  {phase_name:<20}{duration * 1000:>10.2f} ms")
+        lines.append(f"  {'total':<20}{self.total() * 1000:>10.2f} ms")
+        return "\n".join(lines)
+
+
+class DurationStats:
+    def __init__(self, name):
+        # What is being timed, used in the report
+        self.name = name
+        # Every recorded duration, in seconds
+        self.samples = []
+
+    def add(self, duration):
+        self.samples.append(duration)
+
+    def mean(self):
+        if not self.samples:
+            return 0.0
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, percent):
+        # Nearest-rank percentile of the recorded durations
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def report(self):
+        # One line summary, in milliseconds
+        if not self.samples:
+            return f"{self.name}: no samples"
+        return (
+            f"{self.name}: {len(self.samples)} samples,"
+            f" mean {self.mean() * 1000:.3f} ms,"
+            f" p50 {self.percentile(50) * 1000:.3f} ms,"
+            f" p95 {self.percentile(95) * 1000:.3f} ms,"
+            f" p99 {self.percentile(99) * 1000:.3f} ms,"
+            f" max {max(self.samples) * 1000:.3f} ms"
+        )
+
+
+class LatencyTracker:
+    def __init__(self, name):
+        # Time from an input being queued to the frame showing it
+        self.latency = DurationStats(name)
+        # Time from the previous event poll to the frame, which is the
+        # longest the input could have been waiting
+        self.worst_case = DurationStats(f"{name} (worst case)")
+        # (input time, earliest input time) of an input not yet shown
+        self.pending = None
+
+    def input(self, input_time, earliest_time=None):
+        # Only the first input before a frame is presented is timed
+        if self.pending is None:
+            if earliest_time is None:
+                earliest_time = input_time
+            self.pending = (input_time, earliest_time)
+
+    def presented(self, present_time):
+        # A frame has been presented, showing any pending input
+        if self.pending is None:
+            return
+        input_time, earliest_time = self.pending
+        self.latency.add(present_time - input_time)
+        self.worst_case.add(present_time - earliest_time)
+        self.pending = None
+
+    def report(self):
+        return f"{self.latency.report()}\n{self.worst_case.report()}"
+
+    def export(self, path):
+        # Write every sample as CSV, in milliseconds
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["latency_ms", "worst_case_ms"])
+            for latency, worst_case in zip(
+                self.latency.samples, self.worst_case.samples
+            ):
+                writer.writerow(
+                    [f"{latency * 1000:.3f}", f"{worst_case * 1000:.3f}"]
+                )
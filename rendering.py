@@ -0,0 +1,138 @@
+from abc import ABC, abstractmethod
+
+import pygame
+
+import constants
+import text_cache
+from canvas import Canvas
+from texture_canvas import TextureCanvas, TextureScreen
+
+
+class RenderBackend(ABC):
+    # Everything Game needs to draw a frame
+    # Set on backends that never show anything, so Game can skip drawing
+    headless = False
+
+    @abstractmethod
+    def clear(self, color):
+        # Fill the whole frame with a colour
+        pass
+
+    @abstractmethod
+    def blit(self, surface, dest, area=None):
+        # Draw a surface (a sprite image, text, ...) at a point or rect
+        pass
+
+    @abstractmethod
+    def draw_sprites(self, group):
+        # Draw every sprite in a group
+        pass
+
+    @abstractmethod
+    def draw_text(self, font, text, color, center):
+        # Draw text centred on a point
+        pass
+
+    @abstractmethod
+    def fill_rect(self, color, rect):
+        # Fill a rect with a colour
+        pass
+
+    @abstractmethod
+    def refresh(self, surface):
+        # A surface that has been drawn before has changed
+        pass
+
+    @abstractmethod
+    def present(self):
+        # Show the finished frame
+        pass
+
+    @abstractmethod
+    def close(self):
+        # Release the window or renderer
+        pass
+
+
+class PygameBackend(RenderBackend):
+    def __init__(self, canvas):
+        # A Canvas (software blits) or TextureCanvas (SDL renderer)
+        self.canvas = canvas
+        # The surface, or stand-in surface, everything is drawn onto
+        self.screen = canvas.surface
+
+    def clear(self, color):
+        self.screen.fill(color)
+
+    def blit(self, surface, dest, area=None):
+        if area is None:
+            return self.screen.blit(surface, dest)
+        return self.screen.blit(surface, dest, area)
+
+    def draw_sprites(self, group):
+        group.draw(self.screen)
+
+    def draw_text(self, font, text, color, center):
+        # Render text through the text cache
+        text_surf = text_cache.render(font, text, True, color)
+        text_rect = text_surf.get_rect(center=center)
+        self.screen.blit(text_surf, text_rect)
+
+    def fill_rect(self, color, rect):
+        # pygame.draw can only draw on real surfaces
+        if isinstance(self.screen, TextureScreen):
+            self.screen.fill(color, rect)
+        else:
+            pygame.draw.rect(self.screen, color, rect)
+
+    def refresh(self, surface):
+        self.canvas.refresh(surface)
+
+    def present(self):
+        self.canvas.present()
+
+    def close(self):
+        self.canvas.close()
+
+
+class NullBackend(RenderBackend):
+    # Draws nothing and opens no window, for headless runs and tests
+    headless = True
+
+    def __init__(self):
+        self.screen = None
+
+    def clear(self, color):
+        pass
+
+    def blit(self, surface, dest, area=None):
+        return pygame.Rect(0, 0, 0, 0)
+
+    def draw_sprites(self, group):
+        pass
+
+    def draw_text(self, font, text, color, center):
+        pass
+
+    def fill_rect(self, color, rect):
+        pass
+
+    def refresh(self, surface):
+        pass
+
+    def present(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_backend(name=None):
+    # Make the backend named in constants.RENDER_BACKEND
+    if name is None:
+        name = constants.RENDER_BACKEND
+    if name == "null":
+        return NullBackend()
+    if name == "texture":
+        return PygameBackend(TextureCanvas())
+    return PygameBackend(Canvas())
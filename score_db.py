@@ -0,0 +1,256 @@
+import bisect
+import json
+import sqlite3
+import sys
+
+import constants
+from score_writer import ScoreWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+-- Ranking order: highest score first, earlier scores first on a tie
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, id);
+-- Per-player lookups and bests
+CREATE INDEX IF NOT EXISTS idx_scores_name ON scores (name, score DESC);
+"""
+
+
+def _ranking_key(entry):
+    # Highest score first
+    return -entry[1]
+
+
+class SQLiteLeaderboard:
+    def __init__(self, path=None, capacity=constants.MAX_HIGH_SCORES):
+        if path is None:
+            path = constants.HIGH_SCORE_DATABASE
+        self.path = path
+        # Number of entries on the board (every score is still stored)
+        self.capacity = capacity
+        self.connection = sqlite3.connect(path)
+        # Write-ahead logging makes each insert an append to the log
+        # instead of a rewrite of the table pages
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # Copy of the board, so drawing it every frame never hits the disk
+        self._top = []
+        # Lowest score still on a full board (None while not full)
+        self.threshold = None
+        # Increased whenever the board changes
+        self.version = 0
+        # Scores added since the last save, as (name, score) rows
+        self.unsaved = []
+        # Inserts the saved rows on a background thread, through a
+        # connection of its own opened on that thread
+        self.writer = ScoreWriter(write=self._insert_rows)
+        self.writer_connection = None
+        # Rows the writer thread failed to insert, tried again with the
+        # next batch (only touched by the writer thread, then by close)
+        self.unstored = []
+        self._refresh()
+        # Number of scores ever posted, counted here so that asking is free
+        self.row_count = self.connection.execute(
+            "SELECT COUNT(*) FROM scores"
+        ).fetchone()[0]
+
+    def _refresh(self):
+        # Re-read the board and its eligibility threshold
+        self._top = self._query_top(self.capacity, 0)
+        self._update_threshold()
+        self.version += 1
+
+    def _update_threshold(self):
+        if len(self._top) >= self.capacity and self._top:
+            self.threshold = self._top[-1][1]
+        else:
+            self.threshold = None
+
+    def _query_top(self, count, offset):
+        return self.connection.execute(
+            "SELECT name, score FROM scores"
+            " ORDER BY score DESC, id LIMIT ? OFFSET ?",
+            (count, offset),
+        ).fetchall()
+
+    def add(self, name, score):
+        # Place a score on the board, returning its rank (0 is the top) or
+        # None if it did not make the board
+        # The database is not touched until save() hands the score to the
+        # writer thread, so adding never blocks the game
+        score = int(score)
+        self.unsaved.append((name, score))
+        self.row_count += 1
+        # Rows beyond the board may have changed even if the board has not
+        self.version += 1
+        # Equal scores rank by arrival, so this one goes after them
+        rank = bisect.bisect_right(self._top, -score, key=_ranking_key)
+        if rank >= self.capacity:
+            return None
+        self._top.insert(rank, (name, score))
+        del self._top[self.capacity :]
+        self._update_threshold()
+        return rank
+
+    def save(self):
+        # Queue the scores added since the last save for the writer thread
+        if self.unsaved:
+            self.writer.append(self.path, self.unsaved)
+            self.unsaved = []
+
+    def save_error(self):
+        # Why the last insert failed, or None if it worked
+        error = self.writer.errors.get(self.path)
+        if error is None:
+            return None
+        return str(error)
+
+    def _insert_rows(self, path, rows):
+        # Runs on the writer thread: store every queued score, and any
+        # that failed before, in one transaction
+        # On failure the rows are kept for the next batch and the error is
+        # raised for the writer to report through save_error()
+        rows = self.unstored + rows
+        self.unstored = rows
+        if self.writer_connection is None:
+            # Only ever used by one thread at a time: the writer
+            # thread, then close() once that thread has stopped
+            self.writer_connection = sqlite3.connect(
+                path, check_same_thread=False
+            )
+            self.writer_connection.execute("PRAGMA synchronous=NORMAL")
+        with self.writer_connection:
+            self.writer_connection.executemany(
+                "INSERT INTO scores (name, score) VALUES (?, ?)", rows
+            )
+        self.unstored = []
+
+    def _store_pending(self):
+        # Wait until every score added so far is in the database, so
+        # queries below the cached board include them
+        self.save()
+        self.writer.flush()
+
+    def add_many(self, entries):
+        # Store many (name, score) pairs in a single transaction
+        rows = [(str(name), int(score)) for name, score in entries]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (name, score) VALUES (?, ?)", rows
+            )
+        self.row_count += len(rows)
+        self._refresh()
+        return len(rows)
+
+    def is_eligible(self, score):
+        # A score makes the board if there is space or it beats the lowest
+        return self.threshold is None or score > self.threshold
+
+    def top(self, count, offset=0):
+        # One page of the ranking, as (name, score) pairs
+        # Rows below the board are read from the database, once the writer
+        # thread has stored every score added so far
+        if offset + count <= self.capacity:
+            return self._top[offset : offset + count]
+        self._store_pending()
+        return self._query_top(count, offset)
+
+    def page(self, number, page_size):
+        # The given page (starting at 0) of every score ever posted
+        return self.top(page_size, number * page_size)
+
+    def player_best(self, name):
+        # The player's highest score, or None if they have no scores
+        self._store_pending()
+        row = self.connection.execute(
+            "SELECT MAX(score) FROM scores WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0]
+
+    def player_bests(self, count, offset=0):
+        # Each player's highest score, best players first
+        self._store_pending()
+        return self.connection.execute(
+            "SELECT name, MAX(score) AS best FROM scores GROUP BY name"
+            " ORDER BY best DESC, name LIMIT ? OFFSET ?",
+            (count, offset),
+        ).fetchall()
+
+    def total(self):
+        # Number of scores ever posted
+        return self.row_count
+
+    def to_list(self):
+        # The board in the JSON form, highest score first
+        return [{"name": name, "score": score} for name, score in self]
+
+    def __len__(self):
+        return len(self._top)
+
+    def __getitem__(self, index):
+        return self._top[index]
+
+    def __iter__(self):
+        return iter(list(self._top))
+
+    def clear(self):
+        # Wait for queued scores so none are stored after the delete
+        self.unsaved = []
+        self.writer.flush()
+        self.unstored = []
+        with self.connection:
+            self.connection.execute("DELETE FROM scores")
+        self.row_count = 0
+        self._refresh()
+
+    def close(self):
+        # Store any scores not saved yet, then wait for the writer thread
+        self.save()
+        self.writer.close()
+        if self.unstored:
+            # The writer thread has stopped, so try the rows it could not
+            # insert once more before they are lost
+            try:
+                self._insert_rows(self.path, [])
+            except sqlite3.Error as e:
+                print(
+                    f"Error saving {len(self.unstored)} high scores to"
+                    f" {self.path}: {e}"
+                )
+        if self.writer_connection is not None:
+            self.writer_connection.close()
+            self.writer_connection = None
+        self.connection.close()
+
+
+def import_json(json_path=None, database_path=None):
+    # Copy every score from a JSON high score file into the database
+    if json_path is None:
+        json_path = constants.HIGH_SCORE_FILE
+    with open(json_path, "r") as score_file:
+        scores = json.load(score_file)
+
+    leaderboard = SQLiteLeaderboard(database_path)
+    try:
+        # Entries without a name or score get the same defaults as loading
+        return leaderboard.add_many(
+            (entry.get("name", "N/A"), entry.get("score", 0))
+            for entry in scores
+        )
+    finally:
+        leaderboard.close()
+
+
+if __name__ == "__main__":
+    # Migrate an existing JSON high score file:
+    #   python score_db.py [json file] [database]
+    source = sys.argv[1] if len(sys.argv) > 1 else constants.HIGH_SCORE_FILE
+    target = (
+        sys.argv[2] if len(sys.argv) > 2 else constants.HIGH_SCORE_DATABASE
+    )
+    imported = import_json(source, target)
+    print(f"Imported {imported} scores from {source} into {target}")
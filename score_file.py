@@ -0,0 +1,65 @@
+from leaderboard import Leaderboard
+
+
+class ScoreFile:
+    # A leaderboard kept in a JSON file, which is rewritten in the
+    # background each time the board is saved
+    def __init__(self, path, writer, board=None, writable=True):
+        self.path = path
+        # ScoreWriter that writes the file off the game thread
+        self.writer = writer
+        # The board as it was loaded, or a new empty one
+        if board is None:
+            board = Leaderboard()
+        self.board = board
+        # False when the file exists but could not be read: it is then
+        # never overwritten, so the scores in it are not lost
+        self.writable = writable
+
+    def add(self, name, score):
+        return self.board.add(name, score)
+
+    def save(self):
+        # Queue a copy of the board for the writer thread
+        # New scores on a board that could not be loaded stay in memory
+        if not self.writable:
+            return
+        self.writer.save(self.path, self.board.to_list())
+
+    def save_error(self):
+        # Why the scores are not on disk, or None if the last save worked
+        if not self.writable:
+            return f"{self.path} could not be read"
+        error = self.writer.errors.get(self.path)
+        if error is None:
+            return None
+        return str(error)
+
+    def is_eligible(self, score):
+        return self.board.is_eligible(score)
+
+    def top(self, count, offset=0):
+        return self.board.top(count, offset)
+
+    def total(self):
+        return self.board.total()
+
+    @property
+    def version(self):
+        return self.board.version
+
+    def to_list(self):
+        return self.board.to_list()
+
+    def __len__(self):
+        return len(self.board)
+
+    def __getitem__(self, index):
+        return self.board[index]
+
+    def __iter__(self):
+        return iter(self.board)
+
+    def close(self):
+        # Wait for any queued save to reach the disk
+        self.writer.close()
@@ -0,0 +1,220 @@
+import glob
+import json
+import os
+
+import constants
+from leaderboard import Leaderboard
+from score_writer import ScoreWriter, write_json_atomic
+
+
+class ScoreJournal:
+    def __init__(
+        self,
+        journal_path=None,
+        snapshot_path=None,
+        capacity=constants.MAX_HIGH_SCORES,
+    ):
+        if journal_path is None:
+            journal_path = constants.HIGH_SCORE_JOURNAL
+        if snapshot_path is None:
+            snapshot_path = constants.HIGH_SCORE_SNAPSHOT
+        # Every new score is appended to the journal as one line
+        self.journal_path = journal_path
+        # The board as of a given sequence number, rewritten on compaction
+        self.snapshot_path = snapshot_path
+        self.capacity = capacity
+        # The current board, rebuilt from the snapshot and journal
+        self.board = Leaderboard(capacity)
+        # Sequence number of the last record written
+        self.sequence = 0
+        # Records appended since the last compaction
+        self.records_since_compaction = 0
+        # Records queued since the last save, in order
+        self.unsaved = []
+        # Set when the next save should also compact
+        self.compaction_due = False
+        # Writer thread only: records not yet appended, and the snapshot
+        # of a compaction not yet finished, kept to retry after a failure
+        self.unwritten = []
+        self.unfinished_snapshot = None
+        # Appends records and compacts on a background thread, so neither
+        # ever stalls a frame
+        self.writer = ScoreWriter(write=self._write_journal)
+        self._load()
+        # Sequence number of the last record in the open journal
+        self.written_sequence = self.sequence
+        # Kept open so each new score is a single append
+        # Only the writer thread touches it from here on
+        self.journal_file = open(self.journal_path, "a")
+
+    def _rotated_paths(self):
+        # Journals set aside for compaction, oldest first
+        # Each is named after the last sequence number it holds
+        rotated = []
+        for path in glob.glob(glob.escape(self.journal_path) + ".*"):
+            suffix = path[len(self.journal_path) + 1 :]
+            if suffix.isdigit():
+                rotated.append((int(suffix), path))
+        return [path for _, path in sorted(rotated)]
+
+    def _load(self):
+        # Start from the snapshot, then replay anything written after it
+        snapshot_sequence = 0
+        if os.path.isfile(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r") as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+                self.board = Leaderboard.from_list(
+                    snapshot["scores"], self.capacity
+                )
+                snapshot_sequence = snapshot["sequence"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Error loading {self.snapshot_path}: {e}")
+        self.sequence = snapshot_sequence
+
+        for path in self._rotated_paths() + [self.journal_path]:
+            if not os.path.isfile(path):
+                continue
+            # Stream the journal a line at a time
+            with open(path, "r") as journal_file:
+                for line in journal_file:
+                    try:
+                        record = json.loads(line)
+                        sequence = record["seq"]
+                        name = record["name"]
+                        score = int(record["score"])
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by a crash
+                        continue
+                    # Records already folded into the snapshot, or written
+                    # twice by a retried append, are skipped
+                    if sequence <= self.sequence:
+                        continue
+                    self.board.add(name, score)
+                    self.sequence = max(self.sequence, sequence)
+                    self.records_since_compaction += 1
+
+    def add(self, name, score):
+        # Place the score on the board and queue its journal record
+        self.sequence += 1
+        record = {"seq": self.sequence, "name": name, "score": score}
+        self.unsaved.append(("record", record))
+        self.records_since_compaction += 1
+        rank = self.board.add(name, score)
+        if self.records_since_compaction >= constants.JOURNAL_COMPACT_RECORDS:
+            self.compact()
+        return rank
+
+    def compact(self):
+        # Fold the journal into a snapshot at the next save
+        self.records_since_compaction = 0
+        self.compaction_due = True
+
+    def save(self):
+        # Hand everything queued since the last save to the writer thread
+        # A compaction goes after the records, with a snapshot of the board
+        # as of the last of them; the writer thread sets the journal
+        # aside, starts a new one and writes the snapshot, then deletes
+        # the old journal
+        if self.compaction_due:
+            self.compaction_due = False
+            snapshot = {
+                "sequence": self.sequence,
+                "scores": self.board.to_list(),
+            }
+            self.unsaved.append(("compact", snapshot))
+        if self.unsaved:
+            self.writer.append(self.journal_path, self.unsaved)
+            self.unsaved = []
+
+    def save_error(self):
+        # Why the last journal write failed, or None if it worked
+        error = self.writer.errors.get(self.journal_path)
+        if error is None:
+            return None
+        return str(error)
+
+    def _write_journal(self, path, entries):
+        # Runs on the writer thread
+        # Records that failed to append last time go first, and every
+        # record is appended before any compaction is tried, so a failed
+        # compaction never costs a score
+        for kind, data in entries:
+            if kind == "record":
+                self.unwritten.append(data)
+            else:
+                # A later snapshot holds everything an earlier one does
+                self.unfinished_snapshot = data
+        if self.unwritten:
+            if self.journal_file.closed:
+                # A failed rotation could not reopen the journal
+                self.journal_file = open(self.journal_path, "a")
+            lines = [json.dumps(record) + "\n" for record in self.unwritten]
+            self.journal_file.write("".join(lines))
+            self.journal_file.flush()
+            self.written_sequence = self.unwritten[-1]["seq"]
+            self.unwritten = []
+        # A failed compaction is tried again with the next batch; until
+        # then every record it covers is still in the journals
+        if self.unfinished_snapshot is not None:
+            self._rotate()
+            self._write_snapshot(self.snapshot_path, self.unfinished_snapshot)
+            self.unfinished_snapshot = None
+
+    def _rotate(self):
+        # Set the journal aside, named after its last record, and start a
+        # new one
+        # An empty journal has nothing to set aside, and would take the
+        # name of the journal set aside before it
+        # Whatever fails, the journal is left open for the next append
+        self.journal_file.close()
+        try:
+            if os.path.getsize(self.journal_path) > 0:
+                os.replace(
+                    self.journal_path,
+                    f"{self.journal_path}.{self.written_sequence}",
+                )
+        finally:
+            self.journal_file = open(self.journal_path, "a")
+
+    def _write_snapshot(self, path, snapshot):
+        # Runs on the writer thread
+        write_json_atomic(path, snapshot)
+        # Every record in these journals is now in the snapshot
+        for rotated_path in self._rotated_paths():
+            suffix = int(rotated_path[len(self.journal_path) + 1 :])
+            if suffix <= snapshot["sequence"]:
+                os.remove(rotated_path)
+
+    def total(self):
+        # Only the board is kept, not every score ever posted
+        return len(self.board)
+
+    def is_eligible(self, score):
+        return self.board.is_eligible(score)
+
+    def top(self, count, offset=0):
+        return self.board.top(count, offset)
+
+    @property
+    def version(self):
+        return self.board.version
+
+    def to_list(self):
+        return self.board.to_list()
+
+    def __len__(self):
+        return len(self.board)
+
+    def __getitem__(self, index):
+        return self.board[index]
+
+    def __iter__(self):
+        return iter(self.board)
+
+    def close(self):
+        # Write anything not saved yet, wait for the writer thread and
+        # close the journal
+        self.save()
+        self.writer.close()
+        self.journal_file.close()
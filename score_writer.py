@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+
+
+def write_json_atomic(path, data):
+    # Write to a temporary file in the same directory, flush it to disk and
+    # then rename it over the old file, so a crash or power cut leaves
+    # either the old scores or the new ones but never a half-written file
+    path = os.fspath(path)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as temp_file:
+            json.dump(data, temp_file, indent=4)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        # Don't leave a partial temporary file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ScoreWriter:
+    def __init__(self, write=write_json_atomic):
+        # Function that does the actual write, called on the writer thread
+        self.write = write
+        # Latest data waiting to be written, keyed by file path
+        # A newer save replaces an older one that has not been written yet,
+        # so a burst of saves only costs a single write
+        self.pending = {}
+        # Number of saves replaced before they were written
+        self.coalesced = 0
+        # Number of files written
+        self.writes = 0
+        # Why the last write to each path failed, keyed by path; cleared
+        # once a write to that path succeeds, so the game can tell the
+        # player their scores are not on disk
+        self.errors = {}
+        # Guards pending and wakes the writer thread
+        self.condition = threading.Condition()
+        # True while the writer thread is writing a file
+        self.busy = False
+        # Set when the writer should finish what is queued and stop
+        self.closing = False
+        # Started on the first save so idle games never create a thread
+        self.thread = None
+
+    def save(self, path, data):
+        # Queue data to be written to path and return straight away
+        # The caller must not modify data afterwards
+        with self.condition:
+            if path in self.pending:
+                self.coalesced += 1
+            self.pending[path] = data
+            self._wake()
+
+    def append(self, path, items):
+        # Queue items to be added to path and return straight away
+        # Unlike save, nothing queued is replaced: items appended before
+        # the writer gets to them are handed to write together, in order
+        with self.condition:
+            if path in self.pending:
+                self.coalesced += 1
+                self.pending[path] = self.pending[path] + list(items)
+            else:
+                self.pending[path] = list(items)
+            self._wake()
+
+    def _wake(self):
+        # Start the writer thread if needed and tell it there is work
+        # Called with the condition held
+        if self.thread is None or not self.thread.is_alive():
+            self.closing = False
+            self.thread = threading.Thread(
+                target=self._run, name="ScoreWriter", daemon=True
+            )
+            self.thread.start()
+        self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closing:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                # Take the oldest queued path and its latest data
+                path = next(iter(self.pending))
+                data = self.pending.pop(path)
+                self.busy = True
+
+            try:
+                self.write(path, data)
+                self.writes += 1
+                self.errors.pop(path, None)
+            except Exception as e:
+                # Any failure is kept for the game to report, and never
+                # stops the thread from writing whatever is queued next
+                self.errors[path] = e
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        # Block until everything queued so far has been written
+        # Returns False if the timeout ran out first
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.busy, timeout
+            )
+
+    def close(self, timeout=None):
+        # Write anything still queued and stop the writer thread
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+            thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+        self.thread = None
@@ -0,0 +1,28 @@
+import pygame
+
+import constants
+
+
+def draw_wrapped(renderer, strip, offset, y=0):
+    # Draw a strip that repeats endlessly to the left, scrolled by offset
+    # pixels, with at most two blits whatever the offset
+    # The strip must be at least as wide as the window (see
+    # assets.tile_to_width)
+    width = strip.get_width()
+    height = strip.get_height()
+    offset = int(offset) % width
+    # The strip from the offset to its end, at the left edge
+    first_width = width - offset
+    if offset == 0:
+        renderer.blit(strip, (0, y))
+    else:
+        renderer.blit(
+            strip, (0, y), pygame.Rect(offset, 0, first_width, height)
+        )
+    # Then the start of the strip again, up to the right edge
+    if first_width < constants.WINDOW_WIDTH:
+        renderer.blit(
+            strip,
+            (first_width, y),
+            pygame.Rect(0, 0, constants.WINDOW_WIDTH - first_width, height),
+        )
@@ -0,0 +1,175 @@
+import pygame
+
+import constants
+
+
+class GameState:
+    # One screen of the game; only the current state handles events,
+    # updates and draws
+    name = None
+    # An idle state looks the same every frame, so it is only redrawn
+    # when something asks for it (an event, a state change, ...)
+    idle = False
+
+    def __init__(self, game):
+        self.game = game
+        # Event handlers keyed by (event type, key)
+        # A key of None handles any key, or events that have no key
+        self.handlers = self.build_handlers()
+
+    def build_handlers(self):
+        return {}
+
+    def handle_event(self, event):
+        # Look up the most specific handler for the event
+        # Returns False if this state does not handle it
+        key = event.key if event.type == pygame.KEYDOWN else None
+        handler = self.handlers.get((event.type, key))
+        if handler is None:
+            handler = self.handlers.get((event.type, None))
+        if handler is None:
+            return False
+        handler(event)
+        return True
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self):
+        pass
+
+
+class PlayingState(GameState):
+    name = constants.STATE_PLAYING
+
+    def build_handlers(self):
+        game = self.game
+        return {
+            (constants.OBSTACLE_SPAWN_EVENT, None): game._on_spawn_timer,
+            (pygame.KEYDOWN, pygame.K_SPACE): game._on_jump_key,
+            (pygame.KEYDOWN, pygame.K_UP): game._on_jump_key,
+        }
+
+    def update(self):
+        game = self.game
+        # Updates all game objects
+        game.all_sprites.update()
+        # The ground scrolls with the obstacles
+        game.scroll_distance += game.scroll_speed
+        # Update the score based on time
+        game.scoreboard.update(pygame.time.get_ticks(), game.start_time)
+        # Check for collisions
+        game._check_collisions()
+
+    def draw(self):
+        self.game._draw_playfield()
+
+
+class GameOverState(GameState):
+    # Nothing moves once the game is over
+    name = constants.STATE_GAME_OVER
+    idle = True
+
+    def build_handlers(self):
+        game = self.game
+        return {
+            (pygame.KEYDOWN, pygame.K_h): game._on_high_scores_key,
+            (pygame.KEYDOWN, pygame.K_r): game._on_restart_key,
+            (pygame.KEYDOWN, pygame.K_q): game._on_quit,
+        }
+
+    def draw(self):
+        self.game._draw_playfield()
+        self.game._draw_game_over_text()
+
+
+class SavePromptState(GameOverState):
+    # Game over with a score that made the high score table
+    name = constants.STATE_SAVE_PROMPT
+
+    def build_handlers(self):
+        game = self.game
+        handlers = super().build_handlers()
+        handlers[(pygame.KEYDOWN, pygame.K_y)] = game._on_save_key
+        handlers[(pygame.KEYDOWN, pygame.K_n)] = game._on_decline_save_key
+        return handlers
+
+    def draw(self):
+        super().draw()
+        self.game._draw_save_prompt()
+
+
+class NameEntryState(GameState):
+    # Only changes when a key is pressed
+    name = constants.STATE_ENTERING_NAME
+    idle = True
+
+    def build_handlers(self):
+        return {(pygame.KEYDOWN, None): self.game._handle_name_entry_key}
+
+    def enter(self):
+        self.game.player_name = ""
+        self.game._set_text_input(True)
+
+    def exit(self):
+        self.game._set_text_input(False)
+
+    def draw(self):
+        self.game._draw_name_entry_screen()
+
+
+class LeaderboardState(GameState):
+    # Only redrawn while the list is scrolling
+    name = constants.STATE_DISPLAYING_SCORES
+    idle = True
+
+    def build_handlers(self):
+        game = self.game
+        return {
+            (pygame.KEYDOWN, pygame.K_ESCAPE): game._on_close_high_scores,
+            (pygame.MOUSEBUTTONDOWN, None): game._on_high_scores_click,
+            (pygame.KEYDOWN, pygame.K_UP): game._on_scroll_key,
+            (pygame.KEYDOWN, pygame.K_DOWN): game._on_scroll_key,
+            (pygame.MOUSEWHEEL, None): game._on_scroll_wheel,
+        }
+
+    def enter(self):
+        # Open the list at the top
+        self.game.high_scores_scroll = 0.0
+        self.game.high_scores_scroll_target = 0
+
+    def update(self):
+        game = self.game
+        # A save that failed in the background is shown once it is known
+        if game.high_scores.save_error() != game.save_error_shown:
+            game.needs_redraw = True
+        # Ease the high score list towards its scroll target
+        distance = game.high_scores_scroll_target - game.high_scores_scroll
+        if distance == 0:
+            return
+        if abs(distance) < 0.5:
+            game.high_scores_scroll = game.high_scores_scroll_target
+        else:
+            game.high_scores_scroll += (
+                distance * constants.HIGH_SCORES_SCROLL_EASING
+            )
+        game.needs_redraw = True
+
+    def draw(self):
+        self.game._draw_high_scores_screen()
+
+
+# Every state, in the order the game moves through them
+STATES = (
+    PlayingState,
+    GameOverState,
+    SavePromptState,
+    NameEntryState,
+    LeaderboardState,
+)
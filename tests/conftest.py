@@ -0,0 +1,86 @@
+import pygame
+import pytest
+
+import animation
+import assets
+import constants
+import fonts
+import main
+import masks
+import obstacles
+import parallax
+import physics
+import text_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    """Stops fonts, text, masks, animations, background layers, obstacle variants and jump arcs shared by one test leaking into the next test's mocks."""
+    fonts.clear()
+    text_cache.clear()
+    masks.clear()
+    animation.clear()
+    parallax.clear()
+    obstacles.clear()
+    physics.clear()
+    yield
+    fonts.clear()
+    text_cache.clear()
+    masks.clear()
+    animation.clear()
+    parallax.clear()
+    obstacles.clear()
+    physics.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_asset_bundle(tmp_path, monkeypatch):
+    """Makes every test load images from their own files unless it builds a bundle."""
+    monkeypatch.setattr(constants, 'ASSET_BUNDLE', str(tmp_path / 'assets.bundle'))
+    monkeypatch.setattr(assets, 'bundle', None)
+
+
+@pytest.fixture(autouse=True)
+def no_mask_files(monkeypatch):
+    """Stops tests reading or writing collision masks next to the real images."""
+    monkeypatch.setattr(constants, 'MASK_CACHE_ENABLED', False)
+
+
+@pytest.fixture
+def display():
+    """Opens a one pixel display for images to be converted to, and closes it afterwards."""
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.NOFRAME)
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture
+def high_score_files(tmp_path, monkeypatch):
+    """Points every high score backend at files in the test's temporary directory."""
+    monkeypatch.setattr(constants, 'HIGH_SCORE_FILE', str(tmp_path / 'scores.json'))
+    monkeypatch.setattr(constants, 'HIGH_SCORE_DATABASE', str(tmp_path / 'scores.db'))
+    monkeypatch.setattr(constants, 'HIGH_SCORE_JOURNAL', str(tmp_path / 'scores.journal'))
+    monkeypatch.setattr(constants, 'HIGH_SCORE_SNAPSHOT', str(tmp_path / 'snapshot.json'))
+
+
+@pytest.fixture
+def make_game(high_score_files):
+    """Builds real Games on temporary high score files, closing their high scores and writer threads afterwards even if the test fails."""
+    games = []
+
+    def make():
+        game = main.Game()
+        games.append(game)
+        return game
+
+    yield make
+    for game in games:
+        game.high_scores.close()
+        game.score_writer.close()
+
+
+@pytest.fixture
+def game(make_game):
+    """A real Game on temporary high score files."""
+    return make_game()
@@ -0,0 +1,81 @@
+import pygame
+import pytest
+
+import animation
+import constants
+import main
+
+
+# Images are converted to a display format, so every test needs one
+pytestmark = pytest.mark.usefixtures("display")
+
+
+def frame(width, solid):
+    """An (image, mask) pair whose mask is solid or empty."""
+    return (pygame.Surface((width, 10)), pygame.Mask((width, 10), solid))
+
+
+def test_frames_are_loaded_once(mocker):
+    """Each image is decoded once and then shared."""
+    load = mocker.spy(pygame.image, "load")
+    first = animation.load_frames(constants.PLAYER_RUN_IMAGES)
+    second = animation.load_frames(constants.PLAYER_RUN_IMAGES)
+    assert first is second
+    assert len(first) == len(constants.PLAYER_RUN_IMAGES)
+    assert load.call_count == len(constants.PLAYER_RUN_IMAGES)
+
+
+def test_missing_frame_gives_none(tmp_path):
+    """An animation with a missing frame is not used at all."""
+    paths = (constants.PLAYER_IMAGE, str(tmp_path / "missing.png"))
+    assert animation.load_frames(paths) is None
+
+
+def test_tick_advances_and_loops():
+    """Each frame is shown for ticks_per_frame ticks, then it loops."""
+    frames = (frame(1, True), frame(2, True))
+    run = animation.Animation(frames, 2)
+    shown = []
+    for _ in range(4):
+        run.tick()
+        shown.append(run.index)
+    assert shown == [0, 1, 1, 0]
+    assert run.image is frames[0][0]
+
+
+def test_llama_runs_on_the_ground_only():
+    """The llama animates while running and holds its frame in the air."""
+    frames = (frame(10, True), frame(10, False))
+    llama = main.Llama(frames)
+    llama.reset()
+    for _ in range(constants.PLAYER_RUN_FRAME_TICKS):
+        llama.update()
+    assert llama.image is frames[1][0]
+    assert llama.mask is frames[1][1]
+
+    llama.jump()
+    for _ in range(constants.PLAYER_RUN_FRAME_TICKS):
+        llama.update()
+    assert llama.image is frames[1][0]
+
+    llama.reset()
+    assert llama.image is frames[0][0]
+
+
+def test_collisions_use_the_frame_shown(game):
+    """A frame with an empty mask cannot be hit."""
+    frames = (frame(10, False), frame(10, True))
+    game.llama.animation = animation.Animation(frames, 1)
+    game.llama.reset()
+    # A ground obstacle in lane 0, so the lane index finds it on the llama
+    obstacle = main.Obstacle(0)
+    obstacle.rect.midbottom = game.llama.rect.midbottom
+    game.obstacles.add(obstacle)
+    game.obstacle_lanes.add(obstacle)
+    game._check_collisions()
+    assert not game.game_over
+
+    # Moves on to the solid frame during the update
+    game._update()
+    assert game.llama.mask is frames[1][1]
+    assert game.game_over
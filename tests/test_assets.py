@@ -0,0 +1,188 @@
+import pytest
+import pygame
+from unittest.mock import patch
+
+import assets
+import constants
+
+
+@pytest.fixture(scope="module", autouse=True)
+def pygame_display():
+    """A display is needed to convert the bundled surfaces."""
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    """Builds a bundle from the real images into a temporary file."""
+    path = str(tmp_path / "test.bundle")
+    assets.build_bundle(path)
+    return path
+
+
+def test_bundle_contains_every_image(bundle_path):
+    """Every bundled image can be loaded from the bundle."""
+    surfaces = assets.load_bundle(bundle_path)
+    for path in assets.BUNDLED_IMAGES + assets.BUNDLED_SCALED_IMAGES:
+        assert path in surfaces
+
+
+def test_bundled_pixels_match_png(bundle_path):
+    """Pixels loaded from the bundle match the decoded PNG."""
+    assets.load_bundle(bundle_path)
+    bundled = assets.bundled_image(constants.PLAYER_IMAGE)
+    original = assets.prepare_image(pygame.image.load(constants.PLAYER_IMAGE))
+    assert bundled.get_size() == original.get_size()
+    for x in range(0, original.get_width(), 4):
+        for y in range(0, original.get_height(), 4):
+            assert bundled.get_at((x, y)) == original.get_at((x, y))
+
+
+def test_ground_is_prescaled_to_window_height(bundle_path):
+    """The ground image is stored already scaled to the window height."""
+    assets.load_bundle(bundle_path)
+    ground = assets.bundled_image(constants.GROUND_IMAGE)
+    assert ground.get_height() == constants.WINDOW_HEIGHT
+
+
+def test_changed_window_size_makes_bundle_stale(bundle_path, monkeypatch, capsys):
+    """A bundle built for another window size is not used."""
+    monkeypatch.setattr(constants, "WINDOW_HEIGHT", constants.WINDOW_HEIGHT + 1)
+    assert assets.load_bundle(bundle_path) is None
+    assert assets.bundle is None
+    assert "stale" in capsys.readouterr().out
+
+
+def test_changed_source_image_makes_bundle_stale(bundle_path, capsys):
+    """A bundle is not used once a source image has changed."""
+    with patch("assets._source_stamp", return_value=[0, 0]):
+        assert assets.load_bundle(bundle_path) is None
+    assert "stale" in capsys.readouterr().out
+
+
+def test_unrecognised_file_is_ignored(tmp_path, capsys):
+    """A file that is not a bundle is ignored."""
+    path = tmp_path / "bad.bundle"
+    path.write_bytes(b"not a bundle at all")
+    assert assets.load_bundle(str(path)) is None
+    assert "unrecognised" in capsys.readouterr().out
+
+
+def test_missing_bundle_falls_back_to_png():
+    """Without a bundle, load_image decodes the image file."""
+    assert assets.load_bundle() is None
+    with patch("pygame.image.load", wraps=pygame.image.load) as mock_load:
+        surface = assets.load_image(constants.OBSTACLE_IMAGE)
+    mock_load.assert_called_once_with(constants.OBSTACLE_IMAGE)
+    assert surface.get_size() == (32, 32)
+
+
+def test_load_image_uses_bundle(bundle_path):
+    """With a bundle loaded, load_image does not decode the image file."""
+    assets.load_bundle(bundle_path)
+    with patch("pygame.image.load") as mock_load:
+        surface = assets.load_image(constants.OBSTACLE_IMAGE)
+    mock_load.assert_not_called()
+    assert surface is assets.bundled_image(constants.OBSTACLE_IMAGE)
+
+
+def test_tile_to_width_repeats_exactly():
+    """The strip is whole copies of the surface, alpha included."""
+    surface = pygame.Surface((3, 2), pygame.SRCALPHA)
+    surface.fill((200, 100, 50, 128))
+    surface.set_at((0, 0), (1, 2, 3, 0))
+    strip = assets.tile_to_width(surface, 7)
+    assert strip.get_size() == (9, 2)
+    for x in range(9):
+        for y in range(2):
+            assert strip.get_at((x, y)) == surface.get_at((x % 3, y))
+
+
+def test_tile_to_width_keeps_wide_surfaces():
+    """A surface that is already wide enough is returned as it is."""
+    surface = pygame.Surface((10, 2))
+    assert assets.tile_to_width(surface, 10) is surface
+
+
+def make_image(alphas):
+    """A one-row image with a grey pixel of each alpha."""
+    surface = pygame.Surface((len(alphas), 1), pygame.SRCALPHA)
+    for x, alpha in enumerate(alphas):
+        surface.set_at((x, 0), (100, 100, 100, alpha))
+    return surface
+
+
+def test_alpha_kind():
+    """Images are sorted by how they use transparency."""
+    assert assets.alpha_kind(make_image([255, 255])) == "opaque"
+    assert assets.alpha_kind(make_image([255, 0])) == "binary"
+    assert assets.alpha_kind(make_image([255, 128, 0])) == "translucent"
+    assert assets.alpha_kind(pygame.Surface((2, 2))) == "opaque"
+
+
+def test_prepare_image_picks_the_cheapest_format():
+    """Only translucent images keep per-pixel alpha."""
+    opaque = assets.prepare_image(make_image([255, 255]))
+    assert not opaque.get_flags() & pygame.SRCALPHA
+    assert opaque.get_colorkey() is None
+
+    keyed = assets.prepare_image(make_image([255, 0]))
+    assert not keyed.get_flags() & pygame.SRCALPHA
+    assert keyed.get_flags() & pygame.RLEACCELOK
+    assert keyed.get_colorkey() == constants.COLORKEY + (255,)
+    assert keyed.get_at((0, 0)) == (100, 100, 100, 255)
+
+    translucent = assets.prepare_image(make_image([255, 128]))
+    assert translucent.get_flags() & pygame.SRCALPHA
+
+
+def test_visible_colorkey_pixels_keep_alpha():
+    """An image that already uses the colorkey colour is not keyed."""
+    surface = make_image([255, 0])
+    surface.set_at((0, 0), constants.COLORKEY)
+    assert assets.colorkey_image(surface) is None
+    assert assets.format_kind(surface) == "translucent"
+    prepared = assets.prepare_image(surface)
+    assert prepared.get_flags() & pygame.SRCALPHA
+    assert prepared.get_at((0, 0)) == constants.COLORKEY + (255,)
+
+
+def test_bundled_images_draw_like_the_png():
+    """A keyed image draws the same pixels as one with per-pixel alpha."""
+    source = pygame.image.load(constants.PLAYER_IMAGE)
+    prepared = assets.prepare_image(source)
+    assert prepared.get_colorkey() is not None
+    drawn = []
+    for image in (prepared, source.convert_alpha()):
+        target = pygame.Surface(image.get_size())
+        target.fill((10, 20, 30))
+        target.blit(image, (0, 0))
+        drawn.append(pygame.image.tobytes(target, "RGB"))
+    assert drawn[0] == drawn[1]
+
+
+def test_bundle_records_each_alpha_kind(bundle_path, mocker):
+    """Loading a bundle uses the kinds worked out when it was built."""
+    alpha_kind = mocker.spy(assets, "alpha_kind")
+    surfaces = assets.load_bundle(bundle_path)
+    alpha_kind.assert_not_called()
+    for path in assets.BUNDLED_IMAGES:
+        expected = assets.prepare_image(pygame.image.load(path))
+        assert surfaces[path].get_colorkey() == expected.get_colorkey()
+        assert surfaces[path].get_flags() & pygame.SRCALPHA == (
+            expected.get_flags() & pygame.SRCALPHA
+        )
+
+
+def test_tile_to_width_keeps_the_colorkey():
+    """A keyed image is tiled into a keyed strip."""
+    surface = assets.prepare_image(make_image([255, 0]))
+    strip = assets.tile_to_width(surface, 5)
+    assert strip.get_colorkey() == surface.get_colorkey()
+    assert [strip.get_at((x, 0))[:3] for x in range(4)] == [
+        (100, 100, 100),
+        constants.COLORKEY,
+    ] * 2
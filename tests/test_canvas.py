@@ -0,0 +1,73 @@
+import pytest
+import pygame
+
+import constants
+from canvas import Canvas, fit_rect
+
+
+@pytest.fixture(autouse=True)
+def display():
+    """Canvases need a real (dummy driver) display."""
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize(
+    "output_size, integer_scale, expected",
+    [
+        ((1800, 800), True, pygame.Rect(0, 0, 1800, 800)),
+        ((3840, 2160), True, pygame.Rect(120, 280, 3600, 1600)),
+        ((3840, 2160), False, pygame.Rect(0, 227, 3840, 1706)),
+        ((450, 400), True, pygame.Rect(0, 100, 450, 200)),
+    ],
+)
+def test_fit_rect(output_size, integer_scale, expected):
+    """The canvas is scaled to fit and centred in the output."""
+    assert fit_rect((900, 400), output_size, integer_scale) == expected
+
+
+def test_no_scaling_draws_into_window():
+    """Without scaling the canvas is the window itself."""
+    canvas = Canvas(scaling="none")
+    assert canvas.surface is canvas.window
+    assert canvas.surface.get_size() == (
+        constants.WINDOW_WIDTH,
+        constants.WINDOW_HEIGHT,
+    )
+
+
+def test_software_scaling_presents_scaled_canvas():
+    """The logical canvas is scaled up to fill the window."""
+    canvas = Canvas(scaling="software", window_scale=2)
+    assert canvas.surface.get_size() == (
+        constants.WINDOW_WIDTH,
+        constants.WINDOW_HEIGHT,
+    )
+    assert canvas.window.get_size() == (
+        constants.WINDOW_WIDTH * 2,
+        constants.WINDOW_HEIGHT * 2,
+    )
+    canvas.surface.fill(constants.WHITE)
+    canvas.surface.set_at((0, 0), constants.RED)
+    canvas.present()
+    assert canvas.window.get_at((1, 1))[:3] == constants.RED
+    assert canvas.window.get_at((10, 10))[:3] == constants.WHITE
+
+
+def test_smooth_software_scaling_blends_pixels():
+    """Smooth scaling blends neighbouring pixels."""
+    canvas = Canvas(scaling="software", smooth=True, window_scale=2)
+    canvas.surface.fill(constants.WHITE)
+    canvas.surface.set_at((0, 0), constants.RED)
+    canvas.present()
+    red, green, blue = canvas.window.get_at((1, 1))[:3]
+    assert red == 255
+    assert 0 < green < 255
+
+
+def test_to_logical():
+    """Window positions map back to canvas pixels."""
+    canvas = Canvas(scaling="software", window_scale=2)
+    assert canvas.to_logical((200, 100)) == (100, 50)
+    assert Canvas(scaling="none").to_logical((200, 100)) == (200, 100)
@@ -0,0 +1,81 @@
+import pytest
+import pygame
+from unittest.mock import MagicMock, call, patch
+
+import constants
+import fonts
+from fonts import FontRegistry
+
+
+@pytest.fixture
+def mock_sysfont():
+    """Patches SysFont so that every call returns a new mock font."""
+    with patch('pygame.font.SysFont', side_effect=lambda *a: MagicMock()) as mock_sysfont:
+        yield mock_sysfont
+
+
+def test_same_key_returns_shared_font(mock_sysfont):
+    """Fonts with the same name, size and style are only created once."""
+    registry = FontRegistry()
+    first = registry.get(36)
+    second = registry.get(36)
+    assert first is second
+    mock_sysfont.assert_called_once_with(None, 36)
+
+
+def test_different_sizes_return_different_fonts(mock_sysfont):
+    """Each size gets its own font object."""
+    registry = FontRegistry()
+    assert registry.get(36) is not registry.get(74)
+
+
+def test_style_is_part_of_the_key(mock_sysfont):
+    """Bold and italic fonts are stored separately from the plain font."""
+    registry = FontRegistry()
+    plain = registry.get(36)
+    bold = registry.get(36, bold=True)
+    assert plain is not bold
+    mock_sysfont.assert_called_with(None, 36, True, False)
+
+
+def test_preload_creates_each_size_once(mock_sysfont):
+    """Preloading creates fonts that later lookups reuse."""
+    registry = FontRegistry()
+    registry.preload((36, 74, 36, 24))
+    assert mock_sysfont.call_args_list == [
+        call(None, 36), call(None, 74), call(None, 24)
+    ]
+    registry.get(74)
+    assert mock_sysfont.call_count == 3
+
+
+def test_clear_forgets_fonts(mock_sysfont):
+    """A cleared registry creates fonts again on the next lookup."""
+    registry = FontRegistry()
+    registry.get(24)
+    registry.clear()
+    registry.get(24)
+    assert mock_sysfont.call_count == 2
+
+
+def test_font_module_initialised_on_first_use():
+    """The font module is only initialised when a font is requested."""
+    with patch('pygame.font.get_init', return_value=False), \
+         patch('pygame.font.init') as mock_init, \
+         patch('pygame.font.SysFont', return_value=MagicMock()):
+        fonts.get_font(24)
+    mock_init.assert_called_once_with()
+
+
+def test_get_font_uses_shared_registry(mock_sysfont):
+    """The module level helper looks fonts up in the shared registry."""
+    assert fonts.get_font(36) is fonts.registry.get(36)
+
+
+def test_game_creates_each_font_size_once(mocker, make_game):
+    """A Game asks SysFont for each distinct size once, however many fonts use it."""
+    sysfont = mocker.spy(pygame.font, 'SysFont')
+    game = make_game()
+    sizes = sorted(call.args[1] for call in sysfont.call_args_list)
+    assert sizes == sorted(set(constants.FONT_SIZES))
+    assert game.input_font is game.score_font
@@ -64,7 +64,7 @@ def test_no_collision(mock_set_timer, mock_spritecollide, game_instance):
 
     # Assert
     mock_spritecollide.assert_called_once_with(
-        game_instance.llama, game_instance.obstacles, False, pygame.sprite.collide_mask
+        game_instance.llama, [], False, pygame.sprite.collide_mask
     )
     assert game_instance.game_over is False, "game_over should remain False"
     game_instance._check_score_eligible.assert_not_called()
@@ -91,7 +91,7 @@ def test_collision_occurs_score_eligible(mock_set_timer, mock_spritecollide, gam
 
     # Assert
     mock_spritecollide.assert_called_once_with(
-        game_instance.llama, game_instance.obstacles, False, pygame.sprite.collide_mask
+        game_instance.llama, [], False, pygame.sprite.collide_mask
     )
     assert game_instance.game_over is True, "game_over should be set to True"
     game_instance._check_score_eligible.assert_called_once()
@@ -116,7 +116,7 @@ def test_collision_occurs_score_not_eligible(mock_set_timer, mock_spritecollide,
 
     # Assert
     mock_spritecollide.assert_called_once_with(
-        game_instance.llama, game_instance.obstacles, False, pygame.sprite.collide_mask
+        game_instance.llama, [], False, pygame.sprite.collide_mask
     )
     assert game_instance.game_over is True, "game_over should be set to True"
     game_instance._check_score_eligible.assert_called_once()
@@ -140,7 +140,7 @@ def test_no_obstacles_present(mock_set_timer, mock_spritecollide, game_instance)
 
     # Assert
     mock_spritecollide.assert_called_once_with(
-        game_instance.llama, game_instance.obstacles, False, pygame.sprite.collide_mask
+        game_instance.llama, [], False, pygame.sprite.collide_mask
     )
     assert game_instance.game_over is False, "game_over should remain False"
     game_instance._check_score_eligible.assert_not_called()
@@ -0,0 +1,124 @@
+import pytest
+import pygame
+
+import constants
+
+
+def test_unused_events_are_not_queued(game):
+    """Events the game never handles are dropped by SDL."""
+    pygame.event.clear()
+    motion = pygame.event.Event(
+        pygame.MOUSEMOTION, pos=(0, 0), rel=(0, 0), buttons=(0, 0, 0)
+    )
+    assert not pygame.event.post(motion)
+    assert pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=0))
+    assert [event.type for event in pygame.event.get()] == [pygame.KEYDOWN]
+
+
+def test_text_input_only_allowed_while_entering_name(game):
+    """Typed text is only queued during name entry."""
+    assert pygame.event.get_blocked(pygame.TEXTINPUT)
+    game.game_over = True
+    game.score_eligible_for_save = True
+    game._dispatch_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_y))
+    assert game.entering_name
+    assert not pygame.event.get_blocked(pygame.TEXTINPUT)
+
+    game.player_name = "Joe"
+    game._dispatch_event(
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="")
+    )
+    assert not game.entering_name
+    assert pygame.event.get_blocked(pygame.TEXTINPUT)
+
+
+@pytest.mark.parametrize(
+    "flags, state",
+    [
+        ({}, constants.STATE_PLAYING),
+        ({"game_over": True}, constants.STATE_GAME_OVER),
+        (
+            {"game_over": True, "entering_name": True},
+            constants.STATE_ENTERING_NAME,
+        ),
+        (
+            {"game_over": True, "displaying_scores": True},
+            constants.STATE_DISPLAYING_SCORES,
+        ),
+    ],
+)
+def test_current_state(game, flags, state):
+    """The state is worked out from the game's flags."""
+    for name, value in flags.items():
+        setattr(game, name, value)
+    assert game._current_state() == state
+
+
+def test_key_specific_handler_wins(game, mocker):
+    """A handler for the exact key is used before the catch-all."""
+    game.game_over = True
+    exact = mocker.Mock()
+    fallback = mocker.Mock()
+    handlers = game.states[constants.STATE_GAME_OVER].handlers
+    handlers[(pygame.KEYDOWN, pygame.K_x)] = exact
+    handlers[(pygame.KEYDOWN, None)] = fallback
+    game._dispatch_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_x))
+    game._dispatch_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z))
+    exact.assert_called_once()
+    fallback.assert_called_once()
+
+
+def test_quit_is_handled_in_every_state(game):
+    """Closing the window works whatever state the game is in."""
+    game.game_over = True
+    game.displaying_scores = True
+    game._dispatch_event(pygame.event.Event(pygame.QUIT))
+    assert not game.running
+
+
+def test_event_handling_is_timed(make_game, monkeypatch):
+    """Each call to _handle_events is recorded when profiling."""
+    monkeypatch.setattr(constants, "PROFILE_EVENTS", True)
+    game = make_game()
+    game._handle_events()
+    game._handle_events()
+    assert len(game.event_stats.samples) == 2
+
+
+def test_jump_latency_is_measured(make_game, monkeypatch):
+    """A jump is timed from its key press to the next presented frame."""
+    monkeypatch.setattr(constants, "MEASURE_INPUT_LATENCY", True)
+    game = make_game()
+    pygame.event.clear()
+    pygame.event.post(
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ")
+    )
+    game._handle_events()
+    pressed_time = game.event_poll_time
+    # A second press in the air does not start a jump
+    pygame.event.post(
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP, unicode="")
+    )
+    game._handle_events()
+    assert game.input_latency.pending is not None
+    game.input_latency.presented(pressed_time + 0.02)
+    assert game.input_latency.latency.samples == [pytest.approx(0.02)]
+
+
+@pytest.mark.parametrize("backend, samples", [("surface", 1), ("null", 0)])
+def test_jump_latency_needs_a_presented_frame(
+    make_game, monkeypatch, backend, samples
+):
+    """Only a frame that was actually presented ends a latency sample."""
+    monkeypatch.setattr(constants, "MEASURE_INPUT_LATENCY", True)
+    monkeypatch.setattr(constants, "RENDER_BACKEND", backend)
+    game = make_game()
+    pygame.event.clear()
+    pygame.event.post(
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ")
+    )
+    game._handle_events()
+    game._update()
+    game._draw()
+    assert len(game.input_latency.latency.samples) == samples
+    assert (game.input_latency.pending is None) == bool(samples)
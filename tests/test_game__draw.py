@@ -156,7 +156,7 @@ def test_draw_game_over_not_eligible(game_instance):
     )
     game.pygame_draw_rect.assert_not_called()
     game.all_sprites.draw.assert_called_once_with(game.screen)
-    game.scoreboard.draw.assert_called_once_with(game.screen)
+    game.scoreboard.draw.assert_called_once_with(game.renderer)
 
     # Render calls
     game.game_over_font.render.assert_called_once_with("GAME OVER", True, constants.BLACK)
@@ -240,7 +240,7 @@ def test_draw_game_over_eligible(game_instance):
     )
     game.pygame_draw_rect.assert_not_called()
     game.all_sprites.draw.assert_called_once_with(game.screen)
-    game.scoreboard.draw.assert_called_once_with(game.screen)
+    game.scoreboard.draw.assert_called_once_with(game.renderer)
 
     # Render calls
     game.game_over_font.render.assert_called_once_with("GAME OVER", True, constants.BLACK)
@@ -321,7 +321,7 @@ def test_draw_game_over_no_ground_image(game_instance):
     game.pygame_draw_rect.assert_called_once_with(game.screen, constants.GREY, expected_rect)
 
     game.all_sprites.draw.assert_called_once_with(game.screen)
-    game.scoreboard.draw.assert_called_once_with(game.screen)
+    game.scoreboard.draw.assert_called_once_with(game.renderer)
 
     # Game Over text is rendered
     game.game_over_font.render.assert_called_once_with("GAME OVER", True, constants.BLACK)
@@ -441,7 +441,7 @@ def test_draw_empty_sprite_group(game_instance):
     )
     game.pygame_draw_rect.assert_not_called()
     game.all_sprites.draw.assert_called_once_with(game.screen) # Assert group draw was called
-    game.scoreboard.draw.assert_called_once_with(game.screen)
+    game.scoreboard.draw.assert_called_once_with(game.renderer)
     game.game_over_font.render.assert_not_called()
     game.final_score_font.render.assert_not_called()
 
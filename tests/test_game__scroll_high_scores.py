@@ -0,0 +1,113 @@
+import pytest
+import pygame
+
+import constants
+import text_cache
+from leaderboard import Leaderboard
+from score_db import SQLiteLeaderboard
+
+
+@pytest.fixture
+def game(game):
+    """A real Game with a long board."""
+    game.high_scores = Leaderboard.from_entries(
+        ((f"P{i}", 1000 - i) for i in range(30)), capacity=30
+    )
+    # The high score screen is opened from the game over screen
+    game.game_over = True
+    game._show_high_scores()
+    return game
+
+
+def rendered_rows(mocker):
+    """Spy on the text cache and return the rows it was asked to draw."""
+    spy = mocker.spy(text_cache, "render")
+
+    def rows():
+        return [c.args[1] for c in spy.call_args_list if ". " in c.args[1]]
+
+    return rows
+
+
+def test_only_visible_rows_are_drawn(game, mocker):
+    """Rows scrolled out of view are never rendered."""
+    rows = rendered_rows(mocker)
+    game._draw_high_scores_screen()
+    # The visible rows plus the one partly scrolled into view
+    assert len(rows()) == constants.HIGH_SCORES_SHOWN + 1
+    assert rows()[0] == "1. P0 - 1000"
+
+
+def test_screen_is_cached_until_scores_change(game, mocker):
+    """Redrawing an unchanged screen reuses the cached surface."""
+    render_spy = mocker.spy(game, "_render_high_scores_screen")
+    game._draw_high_scores_screen()
+    game._draw_high_scores_screen()
+    assert render_spy.call_count == 1
+
+    game.high_scores.add("New", 5000)
+    game._draw_high_scores_screen()
+    assert render_spy.call_count == 2
+
+
+def test_scroll_is_clamped(game):
+    """The list cannot scroll past its first or last row."""
+    line_height = constants.HIGH_SCORES_LINE_HEIGHT
+    game._scroll_high_scores(-line_height)
+    assert game.high_scores_scroll_target == 0
+    game._scroll_high_scores(1000 * line_height)
+    hidden_rows = 30 - constants.HIGH_SCORES_SHOWN
+    assert game.high_scores_scroll_target == hidden_rows * line_height
+
+
+def test_scroll_reaches_past_the_database_board(game, tmp_path, mocker):
+    """A database board scrolls through every stored score, not just the
+    rows it keeps in memory."""
+    board = SQLiteLeaderboard(str(tmp_path / "scores.db"), capacity=10)
+    board.add_many((f"P{i}", 1000 - i) for i in range(25))
+    game.high_scores = board
+    line_height = constants.HIGH_SCORES_LINE_HEIGHT
+    game._scroll_high_scores(1000 * line_height)
+    hidden_rows = 25 - constants.HIGH_SCORES_SHOWN
+    assert game.high_scores_scroll_target == hidden_rows * line_height
+
+    game.high_scores_scroll = game.high_scores_scroll_target
+    rows = rendered_rows(mocker)
+    game._draw_high_scores_screen()
+    first = hidden_rows
+    assert rows()[0] == f"{first + 1}. P{first} - {1000 - first}"
+    assert rows()[-1] == "25. P24 - 976"
+    board.close()
+
+
+def test_scroll_eases_towards_target(game, mocker):
+    """Scrolling moves part of the way each frame and then settles."""
+    game._scroll_high_scores(constants.HIGH_SCORES_LINE_HEIGHT * 3)
+    game._update()
+    assert 0 < game.high_scores_scroll < game.high_scores_scroll_target
+    for _ in range(100):
+        game._update()
+    assert game.high_scores_scroll == game.high_scores_scroll_target
+
+    rows = rendered_rows(mocker)
+    game._draw_high_scores_screen()
+    assert rows()[0] == "4. P3 - 997"
+
+
+def test_down_key_and_wheel_scroll(game):
+    """The down key and the mouse wheel both scroll the list."""
+    line_height = constants.HIGH_SCORES_LINE_HEIGHT
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN))
+    pygame.event.post(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-2))
+    pygame.event.post(
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=5, pos=(0, 0))
+    )
+    game._handle_events()
+    assert game.high_scores_scroll_target == 3 * line_height
+    # Wheel movement does not close the screen, but a click does
+    assert game.displaying_scores
+    pygame.event.post(
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0))
+    )
+    game._handle_events()
+    assert not game.displaying_scores
@@ -74,7 +74,7 @@ def test_spawn_obstacle_standard_spawn(game_instance):
     Verification Focus: Checks if a new Obstacle is created with the correct
                         initial speed and added to the appropriate sprite groups.
     Expected Output:
-        - Obstacle class is instantiated once with constants.OBSTACLE_INITIAL_SPEED.
+        - Obstacle class is instantiated once with constants.OBSTACLE_INITIAL_SPEED and a variant id.
         - The created obstacle instance is added to game_instance.all_sprites.
         - The created obstacle instance is added to game_instance.obstacles.
     """
@@ -87,7 +87,10 @@ def test_spawn_obstacle_standard_spawn(game_instance):
 
     # Assert
     # 1. Verify Obstacle class was called correctly
-    game_instance.MockObstacleClass.assert_called_once_with(constants.OBSTACLE_INITIAL_SPEED)
+    game_instance.MockObstacleClass.assert_called_once()
+    speed, variant = game_instance.MockObstacleClass.call_args.args
+    assert speed == constants.OBSTACLE_INITIAL_SPEED
+    assert variant in constants.OBSTACLE_VARIANTS
 
     # 2. Verify the instance returned by the mock class was added to the groups
     created_obstacle = game_instance.mock_obstacle_instance # Get the instance we configured
@@ -43,7 +43,9 @@ def mock_pygame_essentials():
          patch('pygame.sprite.Group') as mock_group, \
          patch('pygame.draw.rect') as mock_draw_rect, \
          patch('pygame.display.flip') as mock_display_flip, \
-         patch('pygame.transform.scale') as mock_transform_scale: # ***** ADDED MOCK HERE *****
+         patch('pygame.transform.scale') as mock_transform_scale, \
+         patch('assets.tile_to_width', side_effect=lambda surface, width: surface), \
+         patch('parallax.load_layers', return_value=[]): # No sky, so the playfield is cleared to WHITE whatever display an earlier test left open
 
         # Configure image loading mock
         mock_surface = MagicMock(spec=pygame.Surface)
@@ -60,6 +62,9 @@ def mock_pygame_essentials():
         # Configure font mock
         mock_font = MagicMock(spec=pygame.font.Font)
         mock_font.render.return_value = MagicMock(spec=pygame.Surface, get_rect=MagicMock(return_value=MagicMock(spec=pygame.Rect)))
+        # Give rendered text a size so the text cache can account for it
+        mock_font.render.return_value.get_pitch.return_value = 400
+        mock_font.render.return_value.get_height.return_value = 25
         mock_sysfont.return_value = mock_font
 
         # Configure sprite group mock
@@ -137,9 +142,9 @@ class TestGameIntegration:
 
         # --- Assertions ---
         # (Previous assertions for init, mixer, font, display, clock, state...)
-        mock_pygame_essentials["init"].assert_called_once()
-        mock_pygame_essentials["mixer_init"].assert_called_once()
-        mock_pygame_essentials["font_init"].assert_called_once()
+        # Subsystems are initialised lazily, so sound is never initialised
+        mock_pygame_essentials["init"].assert_not_called()
+        mock_pygame_essentials["mixer_init"].assert_not_called()
         mock_pygame_essentials["set_mode"].assert_called_once_with((constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT))
         mock_pygame_essentials["set_caption"].assert_called_once_with(constants.WINDOW_TITLE)
         mock_pygame_essentials["clock"].assert_called_once()
@@ -199,8 +204,9 @@ class TestGameIntegration:
         mock_game_components["scoreboard_instance"].update.assert_called_once_with(1000, game.start_time)
 
         # Check collision check is performed
+        # Only obstacles in the llama's lanes are checked; none were spawned
         mock_pygame_essentials["spritecollide"].assert_called_once_with(
-            game.llama, game.obstacles, False, pygame.sprite.collide_mask
+            game.llama, [], False, pygame.sprite.collide_mask
         )
         assert game.game_over is False # No collision simulated
 
@@ -231,7 +237,8 @@ class TestGameIntegration:
         game._handle_events() # This calls _spawn_obstacle which adds to groups
 
         # Check Obstacle was created
-        mock_game_components["Obstacle"].assert_called_once_with(constants.OBSTACLE_INITIAL_SPEED)
+        mock_game_components["Obstacle"].assert_called_once_with(constants.OBSTACLE_INITIAL_SPEED, ANY)
+        assert mock_game_components["Obstacle"].call_args.args[1] in constants.OBSTACLE_VARIANTS
         new_obstacle = mock_game_components["Obstacle"].return_value
 
         # Check add was called with the new obstacle instance on the mock group
@@ -353,7 +360,7 @@ class TestGameIntegration:
         # Check ground blit (might be multiple calls if wider than screen)
         mock_screen.blit.assert_any_call(game.scaled_ground_image, (0, 0))
         mock_group.draw.assert_called_once_with(mock_screen) # all_sprites.draw
-        mock_game_components["scoreboard_instance"].draw.assert_called_once_with(mock_screen)
+        mock_game_components["scoreboard_instance"].draw.assert_called_once_with(game.renderer)
         mock_pygame_essentials["display_flip"].assert_called_once()
 
 
@@ -378,7 +385,7 @@ class TestGameIntegration:
         # Ground, sprites, score drawn as usual
         mock_screen.blit.assert_any_call(game.scaled_ground_image, (0, 0))
         mock_group.draw.assert_called_once_with(mock_screen)
-        mock_game_components["scoreboard_instance"].draw.assert_called_once_with(mock_screen)
+        mock_game_components["scoreboard_instance"].draw.assert_called_once_with(game.renderer)
 
         # Check Game Over specific text rendering and blitting
         render_calls = mock_pygame_essentials["mock_font"].render.call_args_list
@@ -0,0 +1,130 @@
+import pytest
+
+from leaderboard import Leaderboard
+
+
+def test_add_keeps_scores_in_descending_order():
+    """Scores are kept highest first whatever order they arrive in."""
+    board = Leaderboard(capacity=10)
+    for name, score in [("A", 50), ("B", 100), ("C", 75)]:
+        board.add(name, score)
+    assert list(board) == [("B", 100), ("C", 75), ("A", 50)]
+
+
+def test_add_returns_rank():
+    """add returns the position the score was inserted at."""
+    board = Leaderboard(capacity=10)
+    assert board.add("A", 50) == 0
+    assert board.add("B", 100) == 0
+    assert board.add("C", 75) == 1
+
+
+def test_equal_scores_keep_arrival_order():
+    """A new score goes after existing entries with the same score."""
+    board = Leaderboard(capacity=10)
+    board.add("Alice", 100)
+    board.add("David", 100)
+    assert list(board) == [("Alice", 100), ("David", 100)]
+
+
+def test_capacity_drops_lowest_score():
+    """Once full, adding a better score removes the lowest one."""
+    board = Leaderboard(capacity=3)
+    for index, score in enumerate([30, 20, 10]):
+        board.add(f"P{index}", score)
+    board.add("New", 15)
+    assert list(board) == [("P0", 30), ("P1", 20), ("New", 15)]
+
+
+def test_score_below_full_board_is_rejected():
+    """A score that does not beat a full board is not added."""
+    board = Leaderboard(capacity=2)
+    board.add("A", 20)
+    board.add("B", 10)
+    assert board.add("C", 5) is None
+    assert list(board) == [("A", 20), ("B", 10)]
+
+
+@pytest.mark.parametrize(
+    "scores, score, expected",
+    [
+        ([], 0, True),  # Empty board
+        ([50, 30], 1, True),  # Board not full
+        ([30, 20, 10], 11, True),  # Beats the lowest score
+        ([30, 20, 10], 10, False),  # Ties the lowest score
+        ([30, 20, 10], 9, False),  # Below the lowest score
+    ],
+)
+def test_is_eligible(scores, score, expected):
+    """Eligibility compares against the cached lowest score."""
+    board = Leaderboard(capacity=3)
+    for index, existing in enumerate(scores):
+        board.add(f"P{index}", existing)
+    assert board.is_eligible(score) is expected
+
+
+def test_threshold_tracks_lowest_score_when_full():
+    """The threshold is only set once the board is full."""
+    board = Leaderboard(capacity=2)
+    board.add("A", 20)
+    assert board.threshold is None
+    board.add("B", 10)
+    assert board.threshold == 10
+    board.add("C", 15)
+    assert board.threshold == 15
+
+
+def test_from_list_sorts_and_truncates():
+    """Loading the JSON form sorts the scores and keeps the top entries."""
+    scores = [{"name": f"P{i}", "score": i} for i in range(12)]
+    board = Leaderboard.from_list(scores, capacity=10)
+    assert len(board) == 10
+    assert board[0] == ("P11", 11)
+    assert board[9] == ("P2", 2)
+
+
+def test_from_list_fills_missing_fields():
+    """Entries missing a name or score get defaults."""
+    board = Leaderboard.from_list([{"name": "NoScore"}, {"score": 5}])
+    assert list(board) == [("N/A", 5), ("NoScore", 0)]
+
+
+def test_from_list_skips_invalid_entries():
+    """One malformed entry is dropped instead of losing the whole table."""
+    scores = [
+        {"name": "A", "score": 9},
+        "oops",
+        {"name": "B", "score": "x"},
+        None,
+        {"name": "C", "score": "7"},
+        {"name": "D", "score": None},
+    ]
+    board = Leaderboard.from_list(scores)
+    assert list(board) == [("A", 9), ("C", 7)]
+
+
+def test_to_list_round_trips():
+    """to_list produces the JSON form that from_list reads."""
+    scores = [{"name": "A", "score": 100}, {"name": "B", "score": 50}]
+    assert Leaderboard.from_list(scores).to_list() == scores
+
+
+def test_large_history():
+    """A board holding a long history stays ordered and bounded."""
+    board = Leaderboard.from_entries(
+        ((f"P{i}", (i * 7919) % 100003) for i in range(100000)),
+        capacity=100000,
+    )
+    board.add("Top", 200000)
+    assert len(board) == 100000
+    assert board[0] == ("Top", 200000)
+    scores = [score for _, score in board.top(1000)]
+    assert scores == sorted(scores, reverse=True)
+    assert board.is_eligible(board[-1][1] + 1)
+
+
+def test_non_numeric_score_raises():
+    """Scores must be numbers."""
+    board = Leaderboard()
+    with pytest.raises(TypeError):
+        board.add("A", "abc")
@@ -82,7 +82,9 @@ def test_rect_and_mask_creation_on_success(mock_dependencies):
     llama = main.Llama()
     mock_loaded_surface.get_rect.assert_called_once()
     assert llama.rect is mock_rect
-    mock_mask_func.assert_called_once_with(mock_loaded_surface)
+    mock_mask_func.assert_called_once_with(
+        mock_loaded_surface, constants.MASK_ALPHA_THRESHOLD
+    )
     assert llama.mask is mock_mask_instance
 
 def test_rect_and_mask_creation_on_failure(mock_dependencies):
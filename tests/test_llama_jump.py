@@ -27,7 +27,7 @@ def llama_instance():
 
         # Mock mask creation
         dummy_mask = pygame.mask.Mask((40, 60))
-        pygame.mask.from_surface = lambda surface: dummy_mask
+        pygame.mask.from_surface = lambda surface, threshold=127: dummy_mask
 
         llama = Llama()
         # Ensure initial state is consistent if needed (though jump doesn't depend on pos)
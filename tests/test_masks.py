@@ -0,0 +1,100 @@
+import os
+import shutil
+
+import pytest
+import pygame
+from unittest.mock import patch
+
+import constants
+import masks
+
+
+@pytest.fixture(autouse=True)
+def enable_mask_files(monkeypatch):
+    """These tests exercise the on-disk cache, so turn it back on."""
+    monkeypatch.setattr(constants, 'MASK_CACHE_ENABLED', True)
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    """Copies the player image so masks are written next to the copy."""
+    path = str(tmp_path / "Llama.png")
+    shutil.copy(constants.PLAYER_IMAGE, path)
+    return path
+
+
+def load_surface(path):
+    return pygame.image.load(path)
+
+
+def masks_equal(first, second):
+    if first.get_size() != second.get_size():
+        return False
+    return first.overlap_area(second, (0, 0)) == first.count() == second.count()
+
+
+def test_mask_written_next_to_image(image_path):
+    """Building a mask stores it beside its source image."""
+    masks.load_mask(load_surface(image_path), image_path, 127)
+    assert os.path.isfile(masks.mask_path(image_path, 127))
+
+
+def test_stored_mask_loaded_without_rebuilding(image_path):
+    """A stored mask is read back without calling from_surface."""
+    surface = load_surface(image_path)
+    built = masks.load_mask(surface, image_path, 127)
+    masks.clear()
+
+    with patch('pygame.mask.from_surface') as mock_from_surface:
+        loaded = masks.load_mask(surface, image_path, 127)
+
+    mock_from_surface.assert_not_called()
+    assert loaded is not built
+    assert masks_equal(loaded, pygame.mask.from_surface(surface, 127))
+
+
+def test_same_image_shares_one_mask(image_path):
+    """Masks are kept in memory and shared within a session."""
+    surface = load_surface(image_path)
+    assert masks.load_mask(surface, image_path) is masks.load_mask(surface, image_path)
+
+
+def test_threshold_is_part_of_the_key(image_path):
+    """Each alpha threshold gets its own stored mask."""
+    surface = load_surface(image_path)
+    masks.load_mask(surface, image_path, 10)
+    masks.load_mask(surface, image_path, 200)
+    assert os.path.isfile(masks.mask_path(image_path, 10))
+    assert os.path.isfile(masks.mask_path(image_path, 200))
+
+
+def test_changed_image_rebuilds_mask(image_path):
+    """Editing the source image makes the stored mask stale."""
+    masks.load_mask(load_surface(image_path), image_path, 127)
+    masks.clear()
+
+    # Replace the image with a fully solid one
+    solid = pygame.Surface((20, 10), pygame.SRCALPHA)
+    solid.fill((255, 0, 0, 255))
+    pygame.image.save(solid, image_path)
+
+    mask = masks.load_mask(load_surface(image_path), image_path, 127)
+    assert mask.get_size() == (20, 10)
+    assert mask.count() == 200
+
+
+def test_corrupt_mask_file_is_rebuilt(image_path):
+    """An unreadable mask file is replaced rather than used."""
+    with open(masks.mask_path(image_path, 127), "wb") as mask_file:
+        mask_file.write(b"garbage")
+
+    surface = load_surface(image_path)
+    mask = masks.load_mask(surface, image_path, 127)
+    assert masks_equal(mask, pygame.mask.from_surface(surface, 127))
+
+
+def test_disabled_cache_writes_nothing(image_path, monkeypatch):
+    """With the cache disabled no mask files are written."""
+    monkeypatch.setattr(constants, 'MASK_CACHE_ENABLED', False)
+    masks.load_mask(load_surface(image_path), image_path, 127)
+    assert not os.path.exists(masks.mask_path(image_path, 127))
@@ -7,6 +7,7 @@ import random
 # Corrected Obstacle class structure assumed for testing
 from main import Obstacle
 import constants
+import obstacles
 
 # Minimal Pygame setup fixture if needed
 @pytest.fixture(scope="module", autouse=True)
@@ -115,7 +116,9 @@ def test_init_rect_and_mask_creation(mock_randint, mock_from_surface, mock_load,
     obstacle_success = Obstacle(speed=5)
 
     mock_converted_surface.get_rect.assert_called_once()
-    mock_from_surface.assert_called_with(mock_converted_surface)
+    mock_from_surface.assert_called_with(
+        mock_converted_surface, constants.MASK_ALPHA_THRESHOLD
+    )
     assert obstacle_success.rect == mock_rect_success
     assert obstacle_success.mask == mock_mask_success
 
@@ -126,6 +129,8 @@ def test_init_rect_and_mask_creation(mock_randint, mock_from_surface, mock_load,
     mock_converted_surface.reset_mock() # Reset mocks on the temp surfaces too
     mock_loaded_surface.reset_mock()
     mock_randint.reset_mock()
+    # Forget the variant built by the success path so it is loaded again
+    obstacles.clear()
 
     # --- Failure/Fallback Path ---
     mock_load.side_effect = pygame.error("Load failed again")
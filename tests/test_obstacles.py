@@ -0,0 +1,156 @@
+import pygame
+import pytest
+
+import constants
+import main
+import obstacles
+
+
+# Images are converted to a display format, so every test needs one
+pytestmark = pytest.mark.usefixtures("display")
+
+
+def test_variants_are_scaled_and_composed():
+    """Each variant's image is its source scaled and repeated."""
+    for variant_id, variant in constants.OBSTACLE_VARIANTS.items():
+        path, scale, copies, weight, lanes = variant
+        width, height = pygame.image.load(path).get_size()
+        image, mask = obstacles.load_variant(variant_id)
+        assert image.get_size() == (
+            int(width * scale[0]) * copies,
+            int(height * scale[1]),
+        )
+        assert mask.get_size() == image.get_size()
+        assert mask.count() > 0
+
+
+def test_variants_are_built_once(mocker):
+    """Spawning an obstacle scales no images and builds no masks."""
+    assert obstacles.load_variants()
+    scale = mocker.spy(pygame.transform, "scale_by")
+    from_surface = mocker.spy(pygame.mask, "from_surface")
+    for variant_id in constants.OBSTACLE_VARIANTS:
+        first = main.Obstacle(5, variant_id)
+        second = main.Obstacle(5, variant_id)
+        assert first.image is second.image
+        assert first.mask is second.mask
+    scale.assert_not_called()
+    from_surface.assert_not_called()
+
+
+def test_double_is_two_cacti():
+    """A double is two copies of the small cactus side by side."""
+    small, small_mask = obstacles.load_variant("small")
+    double, double_mask = obstacles.load_variant("double")
+    width = small.get_width()
+    assert double_mask.overlap_area(small_mask, (0, 0)) == small_mask.count()
+    assert double_mask.count() == 2 * small_mask.count()
+    assert double.get_at((width + 16, 16)) == small.get_at((16, 16))
+
+
+def test_pick_variant_follows_weights(mocker):
+    """Variants are chosen by id in proportion to their weights."""
+    choices = mocker.spy(obstacles.random, "choices")
+    assert obstacles.pick_variant() in constants.OBSTACLE_VARIANTS
+    variant_ids, weights = choices.call_args.args
+    assert variant_ids == list(constants.OBSTACLE_VARIANTS)
+    assert weights == [v[3] for v in constants.OBSTACLE_VARIANTS.values()]
+
+
+def test_obstacles_are_placed_in_their_lanes():
+    """Each obstacle's bottom is at one of its variant's lane heights."""
+    for variant_id, variant in constants.OBSTACLE_VARIANTS.items():
+        for _ in range(10):
+            obstacle = main.Obstacle(5, variant_id)
+            assert obstacle.lane in variant[4]
+            assert obstacle.rect.bottom == constants.GROUND_Y - obstacle.lane
+            assert obstacle.rect.left > constants.WINDOW_WIDTH
+
+
+def obstacle_at(x, lane, width=20, height=20):
+    """A stand-in obstacle of the given size at x in a lane."""
+    obstacle = pygame.sprite.Sprite()
+    obstacle.lane = lane
+    obstacle.rect = pygame.Rect(0, 0, width, height)
+    obstacle.rect.bottomleft = (x, constants.GROUND_Y - lane)
+    return obstacle
+
+
+def test_lane_index_finds_obstacles_near_the_rect():
+    """Only obstacles in overlapping lanes and near in x are candidates."""
+    index = obstacles.LaneIndex()
+    near = obstacle_at(100, 0)
+    behind = obstacle_at(60, 0)
+    ahead = obstacle_at(300, 0)
+    low_flyer = obstacle_at(110, 12)
+    high_flyer = obstacle_at(100, 90)
+    for obstacle in (ahead, high_flyer, near, behind, low_flyer):
+        index.add(obstacle)
+
+    llama = pygame.Rect(90, constants.GROUND_Y - 32, 32, 32)
+    assert index.candidates(llama) == [low_flyer, near]
+    # The obstacle wholly left of the llama has been dropped
+    assert behind not in index.lanes[0]
+
+    # In the air the llama reaches the high lane and leaves the ground lane
+    llama.bottom = constants.GROUND_Y - 95
+    assert index.candidates(llama) == [high_flyer]
+
+
+def test_lane_index_keeps_x_order_as_obstacles_move():
+    """Moving obstacles in step keeps each lane in x order."""
+    index = obstacles.LaneIndex()
+    lane = [obstacle_at(x, 0) for x in (500, 200, 350)]
+    for obstacle in lane:
+        index.add(obstacle)
+    llama = pygame.Rect(0, constants.GROUND_Y - 32, 1000, 32)
+    assert index.candidates(llama) == sorted(lane, key=lambda o: o.rect.x)
+    for obstacle in lane:
+        obstacle.rect.x -= 150
+    llama.width = 100
+    assert index.candidates(llama) == [lane[1]]
+    index.clear()
+    assert index.candidates(llama) == []
+
+
+def test_game_checks_only_candidates(game, mocker):
+    """Collisions are tested against the llama's lane candidates only."""
+    for _ in range(20):
+        game._spawn_obstacle()
+    mask_test = mocker.spy(pygame.sprite, "collide_mask")
+    game._check_collisions()
+    # Every obstacle is still off-screen to the right
+    mask_test.assert_not_called()
+
+    # One obstacle moved onto the llama is the only one tested and hit
+    obstacle = main.Obstacle(0)
+    obstacle.rect.midbottom = game.llama.rect.midbottom
+    game.obstacles.add(obstacle)
+    game.obstacle_lanes.add(obstacle)
+    game._check_collisions()
+    assert mask_test.call_count == 1
+    assert game.game_over
+
+
+def test_a_failed_variant_does_not_stop_the_rest(mocker, capsys):
+    """Each variant is built on its own; one that fails is reported once
+    and shares a fallback shape."""
+    build = obstacles._build_variant
+
+    def fail_small(variant_id):
+        if variant_id == "small":
+            raise pygame.error("missing image")
+        return build(variant_id)
+
+    mocker.patch("obstacles._build_variant", side_effect=fail_small)
+    assert not obstacles.load_variants()
+    assert set(obstacles._variants) == set(constants.OBSTACLE_VARIANTS)
+    assert capsys.readouterr().out.count("missing image") == 1
+
+    from_surface = mocker.spy(pygame.mask, "from_surface")
+    first = main.Obstacle(5, "small")
+    second = main.Obstacle(5, "small")
+    assert first.image is second.image
+    assert first.image.get_size() == (25, 50)
+    from_surface.assert_not_called()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,79 @@
+import pygame
+import pytest
+
+import constants
+import parallax
+
+
+# Images are converted to a display format, so every test needs one
+pytestmark = pytest.mark.usefixtures("display")
+
+
+def test_layers_are_built_once():
+    """The tiles are drawn on the first request and then shared."""
+    first = parallax.load_layers()
+    assert parallax.load_layers() is first
+    assert len(first) == len(constants.PARALLAX_LAYERS)
+
+
+def test_layers_need_no_per_pixel_alpha():
+    """The sky is opaque; clouds and hills use an RLE colorkey."""
+    sky, clouds, hills = parallax.load_layers()
+    assert sky.opaque
+    assert sky.image.get_colorkey() is None
+    for layer in (clouds, hills):
+        assert not layer.opaque
+        assert layer.image.get_colorkey() == constants.COLORKEY + (255,)
+        assert layer.image.get_flags() & pygame.RLEACCELOK
+    for layer in (sky, clouds, hills):
+        assert not layer.image.get_flags() & pygame.SRCALPHA
+        assert layer.image.get_width() >= constants.WINDOW_WIDTH
+
+
+def test_each_layer_costs_two_blits_at_most(mocker):
+    """Whatever the distance, a layer is drawn with one or two blits."""
+    renderer = mocker.Mock()
+    for layer in parallax.load_layers():
+        for distance in (0, 1, 450, 2999, 12345):
+            renderer.reset_mock()
+            layer.draw(renderer, distance)
+            assert 1 <= renderer.blit.call_count <= 2
+
+
+def test_layers_scroll_at_their_own_speed(mocker):
+    """A layer is offset by its share of the distance scrolled."""
+    renderer = mocker.Mock()
+    layer = parallax.ParallaxLayer(pygame.Surface((1000, 10)), 0.25, 30, True)
+    layer.draw(renderer, 400)
+    image, position, area = renderer.blit.call_args_list[0].args
+    assert position == (0, 30)
+    assert area.x == 100
+
+
+def test_only_the_sky_covers_the_window():
+    """The opaque sky hides the whole window; the other layers do not."""
+    sky, clouds, hills = parallax.load_layers()
+    size = (constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT)
+    assert sky.covers(*size)
+    assert not clouds.covers(*size)
+    assert not hills.covers(*size)
+    short = parallax.ParallaxLayer(pygame.Surface((1000, 10)), 0, 0, True)
+    assert not short.covers(*size)
+
+
+def test_clear_forgets_layers():
+    """Layers are rebuilt after the cache is cleared."""
+    first = parallax.load_layers()
+    parallax.clear()
+    assert parallax.load_layers() is not first
+
+
+def test_game_skips_the_hidden_clear(game, mocker):
+    """With the sky drawn first, the playfield is not cleared as well."""
+    clear = mocker.spy(game.renderer, "clear")
+    game._draw_playfield()
+    clear.assert_not_called()
+    game.background_layers = []
+    game.clear_playfield = True
+    game._draw_playfield()
+    clear.assert_called_once_with(constants.WHITE)
@@ -0,0 +1,283 @@
+import pygame
+import pytest
+
+import constants
+import main
+import physics
+
+
+def integrate_jump(gravity, jump_speed, ground_y, frames):
+    """Llama.update's integration of a jump from the ground, frame by frame."""
+    bottom = ground_y
+    velocity = jump_speed
+    bottoms = []
+    for _ in range(frames):
+        velocity += gravity
+        bottom += int(velocity)
+        if bottom >= ground_y:
+            bottom = ground_y
+            velocity = 0
+        bottoms.append(bottom)
+    return bottoms
+
+
+@pytest.fixture
+def llama():
+    """A llama standing on the ground, with a plain image."""
+    image = pygame.Surface((20, 30))
+    llama = main.Llama(((image, pygame.Mask((20, 30), True)),))
+    llama.reset()
+    return llama
+
+
+@pytest.mark.parametrize(
+    "gravity, jump_speed", [(1.5, -20), (2, -15), (0.7, -9.5), (3, -2)]
+)
+def test_arc_matches_integrating(monkeypatch, gravity, jump_speed):
+    """The table holds exactly the positions integrating would give."""
+    monkeypatch.setattr(constants, "GRAVITY", gravity)
+    monkeypatch.setattr(constants, "JUMP_SPEED", jump_speed)
+    arc = physics.jump_arc()
+    frames = arc.landing_frame + 5
+    expected = integrate_jump(gravity, jump_speed, constants.GROUND_Y, frames)
+    assert [arc.bottom_at(frame) for frame in range(1, frames + 1)] == (
+        expected
+    )
+    assert arc.bottoms[arc.landing_frame] == constants.GROUND_Y
+    assert all(b < constants.GROUND_Y for b in arc.bottoms[1:-1])
+
+
+def test_arc_is_worked_out_once(monkeypatch):
+    """The arc is shared until one of its constants changes."""
+    arc = physics.jump_arc()
+    assert physics.jump_arc() is arc
+    monkeypatch.setattr(constants, "JUMP_SPEED", -10)
+    assert physics.jump_arc() is not arc
+    assert physics.jump_arc().landing_frame < arc.landing_frame
+
+
+def test_no_arc_without_gravity(monkeypatch):
+    """Without gravity there is no landing, so no table."""
+    monkeypatch.setattr(constants, "GRAVITY", 0)
+    assert physics.jump_arc() is None
+
+
+def test_height_at():
+    """Heights are measured up from the ground and end at zero."""
+    arc = physics.jump_arc()
+    apex = max(arc.height_at(frame) for frame in range(arc.landing_frame))
+    assert apex == constants.GROUND_Y - min(arc.bottoms)
+    assert arc.height_at(0) == 0
+    assert arc.height_at(arc.landing_frame + 100) == 0
+
+
+def test_llama_follows_the_arc(llama):
+    """A jump from the ground moves the llama along the table and lands."""
+    arc = physics.jump_arc()
+    llama.jump()
+    assert llama.jump_arc is arc
+    for frame in range(1, arc.landing_frame + 1):
+        llama.update()
+        assert llama.rect.bottom == arc.bottoms[frame]
+    assert not llama.is_jumping
+    assert llama.velocity_y == 0
+    assert llama.jump_arc is None
+
+    # Back on the ground it can jump again
+    llama.update()
+    llama.jump()
+    assert llama.is_jumping
+
+
+def test_llama_off_the_ground_integrates(llama):
+    """A jump from anywhere but the ground is integrated as before."""
+    llama.rect.bottom = constants.GROUND_Y - 10
+    llama.jump()
+    assert llama.jump_arc is None
+    llama.update()
+    assert llama.rect.bottom == (
+        constants.GROUND_Y - 10 + int(constants.JUMP_SPEED + constants.GRAVITY)
+    )
+
+
+def float_fall(bottom, velocity, gravity, ground_y):
+    """One step of Llama.update's float physics."""
+    velocity += gravity
+    bottom += int(velocity)
+    if bottom >= ground_y:
+        return ground_y, 0, True
+    return bottom, velocity, False
+
+
+def test_whole_pixels_rounds_towards_zero():
+    """Whole pixels of a sub-pixel value match int() of the float."""
+    subpixels = constants.PHYSICS_SUBPIXELS
+    for value in range(-3 * subpixels, 3 * subpixels):
+        assert physics.whole_pixels(value) == int(value / subpixels)
+
+
+@pytest.mark.parametrize("gravity", [1.5, 0.25, 2, 0.75])
+def test_fixed_fall_conforms_to_float_physics(gravity):
+    """Every fixed point step matches the float step it replaces."""
+    subpixels = constants.PHYSICS_SUBPIXELS
+    fixed_gravity = physics.to_fixed(gravity)
+    for bottom in (constants.GROUND_Y - 150, constants.GROUND_Y - 3):
+        for velocity in range(-30 * subpixels, 10 * subpixels, 37):
+            fixed = physics.fixed_fall(
+                bottom, velocity, fixed_gravity, constants.GROUND_Y
+            )
+            expected = float_fall(
+                bottom, velocity / subpixels, gravity, constants.GROUND_Y
+            )
+            assert fixed[0] == expected[0]
+            assert fixed[1] / subpixels == expected[1]
+            assert bool(fixed[2]) == expected[2]
+
+
+def test_fixed_arc_matches_float_arc(monkeypatch):
+    """With the current constants both modes give the same jump."""
+    float_arc = physics.jump_arc()
+    monkeypatch.setattr(constants, "FIXED_POINT_PHYSICS", True)
+    fixed_arc = physics.jump_arc()
+    assert fixed_arc is not float_arc
+    assert fixed_arc.bottoms == float_arc.bottoms
+    assert fixed_arc.velocities == float_arc.velocities
+
+
+def test_fixed_llama_integrates_like_float(llama, monkeypatch):
+    """A fixed point jump off the ground follows the float path."""
+    bottoms = {}
+    for fixed_point in (False, True):
+        monkeypatch.setattr(constants, "FIXED_POINT_PHYSICS", fixed_point)
+        llama.reset()
+        llama.rect.bottom = constants.GROUND_Y - 40
+        llama.jump()
+        bottoms[fixed_point] = []
+        for _ in range(40):
+            llama.update()
+            bottoms[fixed_point].append(llama.rect.bottom)
+        assert not llama.is_jumping
+    assert bottoms[True] == bottoms[False]
+
+
+def test_fixed_obstacles_keep_sub_pixels(monkeypatch):
+    """Fractional speeds add up exactly instead of being truncated."""
+    monkeypatch.setattr(constants, "FIXED_POINT_PHYSICS", True)
+    obstacle = main.Obstacle(2.5)
+    obstacle.rect.x = 500
+    xs = []
+    for _ in range(4):
+        obstacle.update()
+        xs.append(obstacle.rect.x)
+    assert xs == [497, 495, 492, 490]
+
+
+def run_game(make_game, frames=400):
+    """Positions of the llama and obstacles over a seeded run of the game."""
+    main.random.seed(1234)
+    game = make_game()
+    positions = []
+    for frame in range(frames):
+        if frame % 60 == 0:
+            game._spawn_obstacle()
+        if frame % 45 == 5:
+            game.llama.jump()
+        game._update()
+        positions.append(
+            (
+                game.llama.rect.bottom,
+                [obstacle.rect.topleft for obstacle in game.obstacles],
+            )
+        )
+    return positions
+
+
+def test_fixed_game_conforms_to_float_game(make_game, monkeypatch):
+    """A whole run of the game is the same in both modes."""
+    float_run = run_game(make_game)
+    monkeypatch.setattr(constants, "FIXED_POINT_PHYSICS", True)
+    physics.clear()
+    assert run_game(make_game) == float_run
+
+
+class Elementwise:
+    """A minimal integer array that applies each operator element by
+    element, so the array path runs without NumPy."""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def apply(self, other, op):
+        if isinstance(other, Elementwise):
+            others = other.values
+        else:
+            others = [other] * len(self.values)
+        return Elementwise(op(a, b) for a, b in zip(self.values, others))
+
+    def __add__(self, other):
+        return self.apply(other, lambda a, b: a + b)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.apply(other, lambda a, b: a - b)
+
+    def __rsub__(self, other):
+        return self.apply(other, lambda a, b: b - a)
+
+    def __mul__(self, other):
+        return self.apply(other, lambda a, b: a * b)
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        return self.apply(other, lambda a, b: a // b)
+
+    def __mod__(self, other):
+        return self.apply(other, lambda a, b: a % b)
+
+    def __lt__(self, other):
+        return self.apply(other, lambda a, b: a < b)
+
+    def __ge__(self, other):
+        return self.apply(other, lambda a, b: a >= b)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def tolist(self):
+        return list(self.values)
+
+
+@pytest.fixture(params=["elementwise", "numpy"])
+def array(request):
+    """Builds integer arrays with the stand-in above, or with NumPy when it
+    is installed."""
+    if request.param == "numpy":
+        numpy = pytest.importorskip("numpy")
+        return numpy.array
+    return Elementwise
+
+
+def test_fixed_steps_vectorize(array):
+    """The fixed point steps run element by element on integer arrays."""
+    subpixels = constants.PHYSICS_SUBPIXELS
+    velocities = array(range(-30 * subpixels, 10 * subpixels, 37))
+    bottoms = array([constants.GROUND_Y - 5] * len(velocities.tolist()))
+    gravity = physics.to_fixed(constants.GRAVITY)
+    new_bottoms, new_velocities, landed = physics.fixed_fall(
+        bottoms, velocities, gravity, constants.GROUND_Y
+    )
+    for index, velocity in enumerate(velocities.tolist()):
+        bottom, velocity, on_ground = physics.fixed_fall(
+            constants.GROUND_Y - 5, velocity, gravity, constants.GROUND_Y
+        )
+        assert new_bottoms[index] == bottom
+        assert new_velocities[index] == velocity
+        assert landed[index] == on_ground
+
+    xs, remainders = physics.fixed_move(
+        array([500, 10, -5]), array([0, 100, 255]), 640
+    )
+    assert xs.tolist() == [497, 7, -7]
+    assert remainders.tolist() == [128, 228, 127]
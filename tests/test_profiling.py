@@ -0,0 +1,102 @@
+import pytest
+import pygame
+from unittest.mock import patch
+
+from profiling import DurationStats, LatencyTracker, StartupTimer
+
+
+@pytest.fixture
+def timer():
+    """Provides a StartupTimer driven by a fake perf_counter."""
+    with patch('profiling.time.perf_counter', side_effect=[0.0, 0.25, 0.5, 1.0]):
+        timer = StartupTimer()
+        timer.mark("display")
+        timer.mark("fonts")
+        timer.finish()
+    return timer
+
+
+def test_phases_recorded_in_order(timer):
+    """Each mark records the time since the previous mark."""
+    assert timer.phases == [
+        ("display", 0.25),
+        ("fonts", 0.25),
+        ("first frame", 0.5),
+    ]
+
+
+def test_total_is_time_to_first_frame(timer):
+    """The total covers every phase up to the first frame."""
+    assert timer.total() == pytest.approx(1.0)
+
+
+def test_finish_only_records_once(timer):
+    """Calling finish again does not add another phase."""
+    timer.finish()
+    assert timer.finished is True
+    assert len(timer.phases) == 3
+
+
+def test_report_lists_each_phase(timer):
+    """The report contains a line per phase plus the total."""
+    report = timer.report()
+    assert "display" in report
+    assert "first frame" in report
+    assert "1000.00 ms" in report
+
+
+def test_duration_stats_percentiles():
+    """Percentiles use the nearest rank of the recorded durations."""
+    stats = DurationStats("Events")
+    for duration in range(1, 101):
+        stats.add(duration / 1000)
+    assert stats.mean() == pytest.approx(0.0505)
+    assert stats.percentile(50) == pytest.approx(0.050)
+    assert stats.percentile(95) == pytest.approx(0.095)
+    assert stats.percentile(100) == pytest.approx(0.100)
+
+
+def test_duration_stats_report():
+    """The report summarises the durations in milliseconds."""
+    stats = DurationStats("Events")
+    assert stats.report() == "Events: no samples"
+    stats.add(0.002)
+    report = stats.report()
+    assert report.startswith("Events: 1 samples")
+    assert "p99 2.000 ms" in report
+
+
+def test_latency_tracker_times_first_input_per_frame():
+    """Only the first input before a frame is presented is timed."""
+    tracker = LatencyTracker("Jump")
+    tracker.input(1.0, 0.95)
+    tracker.input(1.01)
+    tracker.presented(1.05)
+    # A frame with no pending input records nothing
+    tracker.presented(1.1)
+    assert tracker.latency.samples == [pytest.approx(0.05)]
+    assert tracker.worst_case.samples == [pytest.approx(0.1)]
+
+
+def test_latency_tracker_export(tmp_path):
+    """Samples are written as CSV in milliseconds."""
+    tracker = LatencyTracker("Jump")
+    tracker.input(1.0)
+    tracker.presented(1.04)
+    path = tmp_path / "latency.csv"
+    tracker.export(path)
+    assert path.read_text().splitlines() == [
+        "latency_ms,worst_case_ms",
+        "40.000,40.000",
+    ]
+
+
+def test_game_initialises_only_the_display(mocker, make_game):
+    """A Game starts the display but never pygame.init() or the mixer."""
+    init = mocker.spy(pygame, 'init')
+    mixer_init = mocker.spy(pygame.mixer, 'init')
+    display_init = mocker.spy(pygame.display, 'init')
+    make_game()
+    init.assert_not_called()
+    mixer_init.assert_not_called()
+    display_init.assert_called_once_with()
@@ -0,0 +1,124 @@
+import pygame
+import pytest
+
+import constants
+import main
+import rendering
+from canvas import Canvas
+
+
+@pytest.fixture
+def backend():
+    """A pygame backend drawing onto an unscaled software canvas."""
+    pygame.display.init()
+    backend = rendering.PygameBackend(Canvas(scaling="none"))
+    yield backend
+    backend.close()
+    pygame.display.quit()
+
+
+def test_create_backend_null():
+    """The null backend has no screen and is headless."""
+    backend = rendering.create_backend("null")
+    assert isinstance(backend, rendering.NullBackend)
+    assert backend.headless
+    assert backend.screen is None
+
+
+def test_null_backend_blit_returns_empty_rect():
+    """Blits report an empty rect, as nothing was drawn."""
+    backend = rendering.NullBackend()
+    assert backend.blit(pygame.Surface((5, 5)), (1, 1)) == pygame.Rect(
+        0, 0, 0, 0
+    )
+
+
+def test_pygame_backend_draws_onto_canvas(backend):
+    """Clears, fills and blits reach the canvas surface."""
+    image = pygame.Surface((10, 10))
+    image.fill(constants.RED)
+    backend.clear(constants.WHITE)
+    backend.blit(image, (20, 20))
+    backend.fill_rect(constants.BLUE, pygame.Rect(50, 50, 5, 5))
+    assert backend.screen.get_at((0, 0))[:3] == constants.WHITE
+    assert backend.screen.get_at((25, 25))[:3] == constants.RED
+    assert backend.screen.get_at((52, 52))[:3] == constants.BLUE
+
+
+def test_pygame_backend_centres_text(backend, mocker):
+    """Text is rendered through the text cache, centred on the point."""
+    text = pygame.Surface((40, 10))
+    text.fill(constants.RED)
+    render = mocker.patch("text_cache.render", return_value=text)
+    font = mocker.Mock()
+    backend.clear(constants.WHITE)
+    backend.draw_text(font, "Hello", constants.BLACK, (100, 50))
+    render.assert_called_once_with(font, "Hello", True, constants.BLACK)
+    assert backend.screen.get_at((80, 45))[:3] == constants.RED
+    assert backend.screen.get_at((119, 54))[:3] == constants.RED
+    assert backend.screen.get_at((79, 45))[:3] == constants.WHITE
+    assert backend.screen.get_at((120, 54))[:3] == constants.WHITE
+
+
+def test_pygame_backend_draws_sprites(backend, mocker):
+    """Sprite groups draw themselves onto the canvas surface."""
+    group = mocker.Mock()
+    backend.draw_sprites(group)
+    group.draw.assert_called_once_with(backend.screen)
+
+
+def test_render_backend_is_abstract():
+    """A backend has to implement every drawing method."""
+    with pytest.raises(TypeError):
+        rendering.RenderBackend()
+
+    class PartialBackend(rendering.RenderBackend):
+        def clear(self, color):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+def test_scoreboard_draws_through_the_renderer(backend, mocker):
+    """The score is blitted by the backend, re-rendered only if it changed."""
+    scoreboard = main.Scoreboard()
+    blit = mocker.spy(backend, "blit")
+    render = mocker.spy(scoreboard, "_render_text")
+    scoreboard.update(1000, 0)
+    render.assert_not_called()
+    scoreboard.draw(backend)
+    scoreboard.draw(backend)
+    assert render.call_count == 1
+    assert blit.call_args.args == (scoreboard.image, scoreboard.rect)
+    assert scoreboard.rendered_score == 100
+
+
+def test_game_runs_headless(make_game, monkeypatch, mocker):
+    """The real game loop runs on the null backend without a window."""
+    monkeypatch.setattr(constants, "RENDER_BACKEND", "null")
+    monkeypatch.setattr(constants, "HIGH_SCORE_BACKEND", "json")
+    game = make_game()
+    assert isinstance(game.renderer, rendering.NullBackend)
+    assert pygame.display.get_surface() is None
+
+    frames = []
+    update = game._update
+
+    def counted_update():
+        # Jump once, then quit after a few frames
+        update()
+        frames.append(game.scoreboard.score)
+        if len(frames) == 1:
+            game.llama.jump()
+        if len(frames) == 10:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    game._update = counted_update
+    render = mocker.spy(game.scoreboard, "_render_text")
+    with pytest.raises(SystemExit):
+        game.run()
+    assert len(frames) >= 10
+    assert frames[-1] > frames[0]
+    # Nothing is drawn, so the score is never rasterized
+    render.assert_not_called()
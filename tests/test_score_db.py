@@ -0,0 +1,186 @@
+import json
+
+import pytest
+
+from score_db import SQLiteLeaderboard, import_json
+
+
+@pytest.fixture
+def board(tmp_path):
+    """A leaderboard stored in a temporary database."""
+    leaderboard = SQLiteLeaderboard(str(tmp_path / "scores.db"), capacity=3)
+    yield leaderboard
+    leaderboard.close()
+
+
+def test_indexes_exist(board):
+    """The score and name indexes are created with the table."""
+    names = {
+        row[0]
+        for row in board.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {"idx_scores_score", "idx_scores_name"} <= names
+
+
+def test_add_orders_scores_and_ties(board):
+    """Scores are ranked highest first, equal scores by arrival."""
+    assert board.add("A", 50) == 0
+    assert board.add("B", 100) == 0
+    assert board.add("C", 50) == 2
+    assert list(board) == [("B", 100), ("A", 50), ("C", 50)]
+
+
+def test_scores_below_the_board_are_still_stored(board):
+    """Every score is kept even when it misses the board."""
+    for index, score in enumerate([30, 20, 10]):
+        board.add(f"P{index}", score)
+    assert board.add("Low", 5) is None
+    assert len(board) == 3
+    assert board.total() == 4
+    board.save()
+    assert board.writer.flush(timeout=5)
+    assert board.top(2, offset=3) == [("Low", 5)]
+
+
+def test_scores_are_written_on_the_writer_thread(board):
+    """Adding only touches memory; saving hands the inserts to the writer."""
+    board.add("A", 30)
+    board.add("B", 20)
+    stored = "SELECT COUNT(*) FROM scores"
+    assert board.connection.execute(stored).fetchone()[0] == 0
+    board.save()
+    assert board.writer.flush(timeout=5)
+    assert board.connection.execute(stored).fetchone()[0] == 2
+    # Both scores went in one batch
+    assert board.writer.writes == 1
+    assert board.top(2, offset=0) == [("A", 30), ("B", 20)]
+
+
+def test_queries_include_scores_not_stored_yet(board):
+    """Lookups below the board wait for the scores the writer still holds."""
+    for index, score in enumerate([40, 30, 20, 10]):
+        board.add(f"P{index}", score)
+    board.add("P0", 5)
+    assert board.top(2, offset=3) == [("P3", 10), ("P0", 5)]
+    assert board.page(1, 3) == [("P3", 10), ("P0", 5)]
+    board.add("P3", 50)
+    assert board.player_best("P3") == 50
+    assert board.player_bests(2) == [("P3", 50), ("P0", 40)]
+
+
+def block_inserts(connection, blocked):
+    """Makes every insert into the scores table fail while blocked is set."""
+    connection.executescript(
+        "CREATE TABLE IF NOT EXISTS blocked (flag INTEGER);"
+        "CREATE TRIGGER IF NOT EXISTS block_inserts BEFORE INSERT ON scores"
+        " WHEN EXISTS (SELECT 1 FROM blocked)"
+        " BEGIN SELECT RAISE(ABORT, 'inserts blocked'); END;"
+    )
+    with connection:
+        connection.execute("DELETE FROM blocked")
+        if blocked:
+            connection.execute("INSERT INTO blocked VALUES (1)")
+
+
+def test_failed_inserts_are_reported_and_retried(board):
+    """Rows the writer could not insert are reported and stored later."""
+    block_inserts(board.connection, True)
+    board.add("A", 30)
+    board.save()
+    assert board.writer.flush(timeout=5)
+    assert "inserts blocked" in board.save_error()
+    assert board.unstored == [("A", 30)]
+
+    block_inserts(board.connection, False)
+    board.add("B", 20)
+    board.save()
+    assert board.writer.flush(timeout=5)
+    assert board.save_error() is None
+    stored = "SELECT name, score FROM scores ORDER BY id"
+    assert board.connection.execute(stored).fetchall() == [
+        ("A", 30),
+        ("B", 20),
+    ]
+
+
+def test_close_retries_failed_inserts(tmp_path):
+    """Closing makes one last attempt at rows that failed to insert."""
+    path = str(tmp_path / "scores.db")
+    first = SQLiteLeaderboard(path)
+    block_inserts(first.connection, True)
+    first.add("A", 42)
+    first.save()
+    assert first.writer.flush(timeout=5)
+    block_inserts(first.connection, False)
+    first.close()
+    second = SQLiteLeaderboard(path)
+    assert list(second) == [("A", 42)]
+    second.close()
+
+
+def test_close_saves_unsaved_scores(tmp_path):
+    """Closing stores the scores added since the last save."""
+    path = str(tmp_path / "scores.db")
+    first = SQLiteLeaderboard(path)
+    first.add("A", 42)
+    first.add("B", 7)
+    first.close()
+    second = SQLiteLeaderboard(path)
+    assert list(second) == [("A", 42), ("B", 7)]
+    assert second.total() == 2
+    second.close()
+
+
+def test_is_eligible_uses_threshold(board):
+    """Eligibility compares against the lowest score on a full board."""
+    board.add("A", 30)
+    board.add("B", 20)
+    assert board.is_eligible(1)
+    board.add("C", 10)
+    assert board.threshold == 10
+    assert not board.is_eligible(10)
+    assert board.is_eligible(11)
+
+
+def test_page(board):
+    """Pages step through every stored score."""
+    board.add_many((f"P{i}", i) for i in range(7))
+    assert board.page(0, 3) == [("P6", 6), ("P5", 5), ("P4", 4)]
+    assert board.page(2, 3) == [("P0", 0)]
+
+
+def test_player_bests(board):
+    """Each player's best score can be looked up."""
+    board.add_many([("A", 5), ("B", 7), ("A", 9), ("B", 1)])
+    assert board.player_best("A") == 9
+    assert board.player_best("Nobody") is None
+    assert board.player_bests(10) == [("A", 9), ("B", 7)]
+
+
+def test_scores_persist(tmp_path):
+    """Scores are still there after reopening the database."""
+    path = str(tmp_path / "scores.db")
+    first = SQLiteLeaderboard(path)
+    first.add("A", 42)
+    first.close()
+    second = SQLiteLeaderboard(path)
+    assert list(second) == [("A", 42)]
+    second.close()
+
+
+def test_import_json(tmp_path):
+    """The migration copies every JSON entry into the database."""
+    json_path = tmp_path / "scores.json"
+    json_path.write_text(
+        json.dumps([{"name": "A", "score": 10}, {"score": 20}])
+    )
+    db_path = str(tmp_path / "scores.db")
+    assert import_json(str(json_path), db_path) == 2
+    board = SQLiteLeaderboard(db_path)
+    assert board.to_list() == [
+        {"name": "N/A", "score": 20},
+        {"name": "A", "score": 10},
+    ]
+    board.close()
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import constants
+from leaderboard import Leaderboard
+from score_file import ScoreFile
+from score_writer import ScoreWriter
+
+
+def test_save_writes_the_board_in_the_background(tmp_path):
+    """Saving queues a copy of the board; closing waits for it."""
+    path = str(tmp_path / "scores.json")
+    scores = ScoreFile(path, ScoreWriter())
+    assert scores.add("A", 10) == 0
+    assert scores.add("B", 20) == 0
+    scores.save()
+    scores.close()
+    assert json.loads(open(path).read()) == [
+        {"name": "B", "score": 20},
+        {"name": "A", "score": 10},
+    ]
+
+
+def test_board_reads_pass_through(tmp_path):
+    """Ranking, eligibility and versions come from the board."""
+    board = Leaderboard.from_entries([("A", 5), ("B", 9)], capacity=2)
+    scores = ScoreFile(str(tmp_path / "scores.json"), ScoreWriter(), board)
+    assert list(scores) == [("B", 9), ("A", 5)]
+    assert scores[0] == ("B", 9)
+    assert len(scores) == 2
+    assert scores.top(1, offset=1) == [("A", 5)]
+    assert not scores.is_eligible(5)
+    assert scores.version == board.version
+    scores.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "journal"])
+def test_game_saves_through_every_backend(make_game, monkeypatch, backend):
+    """The game adds, saves and closes every backend the same way."""
+    monkeypatch.setattr(constants, "HIGH_SCORE_BACKEND", backend)
+    game = make_game()
+    game._add_high_score(" Al ", 42)
+    game.high_scores.close()
+    game.score_writer.close()
+
+    reloaded = make_game()
+    assert reloaded.high_scores.top(1) == [("Al", 42)]
+
+
+def test_unreadable_board_is_not_saved(tmp_path):
+    """A board that could not be loaded never writes over its file."""
+    path = tmp_path / "scores.json"
+    path.write_text("not json")
+    writer = ScoreWriter()
+    scores = ScoreFile(str(path), writer, writable=False)
+    scores.add("A", 10)
+    scores.save()
+    scores.close()
+    assert path.read_text() == "not json"
+    assert writer.writes == 0
+
+
+@pytest.mark.parametrize("contents", ["not json", '{"name": "A"}'])
+def test_game_keeps_a_file_it_cannot_read(make_game, contents):
+    """New scores are kept in memory but the unreadable file is untouched."""
+    path = Path(constants.HIGH_SCORE_FILE)
+    path.write_text(contents)
+    game = make_game()
+    game._add_high_score("Al", 42)
+    game.high_scores.close()
+    game.score_writer.close()
+    assert game.high_scores.top(1) == [("Al", 42)]
+    assert path.read_text() == contents
+
+
+def test_game_keeps_valid_entries_beside_a_bad_one(make_game):
+    """A malformed entry is dropped and the valid scores survive a save."""
+    path = Path(constants.HIGH_SCORE_FILE)
+    scores = [{"name": "A", "score": 30}, {"name": "B", "score": 20}, "oops"]
+    path.write_text(json.dumps(scores))
+    game = make_game()
+    game._add_high_score("C", 25)
+    game.high_scores.close()
+    game.score_writer.close()
+    assert json.loads(path.read_text()) == [
+        {"name": "A", "score": 30},
+        {"name": "C", "score": 25},
+        {"name": "B", "score": 20},
+    ]
+
+
+def test_save_error_reports_a_failed_write(tmp_path):
+    """A save the writer thread could not write is reported by the file."""
+    path = tmp_path / "missing" / "scores.json"
+    scores = ScoreFile(str(path), ScoreWriter())
+    assert scores.save_error() is None
+    scores.add("A", 10)
+    scores.save()
+    scores.close()
+    assert "scores.json" in scores.save_error()
+    unreadable = ScoreFile(str(path), ScoreWriter(), writable=False)
+    assert unreadable.save_error() == f"{path} could not be read"
+
+
+def test_high_score_screen_shows_a_failed_save(game, mocker):
+    """The high score screen is redrawn with a warning once a save fails."""
+    game._change_state(constants.STATE_DISPLAYING_SCORES)
+    game._draw()
+    game.needs_redraw = False
+    mocker.patch.object(game.high_scores, "save_error", return_value="full")
+    draw_text = mocker.spy(game, "_draw_text")
+    game._update()
+    assert game.needs_redraw
+    game._draw()
+    texts = [call.args[1] for call in draw_text.call_args_list]
+    assert "High scores could not be saved" in texts
@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+
+import pytest
+
+import constants
+import score_journal
+from score_journal import ScoreJournal
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Journal and snapshot paths in a temporary directory."""
+    return str(tmp_path / "scores.journal"), str(tmp_path / "snapshot.json")
+
+
+def open_journal(paths, capacity=3):
+    return ScoreJournal(paths[0], paths[1], capacity=capacity)
+
+
+def test_add_appends_one_record(paths):
+    """Each score is a single line appended to the journal."""
+    journal = open_journal(paths)
+    journal.add("A", 10)
+    journal.add("B", 20)
+    journal.close()
+    with open(paths[0]) as journal_file:
+        records = [json.loads(line) for line in journal_file]
+    assert records == [
+        {"seq": 1, "name": "A", "score": 10},
+        {"seq": 2, "name": "B", "score": 20},
+    ]
+
+
+def test_reload_rebuilds_board(paths):
+    """Replaying the journal gives back the same board."""
+    journal = open_journal(paths)
+    for index, score in enumerate([5, 40, 15, 30]):
+        journal.add(f"P{index}", score)
+    journal.close()
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("P1", 40), ("P3", 30), ("P2", 15)]
+    assert reloaded.is_eligible(16)
+    assert not reloaded.is_eligible(15)
+    reloaded.close()
+
+
+def test_truncated_last_line_is_ignored(paths):
+    """A record cut short by a crash is skipped on load."""
+    journal = open_journal(paths)
+    journal.add("A", 10)
+    journal.close()
+    with open(paths[0], "a") as journal_file:
+        journal_file.write('{"seq": 2, "name": "B", "sc')
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("A", 10)]
+    reloaded.close()
+
+
+def test_compaction_folds_journal_into_snapshot(paths, monkeypatch):
+    """Compaction writes the snapshot and empties the journal."""
+    monkeypatch.setattr(constants, "JOURNAL_COMPACT_RECORDS", 4)
+    journal = open_journal(paths)
+    for score in range(6):
+        journal.add(f"P{score}", score)
+    journal.close()
+
+    # The snapshot is taken when the records are saved, after the last
+    with open(paths[1]) as snapshot_file:
+        snapshot = json.load(snapshot_file)
+    assert snapshot["sequence"] == 6
+    assert journal._rotated_paths() == []
+    assert os.path.getsize(paths[0]) == 0
+
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("P5", 5), ("P4", 4), ("P3", 3)]
+    assert reloaded.sequence == 6
+    reloaded.close()
+
+
+def test_compaction_runs_on_the_writer_thread(paths, monkeypatch, mocker):
+    """The score that triggers compaction only queues it."""
+    monkeypatch.setattr(constants, "JOURNAL_COMPACT_RECORDS", 2)
+    threads = []
+    replace = os.replace
+
+    def record_thread(source, target):
+        threads.append(threading.current_thread())
+        replace(source, target)
+
+    mocker.patch("score_journal.os.replace", side_effect=record_thread)
+    journal = open_journal(paths)
+    journal.add("A", 10)
+    journal.add("B", 20)
+    # Nothing has touched the disk yet
+    assert not os.path.exists(paths[1])
+    assert os.path.getsize(paths[0]) == 0
+    journal.save()
+    assert journal.writer.flush(timeout=5)
+    with open(paths[1]) as snapshot_file:
+        assert json.load(snapshot_file)["sequence"] == 2
+    assert threads and threading.current_thread() not in threads
+    journal.close()
+
+
+def test_records_in_snapshot_are_not_replayed(paths):
+    """A journal left over from an interrupted compaction is not counted
+    twice."""
+    journal = open_journal(paths)
+    journal.add("A", 10)
+    journal.add("B", 20)
+    journal.close()
+    # Snapshot written, but the old journal was never removed
+    with open(paths[1], "w") as snapshot_file:
+        json.dump(
+            {
+                "sequence": 2,
+                "scores": [
+                    {"name": "B", "score": 20},
+                    {"name": "A", "score": 10},
+                ],
+            },
+            snapshot_file,
+        )
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("B", 20), ("A", 10)]
+    reloaded.close()
+
+
+def record(sequence, name, score):
+    return ("record", {"seq": sequence, "name": name, "score": score})
+
+
+def test_failed_snapshot_keeps_every_record(paths, mocker):
+    """Records queued with a compaction that fails are still appended, and
+    the compaction is finished by a later batch."""
+    journal = open_journal(paths, capacity=5)
+    for index, score in enumerate([10, 20]):
+        journal.add(f"P{index}", score)
+    snapshot = {"sequence": 2, "scores": journal.to_list()}
+    write_snapshot = mocker.patch(
+        "score_journal.write_json_atomic", side_effect=OSError("disk full")
+    )
+    entries = [
+        record(1, "P0", 10),
+        record(2, "P1", 20),
+        ("compact", snapshot),
+        record(3, "C", 30),
+        record(4, "D", 40),
+        record(5, "E", 50),
+    ]
+    journal.unsaved = []
+    with pytest.raises(OSError):
+        journal._write_journal(paths[0], entries)
+    assert not os.path.exists(paths[1])
+
+    write_snapshot.side_effect = None
+    write_snapshot.reset_mock()
+    journal._write_journal(paths[0], [])
+    write_snapshot.assert_called_once_with(paths[1], snapshot)
+    journal.close()
+
+    reloaded = open_journal(paths, capacity=5)
+    assert [name for name, _ in reloaded] == ["E", "D", "C", "P1", "P0"]
+    reloaded.close()
+
+
+def test_failed_rotation_leaves_the_journal_writable(paths, monkeypatch):
+    """If the new journal cannot be opened, the next batch reopens it."""
+    monkeypatch.setattr(constants, "JOURNAL_COMPACT_RECORDS", 2)
+    journal = open_journal(paths)
+    failures = [OSError("too many open files")]
+
+    def flaky_open(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(score_journal, "open", flaky_open, raising=False)
+    journal.add("A", 10)
+    journal.add("B", 20)
+    journal.save()
+    assert journal.writer.flush(timeout=5)
+    assert "too many open files" in journal.save_error()
+    assert journal.journal_file.closed
+
+    journal.add("C", 30)
+    journal.save()
+    assert journal.writer.flush(timeout=5)
+    assert journal.save_error() is None
+    journal.close()
+
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("C", 30), ("B", 20), ("A", 10)]
+    reloaded.close()
+
+
+def test_retried_records_are_replayed_once(paths):
+    """A record appended twice by a retry counts once on load."""
+    journal = open_journal(paths)
+    journal.add("A", 10)
+    journal.close()
+    with open(paths[0], "a") as journal_file:
+        journal_file.write(json.dumps({"seq": 1, "name": "A", "score": 10}))
+        journal_file.write("\n")
+    reloaded = open_journal(paths)
+    assert list(reloaded) == [("A", 10)]
+    reloaded.close()
@@ -0,0 +1,129 @@
+import json
+import threading
+
+import pytest
+
+from score_writer import ScoreWriter, write_json_atomic
+
+
+def test_write_json_atomic_writes_file(tmp_path):
+    """The data is written as indented JSON and no temp file is left."""
+    path = tmp_path / "scores.json"
+    write_json_atomic(path, [{"name": "A", "score": 1}])
+    assert json.loads(path.read_text()) == [{"name": "A", "score": 1}]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_json_atomic_keeps_old_file_on_error(tmp_path):
+    """A failed write leaves the previous file untouched."""
+    path = tmp_path / "scores.json"
+    path.write_text("[]")
+    with pytest.raises(TypeError):
+        write_json_atomic(path, [object()])
+    assert path.read_text() == "[]"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_save_writes_in_background(tmp_path):
+    """Queued data reaches the disk once the writer is flushed."""
+    path = str(tmp_path / "scores.json")
+    writer = ScoreWriter()
+    writer.save(path, [{"name": "A", "score": 5}])
+    assert writer.flush(timeout=5)
+    assert json.loads(open(path).read()) == [{"name": "A", "score": 5}]
+    writer.close()
+
+
+def test_save_does_not_wait_for_write():
+    """save returns while the writer thread is still writing."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_write(path, data):
+        started.set()
+        release.wait(5)
+
+    writer = ScoreWriter(write=slow_write)
+    writer.save("scores.json", [])
+    assert started.wait(5)
+    # The write is still blocked, but save returns immediately
+    writer.save("scores.json", [1])
+    release.set()
+    writer.close()
+
+
+def test_burst_of_saves_is_coalesced():
+    """Saves queued while a write is in progress collapse into one."""
+    release = threading.Event()
+    written = []
+
+    def slow_write(path, data):
+        release.wait(5)
+        written.append(data)
+
+    writer = ScoreWriter(write=slow_write)
+    writer.save("scores.json", 0)
+    for value in range(1, 20):
+        writer.save("scores.json", value)
+    release.set()
+    writer.close()
+    # The first write plus the latest of the rest
+    assert written[-1] == 19
+    assert len(written) <= 2
+    assert writer.coalesced >= 18
+
+
+def test_appended_items_are_all_written_in_order():
+    """Items appended while a write is in progress are joined, not lost."""
+    release = threading.Event()
+    written = []
+
+    def slow_write(path, items):
+        release.wait(5)
+        written.extend(items)
+
+    writer = ScoreWriter(write=slow_write)
+    for value in range(20):
+        writer.append("scores.db", [value])
+    release.set()
+    writer.close()
+    assert written == list(range(20))
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    """close writes everything still queued before returning."""
+    path = str(tmp_path / "scores.json")
+    writer = ScoreWriter()
+    writer.save(path, [{"name": "B", "score": 9}])
+    writer.close()
+    assert writer.thread is None
+    assert json.loads(open(path).read()) == [{"name": "B", "score": 9}]
+
+
+def test_write_error_is_reported():
+    """Errors on the writer thread are kept per path until a write works."""
+    failures = [OSError("Permission denied")]
+    written = []
+
+    def flaky_write(path, data):
+        if failures:
+            raise failures.pop()
+        written.append(data)
+
+    writer = ScoreWriter(write=flaky_write)
+    writer.save("scores.json", [1])
+    writer.flush()
+    assert str(writer.errors["scores.json"]) == "Permission denied"
+    assert writer.thread.is_alive()
+
+    writer.save("scores.json", [2])
+    writer.close()
+    assert writer.errors == {}
+    assert written == [[2]]
+
+
+def test_close_without_saves():
+    """Closing a writer that never saved anything is harmless."""
+    writer = ScoreWriter()
+    writer.close()
+    assert writer.thread is None
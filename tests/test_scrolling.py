@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+import constants
+import scrolling
+
+
+@pytest.fixture
+def strip():
+    """A strip one and a half windows wide, each column a different red."""
+    width = constants.WINDOW_WIDTH * 3 // 2
+    strip = pygame.Surface((width, 4))
+    for x in range(width):
+        pygame.draw.line(strip, (x % 256, x // 256, 0), (x, 0), (x, 3))
+    return strip
+
+
+@pytest.mark.parametrize("offset", [0, 1, 450, 900, 1349, 1350, 5000])
+def test_draws_strip_scrolled_by_offset(strip, offset):
+    """Column x of the window shows column x + offset of the strip."""
+    screen = pygame.Surface((constants.WINDOW_WIDTH, 4))
+    renderer = SimpleNamespace(blit=screen.blit)
+    scrolling.draw_wrapped(renderer, strip, offset)
+    width = strip.get_width()
+    for x in range(0, constants.WINDOW_WIDTH, 7):
+        assert screen.get_at((x, 2)) == strip.get_at(((x + offset) % width, 2))
+
+
+@pytest.mark.parametrize("offset", range(0, 1350, 50))
+def test_at_most_two_blits(strip, offset, mocker):
+    """Every offset is drawn with one or two blits."""
+    renderer = mocker.Mock()
+    scrolling.draw_wrapped(renderer, strip, offset)
+    assert 1 <= renderer.blit.call_count <= 2
+
+
+def test_ground_scrolls_with_obstacles(game):
+    """The ground moves at obstacle speed while playing, then stops."""
+    assert game.scaled_ground_image.get_width() >= constants.WINDOW_WIDTH
+    game._update()
+    game._update()
+    assert game.scroll_distance == 2 * constants.OBSTACLE_INITIAL_SPEED
+    game.game_over = True
+    game._update()
+    assert game.scroll_distance == 2 * constants.OBSTACLE_INITIAL_SPEED
+    game._reset_game()
+    assert game.scroll_distance == 0
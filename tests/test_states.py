@@ -0,0 +1,98 @@
+import pygame
+
+import constants
+
+
+def key(key, unicode=""):
+    """A key press event."""
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode)
+
+
+def test_collision_with_high_score_opens_save_prompt(game, mocker):
+    """A game ending with a high score asks whether to save it."""
+    mocker.patch("pygame.sprite.spritecollide", return_value=[object()])
+    game._update()
+    assert game._current_state() == constants.STATE_SAVE_PROMPT
+    assert game.game_over
+    assert game.score_eligible_for_save
+
+
+def test_declining_to_save_leaves_the_prompt(game):
+    """N goes to the plain game over screen, where Y does nothing."""
+    game.score_eligible_for_save = True
+    game.game_over = True
+    game._dispatch_event(key(pygame.K_n))
+    assert game._current_state() == constants.STATE_GAME_OVER
+    game._dispatch_event(key(pygame.K_y))
+    assert game._current_state() == constants.STATE_GAME_OVER
+
+
+def test_saving_shows_the_leaderboard(game):
+    """Entering a name saves the score and shows the table."""
+    game.scoreboard.score = 42
+    game.score_eligible_for_save = True
+    game.game_over = True
+    game._dispatch_event(key(pygame.K_y))
+    for letter in "Al":
+        game._dispatch_event(key(ord(letter.lower()), letter))
+    game._dispatch_event(key(pygame.K_RETURN))
+    assert game.displaying_scores
+    assert game.high_scores.top(1) == [("Al", 42)]
+
+    # Leaving the table returns to game over without the prompt
+    game._dispatch_event(key(pygame.K_ESCAPE))
+    assert game._current_state() == constants.STATE_GAME_OVER
+
+
+def test_inactive_states_do_not_update(game, mocker):
+    """Sprites and the score stop once the game is over."""
+    update = mocker.spy(game.all_sprites, "update")
+    game.game_over = True
+    game._update()
+    update.assert_not_called()
+
+
+def test_idle_states_are_not_redrawn(game, mocker):
+    """The loop only redraws an idle state when something changed."""
+    draw = mocker.patch.object(game, "_draw")
+    game.clock = mocker.Mock()
+    mocker.patch("sys.exit")
+    mocker.patch("pygame.quit")
+    game.game_over = True
+    frames = []
+    update = game._update
+
+    def counted_update():
+        # Press a key the state ignores, then uncover the window, then quit
+        update()
+        frames.append(None)
+        if len(frames) == 2:
+            pygame.event.post(key(pygame.K_x))
+        if len(frames) == 4:
+            pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+        if len(frames) == 6:
+            game.running = False
+
+    game._update = counted_update
+    pygame.event.clear()
+    game.run()
+    # The first frame, and the frame after the window was uncovered
+    assert draw.call_count == 2
+    # Frames that were not drawn sleep rather than busy-wait
+    assert game.clock.tick.call_count == 4
+
+
+def test_scrolling_leaderboard_is_redrawn(game):
+    """The table is redrawn each frame until its scroll settles."""
+    game.high_scores.add("A", 1)
+    game.game_over = True
+    game._show_high_scores()
+    game.needs_redraw = False
+    game.high_scores_scroll_target = 40
+    game._update()
+    assert game.needs_redraw
+    for _ in range(100):
+        game._update()
+    game.needs_redraw = False
+    game._update()
+    assert not game.needs_redraw
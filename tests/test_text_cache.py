@@ -0,0 +1,134 @@
+import pytest
+import pygame
+from unittest.mock import MagicMock
+
+import constants
+import fonts
+import main
+import text_cache
+from text_cache import TextCache
+
+
+def create_mock_font(pitch=100, height=10):
+    """Creates a font mock whose render returns a new surface of a fixed size."""
+    def mock_render(text, antialias, color):
+        surface = MagicMock(spec=pygame.Surface)
+        surface.get_pitch.return_value = pitch
+        surface.get_height.return_value = height
+        surface._rendered_text = text
+        return surface
+    font = MagicMock(spec=pygame.font.Font)
+    font.render = MagicMock(side_effect=mock_render)
+    return font
+
+
+def test_repeated_text_is_rendered_once():
+    """Rendering the same text twice reuses the first surface."""
+    cache = TextCache()
+    font = create_mock_font()
+    first = cache.render(font, "GAME OVER", True, constants.BLACK)
+    second = cache.render(font, "GAME OVER", True, constants.BLACK)
+    assert first is second
+    font.render.assert_called_once_with("GAME OVER", True, constants.BLACK)
+
+
+def test_key_includes_font_antialias_and_color():
+    """A change of font, antialiasing or colour renders new text."""
+    cache = TextCache()
+    font = create_mock_font()
+    other_font = create_mock_font()
+    cache.render(font, "Score: 0", True, constants.BLACK)
+    cache.render(other_font, "Score: 0", True, constants.BLACK)
+    cache.render(font, "Score: 0", False, constants.BLACK)
+    cache.render(font, "Score: 0", True, constants.RED)
+    assert cache.misses == 4
+    assert cache.hits == 0
+
+
+def test_color_objects_share_entries_with_tuples():
+    """pygame.Color and tuple colours with the same value share an entry."""
+    cache = TextCache()
+    font = create_mock_font()
+    cache.render(font, "Score: 0", True, (0, 0, 0))
+    cache.render(font, "Score: 0", True, [0, 0, 0])
+    assert cache.hits == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Going over budget drops the entry that was used longest ago."""
+    # Each surface is 1000 bytes, so only two fit
+    cache = TextCache(budget_bytes=2000)
+    font = create_mock_font(pitch=100, height=10)
+    cache.render(font, "A", True, constants.BLACK)
+    cache.render(font, "B", True, constants.BLACK)
+    cache.render(font, "A", True, constants.BLACK)  # A is now most recent
+    cache.render(font, "C", True, constants.BLACK)  # Evicts B
+
+    assert cache.evictions == 1
+    assert cache.used_bytes == 2000
+    cached_text = [key[1] for key in cache.surfaces]
+    assert cached_text == ["A", "C"]
+
+
+def test_surface_larger_than_budget_is_not_cached():
+    """Text too large for the whole budget is returned but not stored."""
+    cache = TextCache(budget_bytes=500)
+    font = create_mock_font(pitch=100, height=10)
+    surface = cache.render(font, "Huge", True, constants.BLACK)
+    assert surface._rendered_text == "Huge"
+    assert len(cache.surfaces) == 0
+    assert cache.used_bytes == 0
+
+
+def test_stats_report_hit_rate():
+    """Stats include hits, misses and the hit rate."""
+    cache = TextCache()
+    font = create_mock_font()
+    assert cache.hit_rate() == 0.0
+    for _ in range(4):
+        cache.render(font, "Final Score: 12", True, constants.BLACK)
+    stats = cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.75)
+
+
+def test_report_summarises_stats():
+    """The report line gives the hit rate, evictions and memory use."""
+    cache = TextCache(budget_bytes=4096)
+    font = create_mock_font(pitch=100, height=10)
+    for _ in range(4):
+        cache.render(font, "Final Score: 12", True, constants.BLACK)
+    assert cache.report() == (
+        "Text cache: 3 hits, 1 misses (75% hit rate), 0 evictions,"
+        " 1 surfaces in 1 of 4 KiB"
+    )
+
+
+def test_clear_resets_entries_and_stats():
+    """Clearing empties the cache and its statistics."""
+    cache = TextCache()
+    font = create_mock_font()
+    cache.render(font, "A", True, constants.BLACK)
+    cache.render(font, "A", True, constants.BLACK)
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.used_bytes == 0
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_score_text_bypasses_the_shared_cache(monkeypatch):
+    """The ever-changing score never fills the cache or evicts from it."""
+    font = create_mock_font()
+    monkeypatch.setattr(fonts, "get_font", lambda size: font)
+    text_cache.render(font, "GAME OVER", True, constants.BLACK)
+    scoreboard = main.Scoreboard()
+    renderer = MagicMock()
+    for score in range(50):
+        scoreboard.update(score * 10, 0)
+        scoreboard.draw(renderer)
+    assert renderer.blit.call_args.args[0]._rendered_text == "Score: 49"
+    assert text_cache.cache.stats()["entries"] == 1
+    assert text_cache.cache.misses == 1
@@ -0,0 +1,70 @@
+import pytest
+import pygame
+
+import constants
+from texture_canvas import TextureCanvas
+
+
+@pytest.fixture
+def canvas(monkeypatch):
+    """A texture canvas on SDL's software renderer."""
+    monkeypatch.setattr(constants, "RENDER_BACKEND", "texture")
+    pygame.display.init()
+    canvas = TextureCanvas(accelerated=0)
+    yield canvas
+    canvas.close()
+    pygame.display.quit()
+
+
+def test_each_surface_is_uploaded_once(canvas):
+    """Drawing a surface again reuses its texture."""
+    image = pygame.Surface((10, 10))
+    for _ in range(5):
+        canvas.surface.blit(image, (0, 0))
+    assert canvas.surface.uploads == 1
+
+
+def test_refresh_uploads_again(canvas):
+    """A refreshed surface is uploaded the next time it is drawn."""
+    image = pygame.Surface((10, 10))
+    canvas.surface.blit(image, (0, 0))
+    canvas.refresh(image)
+    canvas.surface.blit(image, (0, 0))
+    assert canvas.surface.uploads == 2
+
+
+def test_blit_returns_drawn_rect(canvas):
+    """blit behaves like Surface.blit for points, rects and areas."""
+    image = pygame.Surface((10, 20))
+    screen = canvas.surface
+    assert screen.blit(image, (5, 6)) == pygame.Rect(5, 6, 10, 20)
+    assert screen.blit(image, pygame.Rect(1, 2, 3, 4)) == pygame.Rect(
+        1, 2, 10, 20
+    )
+    assert screen.blit(image, (0, 0), (0, 0, 4, 4)) == pygame.Rect(
+        0, 0, 4, 4
+    )
+
+
+def test_frame_is_drawn(canvas):
+    """Fills and texture copies reach the renderer's output."""
+    image = pygame.Surface((10, 10))
+    image.fill(constants.RED)
+    canvas.surface.fill(constants.WHITE)
+    canvas.surface.blit(image, (20, 20))
+    canvas.surface.fill(constants.BLUE, (50, 50, 5, 5))
+    output = canvas.renderer.to_surface()
+    canvas.present()
+    assert output.get_at((0, 0))[:3] == constants.WHITE
+    assert output.get_at((25, 25))[:3] == constants.RED
+    assert output.get_at((52, 52))[:3] == constants.BLUE
+
+
+def test_sprite_group_draws_to_texture_screen(canvas):
+    """Sprite groups can draw to the texture screen like a Surface."""
+    sprite = pygame.sprite.Sprite()
+    sprite.image = pygame.Surface((4, 4))
+    sprite.rect = sprite.image.get_rect(topleft=(3, 3))
+    group = pygame.sprite.Group(sprite)
+    group.draw(canvas.surface)
+    assert canvas.surface.uploads == 1
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+
+import constants
+
+
+class TextCache:
+    def __init__(self, budget_bytes=constants.TEXT_CACHE_BUDGET):
+        # Rendered surfaces, least recently used first, keyed by
+        # (font, text, antialias, color)
+        self.surfaces = OrderedDict()
+        # Pixel memory used by each cached surface
+        self.sizes = {}
+        # Maximum pixel memory the cache may hold
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        # Colours may be lists or pygame.Color objects, so key on a tuple
+        key = (font, text, antialias, tuple(color))
+
+        # Reuse the surface if this text has already been rendered
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            # Mark as most recently used
+            self.surfaces.move_to_end(key)
+            return surface
+
+        # Otherwise render it and remember the result
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = self._surface_bytes(surface)
+        # Surfaces larger than the whole budget are never cached
+        if size <= self.budget_bytes:
+            self.surfaces[key] = surface
+            self.sizes[key] = size
+            self.used_bytes += size
+            self._evict()
+        return surface
+
+    def _surface_bytes(self, surface):
+        # Memory taken by the surface's pixel rows
+        return surface.get_pitch() * surface.get_height()
+
+    def _evict(self):
+        # Drop least recently used surfaces until back within budget
+        while self.used_bytes > self.budget_bytes:
+            key, _ = self.surfaces.popitem(last=False)
+            self.used_bytes -= self.sizes.pop(key)
+            self.evictions += 1
+
+    def hit_rate(self):
+        # Fraction of lookups served from the cache
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def stats(self):
+        return {
+            "entries": len(self.surfaces),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate(),
+        }
+
+    def report(self):
+        # One line summary of how well the cache is doing
+        return (
+            f"Text cache: {self.hits} hits, {self.misses} misses"
+            f" ({self.hit_rate():.0%} hit rate), {self.evictions} evictions,"
+            f" {len(self.surfaces)} surfaces in"
+            f" {self.used_bytes / 1024:.0f} of"
+            f" {self.budget_bytes / 1024:.0f} KiB"
+        )
+
+    def clear(self):
+        # Forget every cached surface and reset statistics
+        self.surfaces.clear()
+        self.sizes.clear()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Cache shared by the whole game
+cache = TextCache()
+
+
+def render(font, text, antialias, color):
+    # Shortcut for rendering text through the shared cache
+    return cache.render(font, text, antialias, color)
+
+
+def clear():
+    # Shortcut for clearing the shared cache
+    cache.clear()
@@ -0,0 +1,112 @@
+import os
+import weakref
+
+import pygame
+from pygame._sdl2 import video
+
+import constants
+
+
+class TextureScreen:
+    # Stands in for the display Surface: blits become texture copies
+    # drawn by the renderer, so game code can draw to it unchanged
+    def __init__(self, renderer, size):
+        self.renderer = renderer
+        self.size = size
+        # One texture per surface, uploaded the first time it is drawn
+        # and dropped automatically when the surface is freed
+        self.textures = weakref.WeakKeyDictionary()
+        # Number of surfaces uploaded to the renderer
+        self.uploads = 0
+
+    def texture(self, surface):
+        # Return the texture for a surface, uploading it if needed
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def refresh(self, surface):
+        # The surface has been drawn on, so upload it again next time
+        self.textures.pop(surface, None)
+
+    def fill(self, color, rect=None):
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(pygame.Rect(rect))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        # Copy a surface's texture to dest, which is a point or a rect
+        if area is not None:
+            area = pygame.Rect(area)
+            size = area.size
+        else:
+            size = source.get_size()
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        dest_rect = pygame.Rect(dest, size)
+        self.renderer.blit(self.texture(source), dest_rect, area)
+        return dest_rect
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+
+class TextureCanvas:
+    def __init__(self, accelerated=None, vsync=None, smooth=None):
+        if accelerated is None:
+            accelerated = constants.TEXTURE_ACCELERATED
+        if vsync is None:
+            vsync = constants.TEXTURE_VSYNC
+        if smooth is None:
+            smooth = constants.DISPLAY_SMOOTH_SCALE
+        # Textures pick up the scale quality when they are created
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "1" if smooth else "0"
+
+        self.logical_size = (constants.WINDOW_WIDTH, constants.WINDOW_HEIGHT)
+        window_size = self.logical_size
+        if constants.DISPLAY_SCALING != "none":
+            window_size = (
+                self.logical_size[0] * constants.DISPLAY_WINDOW_SCALE,
+                self.logical_size[1] * constants.DISPLAY_WINDOW_SCALE,
+            )
+        self.window = video.Window(constants.WINDOW_TITLE, size=window_size)
+        # accelerated is -1 for any renderer, 0 for SDL's software
+        # renderer and 1 for a GPU renderer
+        self.renderer = video.Renderer(
+            self.window, accelerated=accelerated, vsync=vsync
+        )
+        # The renderer scales the logical canvas to the window
+        self.renderer.logical_size = self.logical_size
+        self.surface = TextureScreen(self.renderer, self.logical_size)
+
+    def refresh(self, surface):
+        self.surface.refresh(surface)
+
+    def present(self):
+        self.renderer.present()
+
+    def close(self):
+        # Free the textures before the renderer, and the renderer before
+        # the window
+        self.surface.textures.clear()
+        self.surface.renderer = None
+        self.surface = None
+        self.renderer = None
+        self.window.destroy()